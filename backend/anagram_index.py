@@ -0,0 +1,145 @@
+"""
+Anagram lookups for /anagram ("which words can be made from these tiles").
+
+Every word is keyed by its sorted-letter signature (`tea`, `eat` and `ate`
+all become `aet`). Instead of a dict of ~200k signature strings, the index
+keeps two parallel arrays sorted by (signature hash, word id): looking up a
+signature is a binary search plus a check of the few words with that hash,
+so exact anagrams cost the same whatever the size of the word list.
+
+Sub-anagrams (words using some of the tiles) are answered by looking up the
+signature of every sub-multiset of the tiles while there are few enough of
+them. With blanks, or very many tiles, the length buckets of the search
+index are scanned instead: letter masks rule out most words, and the
+letter-count vector of each remaining word is compared with the tiles.
+Results are word ids in frequency order (ascending id).
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import combinations_with_replacement, product
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+# Largest number of signatures looked up before falling back to a bucket scan
+MAX_SIGNATURE_LOOKUPS = 4096
+
+
+def signature(letters):
+    """Sorted-letter signature of a word or a set of tiles."""
+    return "".join(sorted(letters))
+
+
+def letter_deficit(word_counts, tile_counts):
+    """Number of letters of a word not covered by the tiles (blanks needed)."""
+    return sum(max(count - tile_counts.get(letter, 0), 0) for letter, count in word_counts.items())
+
+
+class AnagramIndex:
+    """
+    Signature lookup over a WordIndex (any engine).
+    - word_index: provides words, masks and length buckets (ids, words, masks)
+    """
+
+    def __init__(self, word_index):
+        self.word_index = word_index
+        words = word_index.words
+        keyed = sorted((hash(signature(words[i])), i) for i in range(len(words)))
+        self.hashes = array("q", (key for key, _ in keyed))
+        self.ids = array("I", (i for _, i in keyed))
+
+    def lookup(self, sig):
+        """Return the ids of the words with signature `sig`, ascending."""
+        key = hash(sig)
+        words = self.word_index.words
+        ids = []
+        i = bisect_left(self.hashes, key)
+        while i < len(self.hashes) and self.hashes[i] == key:
+            word_id = self.ids[i]
+            if signature(words[word_id]) == sig:
+                ids.append(word_id)
+            i += 1
+        return ids
+
+    def find(self, tiles, blanks=0, exact=True, min_length=None, max_length=None):
+        """
+        Return the ids (frequency order) of the words that can be built from
+        `tiles` plus `blanks` wildcards.
+        - exact: use every tile and blank; otherwise any subset of them
+        - min_length / max_length: limits on the word length (None = no limit)
+        """
+        tile_counts = Counter(tiles)
+        total = len(tiles) + blanks
+        if exact:
+            low = high = total
+        else:
+            low, high = 1, total
+        if min_length is not None:
+            low = max(low, min_length)
+        if max_length is not None:
+            high = min(high, max_length)
+        if low > high:
+            return []
+
+        signatures = self._signatures(tile_counts, blanks, exact, low, high)
+        if signatures is None:
+            return self._scan(tile_counts, blanks, exact, low, high)
+        ids = []
+        for sig in signatures:
+            ids.extend(self.lookup(sig))
+        ids.sort()
+        return ids
+
+    def _signatures(self, tile_counts, blanks, exact, low, high):
+        """Every signature a match can have, or None when there are too many."""
+        blank_fills = [""]
+        if blanks:
+            size = 1
+            for k in range(blanks):
+                size = size * (26 + k) // (k + 1)  # multisets of `blanks` letters
+            if size > MAX_SIGNATURE_LOOKUPS or not exact:
+                return None
+            blank_fills = ["".join(fill) for fill in combinations_with_replacement(ALPHABET, blanks)]
+
+        if exact:
+            base = "".join(letter * count for letter, count in tile_counts.items())
+            return {signature(base + fill) for fill in blank_fills}
+
+        letters = sorted(tile_counts)
+        size = 1
+        for letter in letters:
+            size *= tile_counts[letter] + 1
+        if size > MAX_SIGNATURE_LOOKUPS:
+            return None
+        signatures = []
+        for counts in product(*(range(tile_counts[letter] + 1) for letter in letters)):
+            if low <= sum(counts) <= high:
+                signatures.append("".join(letter * count for letter, count in zip(letters, counts)))
+        return signatures
+
+    def _scan(self, tile_counts, blanks, exact, low, high):
+        tile_mask = 0
+        for letter in tile_counts:
+            if letter in ALPHABET:
+                tile_mask |= 1 << ALPHABET.index(letter)
+        outside = ~tile_mask & ((1 << 26) - 1)
+
+        ids = []
+        for length in range(low, high + 1):
+            bucket = self.word_index.buckets.get(length)
+            if bucket is None:
+                continue
+            words, masks, bucket_ids = bucket.words, bucket.masks, bucket.ids
+            for pos in range(len(bucket_ids)):
+                # Each letter outside the tiles needs at least one blank
+                extra = int(masks[pos]) & outside
+                if extra and (not blanks or bin(extra).count("1") > blanks):
+                    continue
+                word_counts = Counter(words[pos])
+                if letter_deficit(word_counts, tile_counts) > blanks:
+                    continue
+                if exact and any(word_counts[letter] < count for letter, count in tile_counts.items()):
+                    continue
+                ids.append(int(bucket_ids[pos]))
+        ids.sort()
+        return ids
@@ -0,0 +1,45 @@
+"""
+Build step for the backend lexicon snapshot.
+Run this from the backend directory on every deploy, after installing the
+requirements (e.g. the Render build command), so the generated (gitignored)
+lexicon.tsv, wordindex.bin and patterntable.bin ship with the app:
+
+    pip install -r requirements.txt && python build_lexicon.py
+
+The server then maps the packed index (or loads the snapshot) at startup
+instead of rebuilding the frequency-sorted word list from NLTK in every worker.
+"""
+import sys
+import time
+
+from lexicon import SNAPSHOT_PATH, build_from_nltk, write_snapshot
+from packed_index import PACKED_INDEX_PATH, write_packed_index
+from pattern_table import PATTERN_TABLE_PATH, check_solution_bank, write_pattern_table
+
+
+def build_lexicon(path=SNAPSHOT_PATH, index_path=PACKED_INDEX_PATH, table_path=PATTERN_TABLE_PATH):
+    """Build the word list from NLTK and write the snapshot, packed index and /solve pattern table."""
+    # Fail the deploy rather than let /solve drift from the self solver's answers
+    check_solution_bank()
+    print("Building lexicon from NLTK words + Brown frequencies...")
+    started = time.perf_counter()
+    lexicon = build_from_nltk()
+    print(
+        f"Built {len(lexicon)} words ({lexicon.priority_count} priority) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+    write_snapshot(lexicon, path)
+    print(f"✅ Saved lexicon snapshot to {path}")
+
+    # Packed after the snapshot, since its checksum is part of the index source key
+    data = write_packed_index(lexicon, index_path)
+    print(f"✅ Saved packed index ({len(data) / 1e6:.1f} MB) to {index_path}")
+
+    started = time.perf_counter()
+    data = write_pattern_table(table_path)
+    print(f"✅ Saved pattern table ({len(data) / 1e6:.1f} MB) to {table_path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    build_lexicon(*sys.argv[1:4])
@@ -0,0 +1,241 @@
+"""
+Structured letter constraints for /search.
+
+Instead of hand-written lookahead regexes, a query can say:
+    excluded     letters that may not be at a position ("e is not 2nd")
+    min_counts   {letter: n}, the letter appears at least n times
+    max_counts   {letter: n}, the letter appears at most n times
+    feedback     Wordle rows: a guess and its green/yellow/grey result
+Feedback rows are reduced to the first three (plus fixed letters for greens
+and the guess length). The search index evaluates all of them with its
+letter masks and (position, letter) bitsets; no regex is involved.
+
+"At least once" and "never" are the existing allowed/disallowed letters and
+are returned by present()/absent() instead of being kept here. What is left
+has a canonical text form (key()) used in cache keys and search tokens:
+    "0=c"   c at position 0 (0-based)
+    "1!ae"  neither a nor e at position 1
+    "o>=2"  at least two o's
+    "o<=1"  at most one o
+"""
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+GREEN = "g2"
+YELLOW = "y1"
+GREY = "bx0.-"
+
+# Key of a constraint set that no word can satisfy
+CONFLICT = "conflict"
+
+
+class Constraints:
+    """Per-position and letter-count constraints (positions are 0-based)."""
+
+    def __init__(self):
+        self.fixed = {}  # position -> letter
+        self.excluded = {}  # position -> set of letters
+        self.min_counts = {}  # letter -> n
+        self.max_counts = {}  # letter -> n
+        self.length = None  # implied by feedback rows
+        self.conflict = False
+
+    @classmethod
+    def from_request(cls, data):
+        """
+        Build constraints from /search request fields, or return None when
+        there are none. Raises ValueError for malformed input.
+        - excluded: {position: letters} or a list of letters per position
+        - min_counts / max_counts: {letter: n}
+        - feedback: list of {"guess": ..., "result": ...} or [guess, result]
+        """
+        constraints = cls()
+        excluded = data.get("excluded") or {}
+        if isinstance(excluded, list):
+            excluded = dict(enumerate(excluded))
+        if not isinstance(excluded, dict):
+            raise ValueError("excluded")
+        for pos, letters in excluded.items():
+            for letter in str(letters or "").lower():
+                constraints.exclude(int(pos), _letter(letter))
+
+        for field, add in (("min_counts", constraints.require), ("max_counts", constraints.limit)):
+            counts = data.get(field) or {}
+            if not isinstance(counts, dict):
+                raise ValueError(field)
+            for letter, count in counts.items():
+                add(_letter(str(letter).lower()), int(count))
+
+        feedback = data.get("feedback") or []
+        if not isinstance(feedback, list):
+            raise ValueError("feedback")
+        for row in feedback:
+            if isinstance(row, dict):
+                constraints.add_feedback(row.get("guess"), row.get("result"))
+            elif isinstance(row, (list, tuple)) and len(row) == 2:
+                constraints.add_feedback(*row)
+            else:
+                raise ValueError("feedback")
+
+        if not (
+            constraints.fixed or constraints.excluded or constraints.min_counts or constraints.max_counts
+            or constraints.length is not None or constraints.conflict
+        ):
+            return None
+        return constraints
+
+    @classmethod
+    def from_key(cls, key):
+        """Inverse of key()."""
+        constraints = cls()
+        for part in key.split():
+            if part == CONFLICT:
+                constraints.conflict = True
+            elif ">=" in part:
+                letter, count = part.split(">=")
+                constraints.require(_letter(letter), int(count))
+            elif "<=" in part:
+                letter, count = part.split("<=")
+                constraints.limit(_letter(letter), int(count))
+            elif "=" in part:
+                pos, letter = part.split("=")
+                constraints.fix(int(pos), _letter(letter))
+            elif "!" in part:
+                pos, letters = part.split("!")
+                for letter in letters:
+                    constraints.exclude(int(pos), _letter(letter))
+            else:
+                raise ValueError(key)
+        return constraints
+
+    def fix(self, pos, letter):
+        if pos < 0:
+            raise ValueError(pos)
+        if self.fixed.setdefault(pos, letter) != letter:
+            self.conflict = True
+
+    def exclude(self, pos, letter):
+        if pos < 0:
+            raise ValueError(pos)
+        self.excluded.setdefault(pos, set()).add(letter)
+
+    def require(self, letter, count):
+        """At least `count` of `letter`."""
+        if count > self.min_counts.get(letter, 0):
+            self.min_counts[letter] = count
+
+    def limit(self, letter, count):
+        """At most `count` of `letter`."""
+        if count < 0:
+            raise ValueError(count)
+        if count < self.max_counts.get(letter, count + 1):
+            self.max_counts[letter] = count
+
+    def add_feedback(self, guess, result):
+        """
+        Add one Wordle row: `result` has one mark per letter of `guess`,
+        g/2 = green, y/1 = yellow, b/x/0/./- = grey.
+        """
+        guess = str(guess or "").lower()
+        result = str(result or "").lower()
+        if not guess or len(guess) != len(result):
+            raise ValueError(guess)
+        if self.length not in (None, len(guess)):
+            self.conflict = True
+        self.length = len(guess)
+
+        found = {}
+        for letter, mark in zip(guess, result):
+            _letter(letter)
+            if mark in GREEN or mark in YELLOW:
+                found[letter] = found.get(letter, 0) + 1
+            elif mark not in GREY:
+                raise ValueError(result)
+        for pos, (letter, mark) in enumerate(zip(guess, result)):
+            if mark in GREEN:
+                self.fix(pos, letter)
+            else:
+                self.exclude(pos, letter)
+                if mark in GREY:
+                    # Grey: no more copies than were marked green/yellow in this row
+                    self.limit(letter, found.get(letter, 0))
+        for letter, count in found.items():
+            self.require(letter, count)
+
+    def present(self):
+        """Letters that must appear (allowed letters)."""
+        return set(self.min_counts) | set(self.fixed.values())
+
+    def absent(self):
+        """Letters that must not appear (disallowed letters)."""
+        return {letter for letter, count in self.max_counts.items() if count == 0}
+
+    def counts(self):
+        """(letter, min, max) for count limits beyond present/absent (max None = no limit)."""
+        letters = {l for l, n in self.min_counts.items() if n > 1}
+        letters |= {l for l, n in self.max_counts.items() if n > 0}
+        return [(l, self.min_counts.get(l, 0), self.max_counts.get(l)) for l in sorted(letters)]
+
+    def key(self):
+        """Canonical text of the constraints not covered by present()/absent(), or None."""
+        if self.conflict or any(low > high for _, low, high in self.counts() if high is not None):
+            return CONFLICT
+        if self.present() & self.absent():
+            return CONFLICT
+        parts = [f"{pos}={letter}" for pos, letter in sorted(self.fixed.items())]
+        absent = self.absent()
+        for pos, letters in sorted(self.excluded.items()):
+            if self.fixed.get(pos) in letters:
+                return CONFLICT
+            letters = letters - absent  # already excluded everywhere
+            if letters:
+                parts.append(f"{pos}!{''.join(sorted(letters))}")
+        for letter, low, high in self.counts():
+            if low > 1:
+                parts.append(f"{letter}>={low}")
+            if high is not None:
+                parts.append(f"{letter}<={high}")
+        return " ".join(parts) or None
+
+    def narrows(self, other, absent=()):
+        """
+        True when every word satisfying these constraints (plus `absent`
+        letters) also satisfies `other`.
+        """
+        if self.conflict:
+            return True
+        if other.conflict:
+            return False
+        if any(self.fixed.get(pos) != letter for pos, letter in other.fixed.items()):
+            return False
+        absent = set(absent) | self.absent()
+        if any(not letters - absent <= self.excluded.get(pos, set()) for pos, letters in other.excluded.items()):
+            return False
+        if any(self.min_counts.get(letter, 0) < count for letter, count in other.min_counts.items()):
+            return False
+        for letter, count in other.max_counts.items():
+            limit = 0 if letter in absent else self.max_counts.get(letter)
+            if limit is None or limit > count:
+                return False
+        return True
+
+    def accepts(self, word):
+        """Check a single word (for searches without a known length)."""
+        if self.conflict:
+            return False
+        for pos, letter in self.fixed.items():
+            if pos >= len(word) or word[pos] != letter:
+                return False
+        for pos, letters in self.excluded.items():
+            if pos < len(word) and word[pos] in letters:
+                return False
+        for letter, low, high in self.counts():
+            count = word.count(letter)
+            if count < low or (high is not None and count > high):
+                return False
+        return True
+
+
+def _letter(letter):
+    if len(letter) != 1 or letter not in ALPHABET:
+        raise ValueError(letter)
+    return letter
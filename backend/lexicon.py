@@ -0,0 +1,218 @@
+"""
+Frequency-sorted word list for the backend.
+
+Building the list from NLTK (the `words` corpus, ranked by Brown corpus
+frequency) takes seconds and every gunicorn worker would repeat it. The
+offline step in build_lexicon.py writes the finished list to a versioned
+snapshot (lexicon.tsv) that loads in milliseconds. NLTK is only used as a
+fallback when the snapshot is missing or stale.
+
+Snapshot format (UTF-8 text):
+    # wordfinder-lexicon v1 source=<sha256 of wordle-word-bank.csv> priority=<n> words=<N>
+    word<TAB>brown frequency
+    ...
+Lines are in final search order: the n priority (Wordle) words first, then
+the regular words, each sorted by frequency then alphabetically.
+
+In memory the list is a single compact Lexicon: one UTF-8 blob plus
+array('I') offsets and frequencies (~4 MB for ~240k words, instead of
+~25 MB of str/int objects spread over several sets and lists). Everything
+used to build it is released once it exists. Resident memory target per
+gunicorn worker with the default mmap engine: under 30 MB PSS, with the
+~15 MB packed index shared between workers (see memory_report.py).
+"""
+import csv
+import hashlib
+import os
+from array import array
+
+LEXICON_VERSION = 1
+SNAPSHOT_MAGIC = "# wordfinder-lexicon"
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+PRIORITY_CSV_PATH = os.path.join(BACKEND_DIR, 'wordle-word-bank.csv')
+SNAPSHOT_PATH = os.path.join(BACKEND_DIR, 'lexicon.tsv')
+NLTK_DATA_DIR = os.path.join(BACKEND_DIR, 'nltk_data')
+
+
+class Lexicon:
+    """
+    Read-only word list in search order, backed by one blob of UTF-8 words.
+    - blob: bytes-like buffer; words start at byte `base` (a packed index
+      mmap can be used directly)
+    - offsets: uint32 sequence, word i is blob[base + offsets[i]:base + offsets[i + 1]]
+    - freqs: uint32 sequence of Brown corpus frequencies
+    - priority_count: the first priority_count words are Wordle words
+    """
+
+    def __init__(self, blob, offsets, freqs, priority_count, base=0, source="memory"):
+        self.blob = blob
+        self.offsets = offsets
+        self.freqs = freqs
+        self.priority_count = priority_count
+        self.base = base
+        self.source = source
+
+    @classmethod
+    def from_words(cls, words, freqs, priority_count, source="memory"):
+        encoded = [word.encode("utf-8") for word in words]
+        offsets = array("I", [0])
+        end = 0
+        for data in encoded:
+            end += len(data)
+            offsets.append(end)
+        return cls(b"".join(encoded), offsets, array("I", freqs), priority_count, source=source)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        base = self.base
+        return self.blob[base + self.offsets[i]:base + self.offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def blob_bytes(self):
+        """Return the words blob as bytes (without anything before `base`)."""
+        return bytes(self.blob[self.base:self.base + self.offsets[len(self)]])
+
+    def nbytes(self):
+        """Approximate memory used by the blob, offsets and frequencies."""
+        return self.offsets[len(self)] + 4 * (2 * len(self) + 1)
+
+
+def file_checksum(path):
+    """Return the sha256 hex digest of a file, or 'missing' if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def load_priority_words(path=PRIORITY_CSV_PATH):
+    """Load priority words from CSV (Wordle word bank)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            return [row[0].lower().strip() for row in reader if row and row[0].strip()]
+    except FileNotFoundError:
+        print(f"Priority word file not found: {path}")
+        return []
+
+
+def build_from_nltk(priority_csv_path=PRIORITY_CSV_PATH):
+    """Build the lexicon from the NLTK words and Brown corpora (slow)."""
+    import nltk
+    from collections import Counter
+
+    # Use a local nltk_data directory inside your project
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+    # Download 'words' at runtime if not present
+    try:
+        from nltk.corpus import words, brown
+        _ = words.words()
+        _ = brown.words()
+    except LookupError:
+        nltk.download('words', download_dir=NLTK_DATA_DIR)
+        nltk.download('brown', download_dir=NLTK_DATA_DIR)
+        from nltk.corpus import words, brown
+
+    # Build frequency distribution from Brown corpus
+    brown_freq = Counter(w.lower() for w in brown.words() if w.isalpha())
+    priority_words = load_priority_words(priority_csv_path)
+
+    # Load all English words (lowercase, deduplicated), sorted by frequency
+    try:
+        all_words = set(w.lower() for w in words.words() if w.isalpha())
+
+        # Remove priority words from all_words to avoid duplicates
+        regular_words = all_words - set(priority_words)
+
+        # Sort priority words by frequency (most common first), then alphabetically
+        sorted_priority_words = sorted(priority_words, key=lambda w: (-brown_freq[w], w))
+
+        # Sort regular words by frequency (most common first), then alphabetically
+        regular_word_list = sorted(regular_words, key=lambda w: (-brown_freq[w], w))
+
+        # Combine: sorted priority words first, then regular words
+        word_list = sorted_priority_words + regular_word_list
+    except LookupError:
+        print("NLTK 'words' or 'brown' corpus not found. Please download them.")
+        word_list = priority_words  # Fallback to just priority words if NLTK fails
+
+    # Only the compact lexicon survives, the sets/lists/Counter above are released on return
+    return Lexicon.from_words(
+        word_list,
+        (brown_freq[w] for w in word_list),
+        priority_count=len(priority_words),
+        source="nltk",
+    )
+
+
+def write_snapshot(lexicon, path=SNAPSHOT_PATH, priority_csv_path=PRIORITY_CSV_PATH):
+    """Write `lexicon` to a versioned snapshot file (atomically replaces `path`)."""
+    header = (
+        f"{SNAPSHOT_MAGIC} v{LEXICON_VERSION} source={file_checksum(priority_csv_path)} "
+        f"priority={lexicon.priority_count} words={len(lexicon)}"
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(header + "\n")
+        for word, freq in zip(lexicon, lexicon.freqs):
+            f.write(f"{word}\t{freq}\n")
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path=SNAPSHOT_PATH, priority_csv_path=PRIORITY_CSV_PATH):
+    """
+    Return the Lexicon stored in the snapshot, or None when the snapshot
+    is missing, from another format version, or built from a different
+    Wordle word bank.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = f.readline().split()
+            body = f.read()
+    except FileNotFoundError:
+        return None
+
+    fields = dict(part.split("=", 1) for part in header[3:] if "=" in part)
+    if " ".join(header[:2]) != SNAPSHOT_MAGIC or header[2:3] != [f"v{LEXICON_VERSION}"]:
+        print(f"Lexicon snapshot {path} has an unknown format, ignoring it")
+        return None
+    if fields.get("source") != file_checksum(priority_csv_path):
+        print(f"Lexicon snapshot {path} is stale (word bank changed), ignoring it")
+        return None
+
+    words = []
+    freqs = array("I")
+    try:
+        for line in body.splitlines():
+            word, _, freq = line.partition("\t")
+            words.append(word)
+            freqs.append(int(freq))
+        complete = len(words) == int(fields["words"])
+        priority_count = int(fields["priority"])
+    except (KeyError, ValueError, OverflowError):
+        complete = False
+    if not complete:
+        print(f"Lexicon snapshot {path} is corrupt or truncated, ignoring it")
+        return None
+    return Lexicon.from_words(words, freqs, priority_count, source="snapshot")
+
+
+def load_lexicon(path=SNAPSHOT_PATH):
+    """Load the snapshot if it is usable, otherwise build the lexicon from NLTK."""
+    lexicon = read_snapshot(path)
+    if lexicon is None:
+        lexicon = build_from_nltk()
+    return lexicon
@@ -1,110 +1,342 @@
-import re
+import base64
+import json
 import os
-import nltk
-import csv
-
-# Use a local nltk_data directory inside your project
-NLTK_DATA_DIR = os.path.join(os.path.dirname(__file__), 'nltk_data')
-os.makedirs(NLTK_DATA_DIR, exist_ok=True)
-nltk.data.path.insert(0, NLTK_DATA_DIR)
-
-# Download 'words' at runtime if not present
-try:
-    from nltk.corpus import words, brown
-    _ = words.words()
-    _ = brown.words()
-except LookupError:
-    nltk.download('words', download_dir=NLTK_DATA_DIR)
-    nltk.download('brown', download_dir=NLTK_DATA_DIR)
-    from nltk.corpus import words, brown
-
-# Build frequency distribution from Brown corpus
-from collections import Counter
-brown_freq = Counter(w.lower() for w in brown.words() if w.isalpha())
-
-# Load priority words from CSV (Wordle word bank)
-priority_words = []
-csv_path = os.path.join(os.path.dirname(__file__), 'wordle-word-bank.csv')
-try:
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        priority_words = [row[0].lower().strip() for row in reader if row and row[0].strip()]
-except FileNotFoundError:
-    print(f"Priority word file not found: {csv_path}")
-    priority_words = []
-
-# Load all English words (lowercase, deduplicated), sorted by frequency
-try:
-    all_words = set(w.lower() for w in words.words() if w.isalpha())
-    
-    # Remove priority words from all_words to avoid duplicates
-    regular_words = all_words - set(priority_words)
-    
-    # Sort priority words by frequency (most common first), then alphabetically
-    sorted_priority_words = sorted(
-        priority_words,
-        key=lambda w: (-brown_freq[w], w)
-    )
-    
-    # Sort regular words by frequency (most common first), then alphabetically
-    regular_word_list = sorted(
-        regular_words,
-        key=lambda w: (-brown_freq[w], w)
-    )
-    
-    # Combine: sorted priority words first, then regular words
-    word_list = sorted_priority_words + regular_word_list
-    
-except LookupError:
-    print("NLTK 'words' or 'brown' corpus not found. Please download them.")
-    word_list = priority_words  # Fallback to just priority words if NLTK fails
+import re
+import time
+from bisect import bisect_left
+from functools import lru_cache
 
 from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
 
-LOAD_LIMIT = 150
+from anagram_index import AnagramIndex
+from constraints import CONFLICT, Constraints
+from pattern_table import SOLVED_PATTERN, open_pattern_table, pattern_value
+from query_cache import QueryCache
+from word_index import FIXED_PATTERN, load_word_index
+
+# Search engine: "mmap" (packed index file shared by all workers),
+# "python" (per-process bitset index) or "numpy" (vectorized matrices)
+SEARCH_ENGINE = os.environ.get("WORDFINDER_ENGINE", "mmap")
+
+# Frequency-sorted word list, from the lexicon.tsv snapshot (see build_lexicon.py)
+# or NLTK, indexed by length, letter mask and letter position
+word_index = load_word_index(SEARCH_ENGINE)
+lexicon = word_index.lexicon
+
+LOAD_LIMIT = 150  # Default page size for /search
+MAX_LOAD_LIMIT = 1000
+
+# Result cache for /search: max entries and TTL in seconds (0 = no expiry)
+SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", "2048"))
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", "600"))
+search_cache = QueryCache(max_size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+# Match-id sets kept so a narrower follow-up query (see is_refinement) only
+# filters the previous results. Larger result sets are not worth storing.
+REFINE_CACHE_SIZE = int(os.environ.get("REFINE_CACHE_SIZE", "256"))
+REFINE_MAX_MATCHES = int(os.environ.get("REFINE_MAX_MATCHES", "50000"))
+refine_cache = QueryCache(max_size=REFINE_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+# Seconds of regex matching allowed per /search request (0 = no limit). Slower
+# queries return what was found so far with "truncated": true.
+SEARCH_TIME_BUDGET = float(os.environ.get("SEARCH_TIME_BUDGET", "0.5"))
+
+def normalize_letters(val):
+    """Normalize allowed/disallowed input to a set of single characters."""
+    if val is None or val == [""] or val == "":
+        return set()
+    if isinstance(val, str):
+        return set(val)
+    if isinstance(val, list):
+        # If it's a list of one string, split that string
+        if len(val) == 1 and isinstance(val[0], str):
+            return set(val[0])
+        # Otherwise, flatten list of single characters (e.g., ['a', 'b'] -> {'a', 'b'})
+        return set("".join(val))
+    return set(val)
+
+def search_key(pattern=None, length=None, allowed=None, disallowed=None, constraints=None):
+    """
+    Canonical form of a query, used as the result cache key (and for totals).
+    Equivalent queries share a key: letter sets are sorted, letter-box
+    patterns are lowercased and imply their own length, and constraints
+    (a Constraints) contribute their present/absent letters to the letter
+    sets and the rest as Constraints.key().
+    """
+    pattern = str(pattern) if pattern else None
+    if pattern and FIXED_PATTERN.fullmatch(pattern):
+        pattern = pattern.lower()
+        if length is None:
+            length = len(pattern)
+    allowed = normalize_letters(allowed)
+    disallowed = normalize_letters(disallowed)
+    constraints_key = None
+    if constraints is not None:
+        allowed |= constraints.present()
+        disallowed |= constraints.absent()
+        constraints_key = constraints.key()
+        if length is None:
+            length = constraints.length
+        elif constraints.length not in (None, length):
+            constraints_key = CONFLICT
+    return (
+        pattern,
+        length,
+        "".join(sorted(allowed)),
+        "".join(sorted(disallowed)),
+        constraints_key,
+    )
+
+def key_plan(key, deadline=None):
+    """Return the word_index plan for a search_key."""
+    pattern, length, allowed, disallowed, constraints_key = key
+    constraints = Constraints.from_key(constraints_key) if constraints_key else None
+    return word_index.plan(pattern, length, set(allowed), set(disallowed), deadline, constraints)
+
+def is_refinement(base_key, key):
+    """
+    True when every word matching `key` also matches `base_key` (both from
+    search_key), so the base result set can be filtered instead of the index.
+    """
+    base_pattern, base_length, base_allowed, base_disallowed, base_constraints = base_key
+    pattern, length, allowed, disallowed, constraints = key
+    if not (set(base_allowed) <= set(allowed) and set(base_disallowed) <= set(disallowed)):
+        return False
+    if base_length is not None and base_length != length:
+        return False
+    if base_constraints is not None:
+        # More rows of feedback, exclusions or tighter counts narrow the base
+        narrower = Constraints.from_key(constraints) if constraints else Constraints()
+        if not narrower.narrows(Constraints.from_key(base_constraints), absent=set(disallowed)):
+            return False
+    if base_pattern is None or base_pattern == pattern:
+        return True
+    # One more letter box filled in: same length, every base letter kept
+    if pattern is None or not (FIXED_PATTERN.fullmatch(base_pattern) and FIXED_PATTERN.fullmatch(pattern)):
+        return False
+    return len(base_pattern) == len(pattern) and all(b == "." or b == p for b, p in zip(base_pattern, pattern))
+
+def encode_token(key):
+    """Opaque token naming a query, returned by /search and accepted back as `base`."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+def decode_token(token):
+    """Return the search_key named by a token, or raise ValueError."""
+    try:
+        pattern, length, allowed, disallowed, constraints = json.loads(
+            base64.urlsafe_b64decode(str(token).encode("ascii"))
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(token) from e
+    if not (
+        isinstance(pattern, (str, type(None)))
+        and isinstance(length, (int, type(None)))
+        and isinstance(allowed, str)
+        and isinstance(disallowed, str)
+        and isinstance(constraints, (str, type(None)))
+    ):
+        raise ValueError(token)
+    if constraints:
+        Constraints.from_key(constraints)  # raises ValueError if malformed
+    return (pattern, length, allowed, disallowed, constraints)
+
+def refined_ids(key, plan, base):
+    """
+    Return the match ids for `key` by filtering the result set of the query
+    named by the `base` token, or None when that is not possible and the
+    index has to be searched instead.
+    """
+    ids = refine_cache.get(key)
+    if ids is not None or not base:
+        return ids
+    try:
+        base_key = decode_token(base)
+    except ValueError:
+        return None
+    if base_key == key or not is_refinement(base_key, key):
+        return None
+
+    base_ids = refine_cache.get(base_key)
+    if base_ids is None:
+        base_total = search_cache.get(base_key)
+        if base_total is not None and base_total > REFINE_MAX_MATCHES:
+            return None
+        base_plan = key_plan(base_key, plan.deadline)
+        base_ids = word_index.match_ids(base_plan)
+        if base_plan.truncated or len(base_ids) > REFINE_MAX_MATCHES:
+            return None
+        refine_cache.put(base_key, base_ids)
+
+    ids = word_index.refine(plan, base_ids)
+    if plan.truncated:
+        # Incomplete, let the regular search produce (and flag) a partial result
+        plan.truncated = False
+        return None
+    refine_cache.put(key, ids)
+    return ids
+
+@lru_cache(maxsize=None)
+def get_anagram_index():
+    """Signature index for /anagram, built on first use (about 3 MB per worker)."""
+    return AnagramIndex(word_index)
+
+# Tiles typed as one of these characters count as blanks
+BLANK_TILES = "?*_"
+# Most tiles plus blanks accepted by /anagram; the subset search grows quickly with each one
+MAX_ANAGRAM_TILES = int(os.environ.get("MAX_ANAGRAM_TILES", "20"))
+
+def parse_tiles(tiles):
+    """Return (letters, blanks) from a tile string such as "retain?", or raise ValueError."""
+    letters = []
+    blanks = 0
+    for tile in str(tiles or "").lower():
+        if tile in BLANK_TILES:
+            blanks += 1
+        elif "a" <= tile <= "z":
+            letters.append(tile)
+        elif not tile.isspace():
+            raise ValueError(tile)
+    return "".join(sorted(letters)), blanks
+
+def parse_flag(value, default):
+    """Return a JSON boolean (or the strings "true"/"false"), `default` when missing, or raise ValueError."""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(value)
 
-def search_words(pattern=None, length=None, allowed=None, disallowed=None):
+def anagram_words(tiles, blanks=0, exact=True, min_length=None, max_length=None):
+    """
+    Return the word ids (frequency order) that can be built from `tiles`
+    (sorted a-z letters) plus `blanks` wildcards, cached per query.
+    """
+    key = ("anagram", tiles, blanks, exact, min_length, max_length)
+    ids = search_cache.get(key)
+    if ids is None:
+        ids = get_anagram_index().find(tiles, blanks, exact, min_length, max_length)
+        search_cache.put(key, ids)
+    return ids
+
+@lru_cache(maxsize=None)
+def get_pattern_table():
+    """Guess x answer feedback table for /solve, mapped on first use."""
+    # Wordle words come first in the lexicon, in frequency order
+    ranks = {lexicon[i]: i for i in range(lexicon.priority_count)}
+    return open_pattern_table(ranks=ranks)
+
+def parse_history(history):
+    """
+    Return ((guess, pattern), ...) from /solve history rows, or raise ValueError.
+    - history: list of {"guess": ..., "result": ...} or [guess, result], where
+      result is base-3 digits ("20100") or g/y/b marks ("gbybb")
+    """
+    if not isinstance(history, list):
+        raise ValueError("history")
+    parsed = []
+    for row in history:
+        if isinstance(row, dict):
+            guess, result = row.get("guess"), row.get("result")
+        elif isinstance(row, (list, tuple)) and len(row) == 2:
+            guess, result = row
+        else:
+            raise ValueError("history")
+        parsed.append((str(guess or "").lower(), pattern_value(result)))
+    return tuple(parsed)
+
+def solve_words(history):
+    """
+    Return (candidate ids, suggested id) for a parsed guess history, cached
+    per history. Candidate ids index the pattern table answers, most
+    frequent first. Raises KeyError for guesses outside the word bank.
+    """
+    key = ("solve", history)
+    result = search_cache.get(key)
+    if result is None:
+        table = get_pattern_table()
+        ids = table.candidates(history)
+        result = (ids, table.suggest(ids))
+        search_cache.put(key, result)
+    return result
+
+def search_words(pattern=None, length=None, allowed=None, disallowed=None, constraints=None):
     """
     Search for words matching the given pattern, length, allowed, and disallowed letters.
     - pattern: regex string (None means match all)
     - length: int or None
     - allowed: iterable of letters that must be present (or None)
     - disallowed: iterable of letters that must NOT be present (or None)
+    - constraints: Constraints (per-position exclusions, letter counts, feedback) or None
     Returns a list of matching words.
     """
-    # Ensure pattern is a string for re.compile
-    regex = re.compile(f"^{pattern}$", re.IGNORECASE) if pattern else None
-
-    # Normalize allowed/disallowed to sets of single characters
-    def normalize_letters(val):
-        if val is None or val == [""] or val == "":
-            return set()
-        if isinstance(val, str):
-            return set(val)
-        if isinstance(val, list):
-            # If it's a list of one string, split that string
-            if len(val) == 1 and isinstance(val[0], str):
-                return set(val[0])
-            # Otherwise, flatten list of single characters (e.g., ['a', 'b'] -> {'a', 'b'})
-            return set("".join(val))
-        return set(val)
+    plan = key_plan(search_key(pattern, length, allowed, disallowed, constraints))
+    return [word for _, word in word_index.iter_matches(plan)]
 
-    allowed = normalize_letters(allowed)
-    disallowed = normalize_letters(disallowed)
+def encode_cursor(offset, position):
+    return f"{offset}.{position}"
+
+def decode_cursor(cursor):
+    """Return (offset, position) from a cursor, or raise ValueError."""
+    offset, position = (int(part) for part in str(cursor).split("."))
+    if offset < 0 or position < 0:
+        raise ValueError(cursor)
+    return offset, position
+
+def search_page(pattern=None, length=None, allowed=None, disallowed=None, offset=0, limit=LOAD_LIMIT, start=None, base=None,
+                constraints=None):
+    """
+    Return one page of search results as (total, matches, next_cursor, token, truncated, total_exact).
+    The page and the total come from one pass over the index, which keeps
+    counting after the page is filled. `start` is the index position stored in
+    a cursor, so deep pages resume there instead of rescanning from word zero.
+    `base` is the token of an earlier query; when this query narrows it, only
+    the earlier results are filtered.
+    Regex matching stops after SEARCH_TIME_BUDGET seconds. `truncated` means
+    the page itself is incomplete (the cursor resumes where matching stopped);
+    `total_exact` is False when the total is only a lower bound. Such results
+    are not cached.
+    """
+    key = search_key(pattern, length, allowed, disallowed, constraints)
+    page_key = key + (offset, start, limit)
+    cached = search_cache.get(page_key)
+    if cached is not None:
+        return cached
 
-    results = []
-    for word in word_list:
-        if length is not None and len(word) != length: # Use 'is not None' for 0 or None
-            continue
-        if regex and not regex.match(word):
-            continue
-        if allowed and not all(l in word for l in allowed):
-            continue
-        if disallowed and any(l in word for l in disallowed):
-            continue
-        results.append(word)
-    return results
+    plan = key_plan(key, time.monotonic() + SEARCH_TIME_BUDGET if SEARCH_TIME_BUDGET > 0 else None)
+    ids = refined_ids(key, plan, base)
+    truncated = False
+    total_exact = True
+    if ids is not None:
+        total = len(ids)
+        search_cache.put(key, total)
+        if start is None:
+            first = offset
+        else:
+            # A position past the end of the index means there is nothing left
+            start_id = word_index.global_id(plan, start)
+            first = total if start_id is None else bisect_left(ids, start_id)
+        matches = [word_index.words[i] for i in ids[first:first + limit]]
+        more = first + limit < total
+        next_start = word_index.position(plan, ids[first + limit]) if more else None
+    else:
+        total = search_cache.get(key)
+        if total is None:
+            matches, next_start, total, truncated = word_index.counted_page(plan, offset, limit, start)
+            total_exact = not plan.truncated
+            if total_exact:
+                search_cache.put(key, total)
+        else:
+            matches, next_start = word_index.page(plan, offset, limit, start)
+            truncated = plan.truncated
+
+    next_cursor = encode_cursor(offset + len(matches), next_start) if next_start is not None else None
+    result = (total, matches, next_cursor, encode_token(key), truncated, total_exact)
+    if total_exact and not truncated:
+        search_cache.put(page_key, result)
+    return result
 
 # --- Flask App Setup ---
 
@@ -138,16 +370,109 @@ def api_search():
 
     allowed = data.get("allowed")
     disallowed = data.get("disallowed")
-    
-    matches = search_words(pattern, length, allowed, disallowed)
+
+    # Pagination: either an offset or the cursor returned with the previous page
+    try:
+        offset = max(int(data.get("offset") or 0), 0)
+        limit = int(data.get("limit") or LOAD_LIMIT)
+    except (TypeError, ValueError):
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    limit = min(max(limit, 1), MAX_LOAD_LIMIT)
+    start = None
+    if data.get("cursor"):
+        try:
+            offset, start = decode_cursor(data["cursor"])
+        except ValueError:
+            return jsonify({"error": "invalid cursor"}), 400
+
+    # Structured constraints: per-position exclusions, letter counts, feedback rows
+    try:
+        constraints = Constraints.from_request(data)
+    except (TypeError, ValueError):
+        return jsonify({"error": "invalid excluded, min_counts, max_counts or feedback"}), 400
+
+    try:
+        total, matches, next_cursor, token, truncated, total_exact = search_page(
+            pattern, length, allowed, disallowed, offset, limit, start, data.get("base"), constraints
+        )
+    except re.error as e:
+        return jsonify({"error": f"invalid pattern: {e}"}), 400
+    return jsonify({
+        "total": total,
+        "offset": offset,
+        "matches": matches,
+        "next_cursor": next_cursor,
+        "token": token,
+        "truncated": truncated,
+        "total_exact": total_exact
+    })
+
+@app.route("/anagram", methods=["POST"])
+def api_anagram():
+    data = request.get_json(force=True)
+    try:
+        tiles, blanks = parse_tiles(data.get("letters"))
+    except ValueError:
+        return jsonify({"error": "letters must be a-z, with ? for blanks"}), 400
+    try:
+        blanks += max(int(data.get("blanks") or 0), 0)
+        min_length = int(data["min_length"]) if data.get("min_length") is not None else None
+        max_length = int(data["max_length"]) if data.get("max_length") is not None else None
+        offset = max(int(data.get("offset") or 0), 0)
+        limit = int(data.get("limit") or LOAD_LIMIT)
+    except (TypeError, ValueError):
+        return jsonify({"error": "blanks, min_length, max_length, offset and limit must be integers"}), 400
+    if len(tiles) + blanks > MAX_ANAGRAM_TILES:
+        return jsonify({"error": f"at most {MAX_ANAGRAM_TILES} tiles and blanks"}), 400
+    limit = min(max(limit, 1), MAX_LOAD_LIMIT)
+    try:
+        exact = parse_flag(data.get("exact"), default=True)
+    except ValueError:
+        return jsonify({"error": "exact must be true or false"}), 400
+
+    ids = anagram_words(tiles, blanks, exact, min_length, max_length)
+    return jsonify({
+        "total": len(ids),
+        "offset": offset,
+        "matches": [word_index.words[i] for i in ids[offset:offset + limit]]
+    })
+
+@app.route("/solve", methods=["POST"])
+def api_solve():
+    data = request.get_json(force=True)
+    try:
+        history = parse_history(data.get("history") or [])
+    except (TypeError, ValueError):
+        return jsonify({"error": "history must be [guess, result] rows with 5-letter results"}), 400
+    try:
+        offset = max(int(data.get("offset") or 0), 0)
+        limit = int(data.get("limit") or LOAD_LIMIT)
+    except (TypeError, ValueError):
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    limit = min(max(limit, 1), MAX_LOAD_LIMIT)
+
+    try:
+        ids, suggestion = solve_words(history)
+    except KeyError as e:
+        return jsonify({"error": f"unknown guess: {e.args[0]}"}), 400
+    table = get_pattern_table()
     return jsonify({
-        "total": len(matches),
-        "matches": matches[:LOAD_LIMIT]
+        "total": len(ids),
+        "offset": offset,
+        "candidates": [table.answers[j] for j in ids[offset:offset + limit]],
+        "suggestion": table.answers[suggestion] if suggestion is not None else None,
+        "solved": any(value == SOLVED_PATTERN for _, value in history)
     })
 
 @app.route("/stats", methods=["GET"])
 def api_stats():
-    return jsonify({"total": len(word_list)})
+    return jsonify({
+        "total": len(lexicon),
+        "priority": lexicon.priority_count,
+        "source": lexicon.source,
+        "cache": search_cache.stats(),
+        "refine_cache": refine_cache.stats()
+    })
 
 if __name__ == "__main__":
     # For local development, uncomment this line:
@@ -0,0 +1,121 @@
+"""
+Per-worker memory report for the search engines.
+
+Starts several worker processes per engine (like gunicorn workers), imports
+main.py in each, runs a few searches and prints each worker's RSS, PSS and
+private memory from /proc (Linux only). Compare the in-process "python"
+engine with the shared "mmap" engine:
+
+    python memory_report.py [workers] [engine ...]
+"""
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+SAMPLE_QUERIES = [
+    ("..a.e", 5, ["s"], ["t"]),
+    (".....", 5, [], ["e"]),
+    (".*ing", None, None, None),
+    (None, 7, "ae", "xz"),
+]
+
+
+def read_memory():
+    """Return {field: kB} for Rss, Pss, Private and Shared of this process."""
+    fields = {}
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+# Seconds each engine's workers get to import main.py and run SAMPLE_QUERIES
+STARTUP_TIMEOUT = 180
+
+
+def _worker(engine, ready, go, done, results):
+    os.environ["WORDFINDER_ENGINE"] = engine
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+
+    for query in SAMPLE_QUERIES:
+        main.search_words(*query)
+    ready.put(os.getpid())
+    go.wait()  # measure once every worker is up, so shared pages are counted as shared
+    results.put((os.getpid(), read_memory()))
+    done.wait()
+
+
+def measure(engine, workers, timeout=STARTUP_TIMEOUT):
+    """
+    Return [(pid, memory)] for `workers` processes running `engine`.
+    Raises RuntimeError if a worker exits or is not ready within `timeout` seconds.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    go = ctx.Event()
+    done = ctx.Event()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(engine, ready, go, done, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    try:
+        deadline = time.monotonic() + timeout
+        started = 0
+        while started < workers:
+            failed = [proc for proc in procs if proc.exitcode is not None]
+            if failed:
+                raise RuntimeError(f"worker {failed[0].pid} exited with code {failed[0].exitcode}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{workers - started} workers not ready after {timeout}s")
+            try:
+                ready.get(timeout=0.5)
+                started += 1
+            except queue.Empty:
+                pass
+        go.set()
+        try:
+            rows = [results.get(timeout=timeout) for _ in procs]
+        except queue.Empty:
+            raise RuntimeError(f"workers did not report memory within {timeout}s") from None
+        done.set()
+        for proc in procs:
+            proc.join()
+        return rows
+    finally:
+        for proc in procs:
+            if proc.is_alive() and not done.is_set():
+                proc.terminate()
+                proc.join()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    engines = sys.argv[2:] or ["python", "mmap"]
+    print(f"{'engine':8s} {'pid':>8s} {'RSS MB':>8s} {'PSS MB':>8s} {'private MB':>11s} {'shared MB':>10s}")
+    for engine in engines:
+        try:
+            rows = measure(engine, workers)
+        except RuntimeError as e:
+            print(f"{engine:8s} failed: {e}")
+            continue
+        for pid, mem in rows:
+            print(
+                f"{engine:8s} {pid:8d} {mem['rss'] / 1024:8.1f} {mem['pss'] / 1024:8.1f} "
+                f"{mem['private'] / 1024:11.1f} {mem['shared'] / 1024:10.1f}"
+            )
+        total_pss = sum(mem["pss"] for _, mem in rows) / 1024
+        print(f"{engine:8s} {'total':>8s} {'':8s} {total_pss:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Character n-gram postings for regexes without a known length.
+
+Every word is padded as `^word$` and split into trigrams, so `^re` means
+"starts with re", `ing` "contains ing" and `ng$` "ends with ng". The
+postings map each trigram to the ascending ids of the words containing it.
+
+A regex is reduced to a query over trigrams that every match must contain
+(after Russ Cox, "Regular Expression Matching with a Trigram Index"):
+    "ing"                    one trigram
+    ("and", (query, ...))    all of them
+    ("or", (query, ...))     at least one of them
+    None                     no constraint
+`.*ing` becomes ("and", ("ing", "ng$")) and `(re|un).*` becomes
+("or", ("^re", "^un")). Intersecting/merging the postings gives a candidate
+set, in frequency order, that the real regex then only has to confirm.
+"""
+from array import array
+
+from regex_syntax import LETTERS, group_items, repeat_parts, sre_parse
+
+NGRAM_SIZE = 3
+WORD_START = "^"
+WORD_END = "$"
+
+# Largest set of alternative strings tracked per regex node before giving up
+MAX_STRINGS = 16
+
+_STARTS = (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING)
+_ENDS = (sre_parse.AT_END, sre_parse.AT_END_STRING)
+
+
+def word_ngrams(word):
+    """Return the set of trigrams of the padded word."""
+    padded = f"{WORD_START}{word}{WORD_END}"
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def ngram_postings(words):
+    """Return {trigram: array('I') of ascending word ids} for `words`."""
+    postings = {}
+    for i, word in enumerate(words):
+        for gram in word_ngrams(word):
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array("I")
+            ids.append(i)
+    return postings
+
+
+def match_ngram_ids(query, postings):
+    """
+    Return the ascending ids of the words that satisfy an n-gram query, or
+    None when the query does not constrain anything.
+    - postings: mapping with get(trigram) -> ascending id sequence (or None)
+    """
+    if query is None:
+        return None
+    if isinstance(query, str):
+        return postings.get(query) or ()
+    op, terms = query
+    results = [match_ngram_ids(term, postings) for term in terms]
+    if op == "or":
+        if any(ids is None for ids in results):
+            return None
+        merged = set()
+        for ids in results:
+            merged.update(ids)
+        return sorted(merged)
+    results = sorted((ids for ids in results if ids is not None), key=len)
+    if not results:
+        return None
+    ids = results[0]
+    for other in results[1:]:
+        if not ids:
+            break
+        other = set(other)
+        ids = [i for i in ids if i in other]
+    return ids
+
+
+# --- Regex analysis ---
+#
+# Each parsed regex node is summarized as (exact, prefix, suffix, query):
+#   exact   set of every string the node can match, or None if unknown/too large
+#   prefix  strings one of which starts every match (only the first n-1 chars kept)
+#   suffix  strings one of which ends every match (only the last n-1 chars kept)
+#   query   n-gram query every match satisfies
+# prefix/suffix/query are only stored when exact is None. Start and end
+# anchors are the padding characters, so they take part in trigrams.
+
+_ANY = (None, frozenset([""]), frozenset([""]), None)
+_EMPTY = (frozenset([""]), None, None, None)
+
+
+def _and(*queries):
+    terms = []
+    for query in queries:
+        if query is None:
+            continue
+        for term in (query[1] if isinstance(query, tuple) and query[0] == "and" else [query]):
+            if term not in terms:
+                terms.append(term)
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else ("and", tuple(terms))
+
+
+def _or(queries):
+    terms = []
+    for query in queries:
+        if query is None:
+            return None
+        for term in (query[1] if isinstance(query, tuple) and query[0] == "or" else [query]):
+            if term not in terms:
+                terms.append(term)
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else ("or", tuple(terms))
+
+
+def _join(a, b):
+    # Repeated anchors refer to the same boundary (e.g. a user-typed '^' after ours)
+    joined = a + b
+    while WORD_START * 2 in joined:
+        joined = joined.replace(WORD_START * 2, WORD_START)
+    while WORD_END * 2 in joined:
+        joined = joined.replace(WORD_END * 2, WORD_END)
+    return joined
+
+
+def _string_query(string):
+    return _and(*(string[i:i + NGRAM_SIZE] for i in range(len(string) - NGRAM_SIZE + 1)))
+
+
+def _strings_query(strings):
+    if len(strings) > MAX_STRINGS:
+        return None
+    return _or(_string_query(string) for string in strings)
+
+
+def _trim(strings, keep_start):
+    keep = NGRAM_SIZE - 1
+    trimmed = frozenset(s[:keep] if keep_start else s[-keep:] for s in strings)
+    return trimmed if len(trimmed) <= MAX_STRINGS else frozenset([""])
+
+
+def _prefix(info):
+    return info[0] if info[0] is not None else info[1]
+
+
+def _suffix(info):
+    return info[0] if info[0] is not None else info[2]
+
+
+def _query(info):
+    return _strings_query(info[0]) if info[0] is not None else info[3]
+
+
+def _concat(x, y):
+    if x[0] is not None and y[0] is not None and len(x[0]) * len(y[0]) <= MAX_STRINGS:
+        return (frozenset(_join(a, b) for a in x[0] for b in y[0]), None, None, None)
+    suffixes, prefixes = _suffix(x), _prefix(y)
+    cross = None
+    if len(suffixes) * len(prefixes) <= MAX_STRINGS:
+        cross = _or(_string_query(_join(a, b)) for a in suffixes for b in prefixes)
+    if x[0] is not None and len(x[0]) * len(prefixes) <= MAX_STRINGS:
+        prefix = _trim((_join(a, b) for a in x[0] for b in prefixes), True)
+    else:
+        prefix = _trim(_prefix(x), True)
+    if y[0] is not None and len(suffixes) * len(y[0]) <= MAX_STRINGS:
+        suffix = _trim((_join(a, b) for a in suffixes for b in y[0]), False)
+    else:
+        suffix = _trim(_suffix(y), False)
+    return (None, prefix, suffix, _and(_query(x), _query(y), cross))
+
+
+def _alternate(infos):
+    if all(info[0] is not None for info in infos):
+        exact = frozenset().union(*(info[0] for info in infos))
+        if len(exact) <= MAX_STRINGS:
+            return (exact, None, None, None)
+    prefix = _trim(frozenset().union(*(_prefix(info) for info in infos)), True)
+    suffix = _trim(frozenset().union(*(_suffix(info) for info in infos)), False)
+    return (None, prefix, suffix, _or(_query(info) for info in infos))
+
+
+def _char_set(op, av):
+    """The lowercase letters a single-character item can match, or None."""
+    if op is sre_parse.LITERAL:
+        letter = chr(av).lower()
+        return {letter} if letter in LETTERS else None
+    if op is not sre_parse.IN:
+        return None
+    letters = set()
+    for item_op, item_av in av:
+        if item_op is sre_parse.LITERAL:
+            chars = [chr(item_av).lower()]
+        elif item_op is sre_parse.RANGE and item_av[1] - item_av[0] < MAX_STRINGS:
+            chars = [chr(c).lower() for c in range(item_av[0], item_av[1] + 1)]
+        else:
+            return None  # NEGATE, categories, large ranges
+        if not LETTERS.issuperset(chars):
+            return None
+        letters.update(chars)
+    return letters if len(letters) <= MAX_STRINGS else None
+
+
+def _analyze(items):
+    info = _EMPTY
+    for op, av in items:
+        info = _concat(info, _analyze_item(op, av))
+    return info
+
+
+def _analyze_item(op, av):
+    letters = _char_set(op, av)
+    if letters:
+        return (frozenset(letters), None, None, None)
+    if op is sre_parse.AT:
+        if av in _STARTS:
+            return (frozenset([WORD_START]), None, None, None)
+        if av in _ENDS:
+            return (frozenset([WORD_END]), None, None, None)
+        return _EMPTY
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return _EMPTY  # zero width, the characters around it stay adjacent
+    inner = group_items(op, av)
+    if inner is not None:
+        return _analyze(inner)
+    if op is sre_parse.BRANCH:
+        return _alternate([_analyze(branch) for branch in av[1]])
+    repeat = repeat_parts(op, av)
+    if repeat is not None:
+        low, high, item = repeat
+        if low == 0:
+            return _ANY
+        inner = _analyze(item)
+        if low == high == 1:
+            return inner
+        return (None, _trim(_prefix(inner), True), _trim(_suffix(inner), False), _query(inner))
+    return _ANY
+
+
+def regex_ngrams(parsed):
+    """Return the n-gram query for a parsed (sre_parse) regex."""
+    return _query(_analyze(parsed))
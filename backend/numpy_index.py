@@ -0,0 +1,107 @@
+"""
+NumPy search engine over fixed-width character matrices.
+
+Alternative to the bitset engine in word_index.py, selected with
+WORDFINDER_ENGINE=numpy. Each length bucket is stored as a contiguous uint8
+matrix (rows = words, columns = positions) plus a parallel uint32 letter-mask
+array, so positional matches and allowed/disallowed letters are evaluated as
+vectorized boolean masks. Results are identical to WordIndex, in frequency order.
+"""
+import numpy as np
+
+from ngram_index import ngram_postings
+from word_index import WordIndex, letter_mask
+
+
+class NumpyLengthBucket:
+    """All words of one length as a (words x length) uint8 matrix."""
+
+    def __init__(self, length, ids, words, masks):
+        self.length = length
+        self.ids = ids
+        self.words = words
+        self.masks = masks
+        # Non-ASCII characters become '?', which never equals an a-z pattern letter
+        encoded = "".join(words).encode("ascii", "replace")
+        self.chars = np.frombuffer(encoded, dtype=np.uint8).reshape(len(words), length)
+
+
+class NumpyWordIndex(WordIndex):
+    """WordIndex with the same search() contract, evaluated with NumPy."""
+
+    def __init__(self, lexicon):
+        # Deliberately does not build the bitset postings of WordIndex
+        self.lexicon = lexicon
+        self.words = list(lexicon)
+        self.masks = np.fromiter(
+            (letter_mask(word) for word in self.words), dtype=np.uint32, count=len(self.words)
+        )
+
+        lengths = np.fromiter((len(word) for word in self.words), dtype=np.int64, count=len(self.words))
+        self.buckets = {}
+        for length in np.unique(lengths).tolist():
+            ids = np.flatnonzero(lengths == length)
+            bucket_words = [self.words[i] for i in ids.tolist()]
+            self.buckets[length] = NumpyLengthBucket(length, ids, bucket_words, self.masks[ids])
+        self.ngrams = ngram_postings(self.words)
+
+    @staticmethod
+    def _mask_filter(masks, allowed, disallowed):
+        allowed_mask = np.uint32(letter_mask(allowed))
+        disallowed_mask = np.uint32(letter_mask(disallowed))
+        keep = (masks & allowed_mask) == allowed_mask
+        if disallowed_mask:
+            keep &= (masks & disallowed_mask) == 0
+        return keep
+
+    def _bucket_ids(self, plan):
+        bucket = self.buckets.get(plan.length)
+        if bucket is None:
+            return None, np.empty(0, dtype=np.intp)
+        keep = self._mask_filter(bucket.masks, plan.allowed, plan.disallowed)
+        if plan.positions:
+            for pos, letter in enumerate(plan.positions):
+                if letter != ".":
+                    keep &= bucket.chars[:, pos] == ord(letter)
+        constraints = plan.constraints
+        if constraints is not None:
+            for pos, letters in constraints.excluded.items():
+                if pos < bucket.length:
+                    for letter in letters:
+                        keep &= bucket.chars[:, pos] != ord(letter)
+            for letter, low, high in constraints.counts():
+                counts = (bucket.chars == ord(letter)).sum(axis=1)
+                keep &= counts >= low
+                if high is not None:
+                    keep &= counts <= high
+        return bucket, np.flatnonzero(keep)
+
+    def _bucket_matches(self, plan, start):
+        bucket, ids = self._bucket_ids(plan)
+        if bucket is None:
+            return iter(())
+        if start:
+            ids = ids[np.searchsorted(ids, start):]
+        words = bucket.words
+        return ((i, words[i]) for i in ids.tolist())
+
+    def _bucket_count(self, plan):
+        return len(self._bucket_ids(plan)[1])
+
+    def refine(self, plan, base_ids):
+        if len(base_ids) == 0:
+            return base_ids
+        ids = np.asarray(base_ids, dtype=np.intp)
+        ids = ids[self._mask_filter(self.masks[ids], plan.allowed, plan.disallowed)]
+        return super().refine(plan, ids.tolist())
+
+    def _scan_matches(self, plan, start):
+        words = self.words
+        candidates = self._ngram_candidates(plan)
+        if candidates is None:
+            ids = np.flatnonzero(self._mask_filter(self.masks[start:], plan.allowed, plan.disallowed)) + start
+        else:
+            ids = np.asarray(candidates, dtype=np.intp)
+            ids = ids[np.searchsorted(ids, start):]
+            ids = ids[self._mask_filter(self.masks[ids], plan.allowed, plan.disallowed)]
+        return ((i, words[i]) for i in ids.tolist())
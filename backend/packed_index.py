@@ -0,0 +1,277 @@
+"""
+Memory-mapped search index shared by all gunicorn workers.
+
+The whole index (word blob, offsets, letter masks, Brown frequencies, length
+buckets and their posting bitsets) is packed into one read-only file,
+wordindex.bin. Every worker maps the same file, so the pages live once in
+the OS page cache instead of once per process as Python objects. Queries
+read the mapping directly: words are decoded and bitsets converted to ints
+only for the duration of a query.
+
+File layout (native-endian uint32 fields, word blob at the end):
+    header       HEADER (see below)
+    offsets      uint32[N + 1]  byte offset of each word in the blob
+    masks        uint32[N]      26-bit letter-presence masks
+    freqs        uint32[N]      Brown corpus frequencies
+    buckets      BUCKET_ENTRY[bucket_count]
+    per bucket   uint32[count] global word ids, then (length + 1) * 26
+                 bitsets of ceil(count / 8) bytes: (position, letter) postings
+                 followed by letter presence
+    trigrams     uint32 word ids per trigram (see ngram_index.py), then
+                 GRAM_ENTRY[gram_count] sorted by key
+    blob         UTF-8 words, concatenated in frequency order
+"""
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+from lexicon import BACKEND_DIR, PRIORITY_CSV_PATH, SNAPSHOT_PATH, Lexicon, file_checksum, load_lexicon
+from ngram_index import ngram_postings
+from word_index import ALPHABET, LengthBucket, WordIndex, letter_mask, posting_flags
+
+PACKED_INDEX_VERSION = 2
+PACKED_INDEX_MAGIC = b"WFIX"
+PACKED_INDEX_PATH = os.path.join(BACKEND_DIR, 'wordindex.bin')
+
+# magic, version, word count, priority count, bucket count, gram count,
+# gram table offset, blob offset, source key
+HEADER = struct.Struct("<4sIIIIIII64s")
+# length, word count, ids offset, postings offset
+BUCKET_ENTRY = struct.Struct("<IIII")
+# trigram (UTF-8, NUL padded), ids offset, id count
+GRAM_KEY_SIZE = 12
+GRAM_ENTRY = struct.Struct(f"<{GRAM_KEY_SIZE}sII")
+
+
+def source_key():
+    """Identify the inputs the index was built from (word bank + lexicon snapshot)."""
+    parts = (file_checksum(PRIORITY_CSV_PATH)[:32], file_checksum(SNAPSHOT_PATH)[:32])
+    return "".join(part.ljust(32, "-") for part in parts).encode("ascii")
+
+
+def _align(out):
+    out.extend(bytes(-len(out) % 4))
+
+
+def pack_index(lexicon, source):
+    """Return the packed index file contents for a Lexicon."""
+    words = list(lexicon)
+
+    buckets = {}
+    for i, word in enumerate(words):
+        buckets.setdefault(len(word), []).append(i)
+    lengths = sorted(buckets)
+
+    out = bytearray(HEADER.size)
+    out += array("I", lexicon.offsets).tobytes()
+    out += array("I", (letter_mask(word) for word in words)).tobytes()
+    out += array("I", lexicon.freqs).tobytes()
+    table_offset = len(out)
+    out += bytes(BUCKET_ENTRY.size * len(lengths))
+
+    for k, length in enumerate(lengths):
+        ids = buckets[length]
+        ids_offset = len(out)
+        out += array("I", ids).tobytes()
+
+        postings_offset = len(out)
+        positions, presence = posting_flags([words[i] for i in ids])
+        empty = bytes((len(ids) + 7) // 8)
+        for pos in range(length):
+            for letter in ALPHABET:
+                out += positions.get((pos, letter), empty)
+        for letter in ALPHABET:
+            out += presence.get(letter, empty)
+        _align(out)
+        BUCKET_ENTRY.pack_into(out, table_offset + k * BUCKET_ENTRY.size, length, len(ids), ids_offset, postings_offset)
+
+    grams = sorted(
+        (gram.encode("utf-8").ljust(GRAM_KEY_SIZE, b"\0"), ids) for gram, ids in ngram_postings(words).items()
+    )
+    gram_entries = []
+    for key, ids in grams:
+        gram_entries.append(GRAM_ENTRY.pack(key, len(out), len(ids)))
+        out += ids.tobytes()
+    gram_table_offset = len(out)
+    out += b"".join(gram_entries)
+
+    blob_offset = len(out)
+    out += lexicon.blob_bytes()
+    HEADER.pack_into(
+        out, 0, PACKED_INDEX_MAGIC, PACKED_INDEX_VERSION, len(words), lexicon.priority_count, len(lengths),
+        len(grams), gram_table_offset, blob_offset, source
+    )
+    return bytes(out)
+
+
+def write_packed_index(lexicon, path=PACKED_INDEX_PATH, source=None):
+    """Pack `lexicon` and atomically replace the file at `path`. Returns the packed bytes."""
+    data = pack_index(lexicon, source or source_key())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return data
+
+
+class _Gather:
+    """Sequence view of `values` at the positions listed in `ids`."""
+
+    def __init__(self, values, ids):
+        self.values = values
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return self.values[self.ids[i]]
+
+
+class _PostingView:
+    """Dict-like access to the bitsets of one bucket, read from the mapping per lookup."""
+
+    def __init__(self, view, offset, stride, slots):
+        self.view = view
+        self.offset = offset
+        self.stride = stride
+        self.slots = slots  # key -> bitset number within the bucket
+
+    def get(self, key, default=None):
+        slot = self.slots.get(key)
+        if slot is None:
+            return default
+        start = self.offset + slot * self.stride
+        return int.from_bytes(self.view[start:start + self.stride], "little")
+
+
+class _GramTable:
+    """Dict-like trigram -> word ids lookup, binary searching the sorted gram table."""
+
+    def __init__(self, view, offset, count):
+        self.view = view
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * GRAM_ENTRY.size
+        return bytes(self.view[start:start + GRAM_KEY_SIZE])
+
+    def get(self, gram, default=None):
+        key = gram.encode("utf-8")
+        if len(key) > GRAM_KEY_SIZE:
+            return default
+        key = key.ljust(GRAM_KEY_SIZE, b"\0")
+        i = bisect_left(self, key)
+        if i == self.count or self[i] != key:
+            return default
+        _, ids_offset, size = GRAM_ENTRY.unpack_from(self.view, self.offset + i * GRAM_ENTRY.size)
+        return self.view[ids_offset:ids_offset + 4 * size].cast("I")
+
+
+class PackedBucket(LengthBucket):
+    """LengthBucket whose words, masks and postings live in the packed buffer."""
+
+    def __init__(self, length, ids, words, masks, view, postings_offset):
+        self.length = length
+        self.ids = ids
+        self.words = _Gather(words, ids)
+        self.masks = _Gather(masks, ids)
+        self.all_bits = (1 << len(ids)) - 1
+
+        stride = (len(ids) + 7) // 8
+        position_slots = {
+            (pos, letter): pos * 26 + i for pos in range(length) for i, letter in enumerate(ALPHABET)
+        }
+        presence_slots = {letter: length * 26 + i for i, letter in enumerate(ALPHABET)}
+        self.positions = _PostingView(view, postings_offset, stride, position_slots)
+        self.presence = _PostingView(view, postings_offset, stride, presence_slots)
+
+
+class PackedWordIndex(WordIndex):
+    """WordIndex engine that reads a packed index buffer (normally an mmap)."""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        header = HEADER.unpack_from(view)
+        _, _, count, priority_count, bucket_count, gram_count, gram_table_offset, blob_offset, source = header
+        self.source = source
+
+        offsets_start = HEADER.size
+        masks_start = offsets_start + 4 * (count + 1)
+        freqs_start = masks_start + 4 * count
+        table_start = freqs_start + 4 * count
+        offsets = view[offsets_start:masks_start].cast("I")
+        freqs = view[freqs_start:table_start].cast("I")
+        self.masks = view[masks_start:freqs_start].cast("I")
+        # Slicing the mmap/bytes itself is cheaper than slicing a memoryview
+        self.lexicon = Lexicon(buffer, offsets, freqs, priority_count, base=blob_offset, source="mmap")
+        self.words = self.lexicon
+
+        self.buckets = {}
+        for k in range(bucket_count):
+            length, size, ids_offset, postings_offset = BUCKET_ENTRY.unpack_from(
+                view, table_start + k * BUCKET_ENTRY.size
+            )
+            ids = view[ids_offset:ids_offset + 4 * size].cast("I")
+            self.buckets[length] = PackedBucket(length, ids, self.words, self.masks, view, postings_offset)
+        self.ngrams = _GramTable(view, gram_table_offset, gram_count)
+
+    def _scan_matches(self, plan, start):
+        # Same as WordIndex._scan_matches, with word decoding inlined for speed
+        masks = self.masks
+        buffer, base, offsets = self.lexicon.blob, self.lexicon.base, self.lexicon.offsets
+        allowed_mask = plan.allowed_mask
+        disallowed_mask = plan.disallowed_mask
+        for i in self._scan_ids(plan, start):
+            mask = masks[i]
+            if mask & allowed_mask != allowed_mask or mask & disallowed_mask:
+                continue
+            yield i, buffer[base + offsets[i]:base + offsets[i + 1]].decode("utf-8")
+
+
+def load_packed_index(path=PACKED_INDEX_PATH, source=None):
+    """
+    Map the packed index at `path` read-only. Returns None when the file is
+    missing, from another format version, or built from different inputs.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if len(mapping) < HEADER.size:
+        mapping.close()
+        return None
+    magic, version, *_, stored_source = HEADER.unpack_from(mapping)
+    if magic != PACKED_INDEX_MAGIC or version != PACKED_INDEX_VERSION or stored_source != (source or source_key()):
+        mapping.close()
+        return None
+    return PackedWordIndex(mapping)
+
+
+def open_packed_index(path=PACKED_INDEX_PATH):
+    """
+    Map the shared index, rebuilding it from the lexicon first when it is
+    missing or stale. If the file cannot be written the index is kept in
+    process memory instead.
+    """
+    source = source_key()
+    index = load_packed_index(path, source)
+    if index is not None:
+        return index
+
+    print(f"Packed index {path} is missing or stale, rebuilding it")
+    lexicon = load_lexicon()
+    try:
+        write_packed_index(lexicon, path, source)
+    except OSError as e:
+        print(f"Could not write packed index ({e}), keeping it in process memory")
+        return PackedWordIndex(pack_index(lexicon, source))
+    return load_packed_index(path, source)
@@ -0,0 +1,251 @@
+"""
+Precomputed Wordle feedback for /solve.
+
+Every guess in the Wordle word bank is scored against every possible answer
+(the solution bank) once, offline, and the feedback patterns are stored as
+one uint8 per (guess, answer) pair in patterntable.bin. A pattern is the
+feedback row in base 3, one digit per letter with the first letter as the
+lowest digit: 0 = grey, 1 = yellow, 2 = green (so 242 is solved).
+
+With the table, a guess history is a lookup and an intersection: the
+answers consistent with (guess, pattern) are the columns of the guess row
+holding that pattern, and each further guess only filters those. Like the
+packed search index the file is memory-mapped, so all workers share it and
+only the rows that are actually used are paged in.
+
+File layout:
+    header       HEADER (see below)
+    rows         uint8[guess_count][answer_count], guesses and answers in
+                 word bank / solution bank file order
+"""
+import csv
+import mmap
+import os
+import struct
+from collections import Counter
+from operator import itemgetter
+
+from constraints import GREEN, GREY, YELLOW
+from lexicon import BACKEND_DIR, PRIORITY_CSV_PATH, file_checksum
+
+PATTERN_TABLE_VERSION = 1
+PATTERN_TABLE_MAGIC = b"WFPT"
+PATTERN_TABLE_PATH = os.path.join(BACKEND_DIR, 'patterntable.bin')
+SOLUTION_CSV_PATH = os.path.join(BACKEND_DIR, 'wordle-solution-bank.csv')
+# The self solver's solution bank; the backend copy must hold the same words
+SOLVER_SOLUTION_CSV_PATH = os.path.join(
+    os.path.dirname(BACKEND_DIR), 'self_solver', 'preprocessing', 'wordle-solution-bank.csv'
+)
+
+WORD_LENGTH = 5
+SOLVED_PATTERN = 3 ** WORD_LENGTH - 1
+
+# magic, version, guess count, answer count, source key
+HEADER = struct.Struct("<4sIII64s")
+
+# Candidates scored as the suggested next guess (most frequent first)
+SUGGEST_POOL = 150
+
+
+def source_key():
+    """Identify the inputs the table was built from (word bank + solution bank)."""
+    parts = (file_checksum(PRIORITY_CSV_PATH)[:32], file_checksum(SOLUTION_CSV_PATH)[:32])
+    return "".join(part.ljust(32, "-") for part in parts).encode("ascii")
+
+
+def load_words(path):
+    """Load the 5-letter words of a word bank CSV, lowercased, in file order."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            words = [row[0].strip().lower() for row in csv.reader(f) if row and row[0].strip()]
+    except FileNotFoundError:
+        print(f"Word bank file not found: {path}")
+        return []
+    return [word for word in words if len(word) == WORD_LENGTH and word.isalpha()]
+
+
+def check_solution_bank(path=SOLUTION_CSV_PATH, solver_path=SOLVER_SOLUTION_CSV_PATH):
+    """
+    Raise ValueError if the backend solution bank and the self solver's copy
+    hold different words (case and line endings aside). Skipped when the
+    solver directory is not part of the checkout.
+    """
+    if not os.path.exists(solver_path):
+        return
+    words, solver_words = load_words(path), load_words(solver_path)
+    if words != solver_words:
+        only_backend = sorted(set(words) - set(solver_words))[:5]
+        only_solver = sorted(set(solver_words) - set(words))[:5]
+        raise ValueError(
+            f"{path} and {solver_path} differ (only in backend: {only_backend}, only in solver: {only_solver}, "
+            f"or the order differs); copy the solver's file over the backend one"
+        )
+
+
+def pattern_value(result):
+    """
+    Return the pattern of a feedback row, or raise ValueError.
+    - result: one mark per letter, g/2 = green, y/1 = yellow, b/x/0/./- = grey
+    """
+    result = str(result or "").lower()
+    if len(result) != WORD_LENGTH:
+        raise ValueError(result)
+    value = 0
+    for i, mark in enumerate(result):
+        if mark in GREEN:
+            value += 2 * 3 ** i
+        elif mark in YELLOW:
+            value += 3 ** i
+        elif mark not in GREY:
+            raise ValueError(result)
+    return value
+
+
+def calculate_pattern(guess, answer):
+    """Feedback pattern of `guess` when the answer is `answer`."""
+    value = 0
+    rest = []
+    for i in range(WORD_LENGTH):
+        if guess[i] == answer[i]:
+            value += 2 * 3 ** i
+        else:
+            rest.append(answer[i])
+    for i in range(WORD_LENGTH):
+        if guess[i] != answer[i] and guess[i] in rest:
+            value += 3 ** i
+            rest.remove(guess[i])
+    return value
+
+
+def pattern_row(guess, answers_text):
+    """
+    Return the patterns of `guess` against every answer as bytes.
+    - answers_text: the answers joined with newlines
+
+    Letters the guess does not contain cannot affect its feedback, so they
+    are blanked out first; the ~2300 answers then collapse to a few hundred
+    distinct strings and each is only scored once.
+    """
+    blank = str.maketrans({letter: "_" for letter in "abcdefghijklmnopqrstuvwxyz" if letter not in guess})
+    projected = answers_text.translate(blank).split("\n")
+    patterns = {answer: calculate_pattern(guess, answer) for answer in set(projected)}
+    return bytes(map(patterns.__getitem__, projected))
+
+
+def pack_table(guesses, answers, source):
+    """Return the pattern table file contents (slow: every guess against every answer)."""
+    answers_text = "\n".join(answers)
+    out = bytearray(HEADER.pack(PATTERN_TABLE_MAGIC, PATTERN_TABLE_VERSION, len(guesses), len(answers), source))
+    for guess in guesses:
+        out += pattern_row(guess, answers_text)
+    return bytes(out)
+
+
+def write_pattern_table(path=PATTERN_TABLE_PATH, source=None):
+    """Build the table and atomically replace the file at `path`. Returns the packed bytes."""
+    data = pack_table(load_words(PRIORITY_CSV_PATH), load_words(SOLUTION_CSV_PATH), source or source_key())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return data
+
+
+class PatternTable:
+    """
+    Guess x answer feedback patterns over a table buffer (normally an mmap).
+    - guesses / answers: the word lists the table was built from
+    - ranks: {word: frequency rank}, candidates are returned most frequent first
+    """
+
+    def __init__(self, buffer, guesses, answers, ranks=None):
+        self.buffer = buffer
+        self.guesses = guesses
+        self.answers = answers
+        self.guess_ids = {word: i for i, word in enumerate(guesses)}
+        ranks = ranks or {}
+        self.order = sorted(range(len(answers)), key=lambda j: (ranks.get(answers[j], len(ranks)), answers[j]))
+
+    def row(self, guess):
+        """Patterns of `guess` against every answer (bytes), or raise KeyError."""
+        size = len(self.answers)
+        start = HEADER.size + self.guess_ids[guess] * size
+        return self.buffer[start:start + size]
+
+    def candidates(self, history):
+        """
+        Return the answer ids consistent with every (guess, pattern) in
+        `history`, most frequent first. Raises KeyError for unknown guesses.
+        """
+        ids = self.order
+        for guess, value in history:
+            row = self.row(guess)
+            ids = [j for j in ids if row[j] == value]
+        return ids
+
+    def suggest(self, ids):
+        """
+        Return the candidate (by answer id) that best splits `ids`: the one
+        with the smallest expected number of candidates left after it is
+        played. Only the SUGGEST_POOL most frequent candidates are scored;
+        ties go to the more frequent word.
+        """
+        if len(ids) <= 2:
+            return ids[0] if ids else None
+        pick = itemgetter(*ids)
+        best, best_score = None, None
+        for j in ids[:SUGGEST_POOL]:
+            if self.answers[j] not in self.guess_ids:
+                continue
+            sizes = Counter(pick(self.row(self.answers[j]))).values()
+            score = sum(size * size for size in sizes)
+            if best_score is None or score < best_score:
+                best, best_score = j, score
+        return ids[0] if best is None else best
+
+
+def load_pattern_table(path=PATTERN_TABLE_PATH, source=None, ranks=None):
+    """
+    Map the pattern table at `path` read-only. Returns None when the file is
+    missing, from another format version, or built from different word banks.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if len(mapping) < HEADER.size:
+        mapping.close()
+        return None
+    magic, version, guess_count, answer_count, stored_source = HEADER.unpack_from(mapping)
+    if magic != PATTERN_TABLE_MAGIC or version != PATTERN_TABLE_VERSION or stored_source != (source or source_key()):
+        mapping.close()
+        return None
+    guesses = load_words(PRIORITY_CSV_PATH)
+    answers = load_words(SOLUTION_CSV_PATH)
+    if (len(guesses), len(answers)) != (guess_count, answer_count) or len(mapping) != HEADER.size + guess_count * answer_count:
+        mapping.close()
+        return None
+    return PatternTable(mapping, guesses, answers, ranks)
+
+
+def open_pattern_table(path=PATTERN_TABLE_PATH, ranks=None):
+    """
+    Map the shared pattern table, rebuilding it first when it is missing or
+    stale (this takes a while, run build_lexicon.py to do it offline). If
+    the file cannot be written the table is kept in process memory instead.
+    """
+    source = source_key()
+    table = load_pattern_table(path, source, ranks)
+    if table is not None:
+        return table
+
+    print(f"Pattern table {path} is missing or stale, rebuilding it")
+    try:
+        write_pattern_table(path, source)
+    except OSError as e:
+        print(f"Could not write pattern table ({e}), keeping it in process memory")
+        guesses, answers = load_words(PRIORITY_CSV_PATH), load_words(SOLUTION_CSV_PATH)
+        return PatternTable(pack_table(guesses, answers, source), guesses, answers, ranks)
+    return load_pattern_table(path, source, ranks)
@@ -0,0 +1,163 @@
+"""
+Compiled-pattern cache and literal prefilters for user regexes.
+
+/search accepts arbitrary regexes, matched as `^{pattern}$` (ignoring case)
+against every candidate word. Before any word is tested the pattern is parsed
+once and everything a match must contain is extracted:
+    required   a-z letters that appear in every match
+    prefix     {offset from the start: letter} for letters at a fixed offset
+    suffix     {offset from the end: letter}, only when the pattern is anchored at the end
+    min/max    bounds on the length of a matching word
+    ngrams     trigram query every match satisfies (ngram_index.py)
+The index turns these into letter-mask, (position, letter) bitset and n-gram
+posting filters, so the regex only runs on words that already satisfy them.
+The analysis is conservative: anything it does not understand adds no
+constraint.
+"""
+import re
+from functools import lru_cache
+
+from ngram_index import regex_ngrams
+from regex_syntax import LETTERS, group_items, nested_unbounded_repeat, repeat_parts, sre_parse
+
+REGEX_CACHE_SIZE = 512
+
+# Zero-width items that do not move the match position
+_ZERO_WIDTH = (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+
+
+class CompiledPattern:
+    """A compiled user regex plus the literal constraints every match satisfies."""
+
+    def __init__(self, regex, required, prefix, suffix, min_length, max_length, ngrams=None):
+        self.regex = regex
+        self.required = required
+        self.prefix = prefix
+        self.suffix = suffix
+        self.min_length = min_length
+        self.max_length = max_length  # None = unbounded
+        self.ngrams = ngrams
+
+    @property
+    def length(self):
+        """The only possible match length, or None."""
+        return self.min_length if self.min_length == self.max_length else None
+
+    def positions(self, length):
+        """
+        Return a letter-box pattern (letters and '.') of `length` with every
+        fixed letter, or None when the prefix and suffix letters conflict.
+        """
+        boxes = ["."] * length
+        for offset, letter in self.prefix.items():
+            if offset < length:
+                boxes[offset] = letter
+        for offset, letter in self.suffix.items():
+            pos = length - 1 - offset
+            if pos < 0:
+                continue
+            if boxes[pos] not in (".", letter):
+                return None
+            boxes[pos] = letter
+        return "".join(boxes)
+
+
+def _letter(op, av):
+    """The lowercase a-z letter a single-character item always matches, or None."""
+    if op is sre_parse.IN and len(av) == 1:
+        op, av = av[0]
+    if op is sre_parse.LITERAL:
+        letter = chr(av).lower()
+        if letter in LETTERS:
+            return letter
+    return None
+
+
+def _group_items(op, av):
+    """The items inside a group or a repeat that matches at least once, else None."""
+    inner = group_items(op, av)
+    if inner is not None:
+        return inner
+    repeat = repeat_parts(op, av)
+    if repeat is not None and repeat[0] >= 1:
+        return repeat[2]
+    return None
+
+
+def _required(items):
+    """Letters present in every string matched by `items`."""
+    letters = set()
+    for op, av in items:
+        letter = _letter(op, av)
+        if letter:
+            letters.add(letter)
+        elif op is sre_parse.BRANCH:
+            branches = [_required(branch) for branch in av[1]]
+            letters |= set.intersection(*branches) if branches else set()
+        elif op is sre_parse.ASSERT:
+            # A positive lookaround still has to match characters of the word
+            letters |= _required(av[1])
+        else:
+            inner = _group_items(op, av)
+            if inner is not None:
+                letters |= _required(inner)
+    return letters
+
+
+def _fixed_offsets(items, state, reverse=False):
+    """
+    Return {offset: letter} for letters at a fixed offset from the start of
+    `items` (from the end when `reverse`), up to the first variable-width item.
+    """
+    offsets = {}
+    offset = 0
+    for op, av in (reversed(items) if reverse else items):
+        if op in _ZERO_WIDTH:
+            continue
+        letter = _letter(op, av)
+        if letter:
+            offsets[offset] = letter
+        else:
+            inner = _group_items(op, av)
+            if inner is not None:
+                # The first (or last) repetition of a group is at a known offset too
+                for pos, letter in _fixed_offsets(list(inner), state, reverse).items():
+                    offsets[offset + pos] = letter
+        low, high = sre_parse.SubPattern(state, [(op, av)]).getwidth()
+        if low != high:
+            break
+        offset += low
+    return offsets
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_pattern(pattern):
+    """
+    Compile a /search regex (matched as ^pattern$, ignoring case) and extract
+    its literal constraints. Results are cached per pattern string; invalid
+    patterns, and nested unbounded repeats (see nested_unbounded_repeat),
+    raise re.error.
+    """
+    anchored = f"^{pattern}$"
+    regex = re.compile(anchored, re.IGNORECASE)
+    parsed = sre_parse.parse(anchored, re.IGNORECASE)
+    items = list(parsed)
+    if nested_unbounded_repeat(items):
+        raise re.error("nested unbounded repeats are not supported", pattern)
+
+    min_length, max_length = parsed.getwidth()
+    # A top-level '|' splits the anchors into separate branches, so only the
+    # start (regex.match) is anchored and matches can be longer than the pattern
+    end_anchored = bool(items) and items[-1] == (sre_parse.AT, sre_parse.AT_END)
+    if not end_anchored or max_length >= sre_parse.MAXREPEAT:
+        max_length = None
+
+    try:
+        required = "".join(sorted(_required(items)))
+        prefix = _fixed_offsets(items, parsed.state)
+        suffix = _fixed_offsets(items, parsed.state, reverse=True) if end_anchored else {}
+        ngrams = regex_ngrams(items)
+    except (TypeError, ValueError, IndexError):
+        # Syntax the analysis does not know: no prefilter, the regex checks every word
+        required, prefix, suffix, ngrams = "", {}, {}, None
+    return CompiledPattern(regex, required, prefix, suffix, min_length, max_length, ngrams)
@@ -0,0 +1,66 @@
+"""
+Shared helpers for walking parsed (sre_parse) /search regexes.
+
+regex_prefilter and ngram_index both analyse the parse tree of a pattern.
+The opcodes whose layout differs between Python versions are unpacked here
+so the two analyses always read groups and repeats the same way:
+    SUBPATTERN     (group, add_flags, del_flags, items)
+    ATOMIC_GROUP   items (a SubPattern), Python 3.11+
+    *_REPEAT       (min, max, items)
+"""
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+LETTERS = frozenset("abcdefghijklmnopqrstuvwxyz")
+REPEATS = tuple(
+    getattr(sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(sre_parse, name)
+)
+ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+_LOOKAROUNDS = (sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+
+
+def group_items(op, av):
+    """The items inside a (capturing, non-capturing or atomic) group, or None for any other item."""
+    if op is sre_parse.SUBPATTERN:
+        return av[-1]
+    if ATOMIC_GROUP is not None and op is ATOMIC_GROUP:
+        return av
+    return None
+
+
+def repeat_parts(op, av):
+    """(min, max, items) of a repeat, or None for any other item."""
+    if op in REPEATS:
+        return av
+    return None
+
+
+def nested_unbounded_repeat(items, inside=False):
+    """
+    True if an unbounded repeat (*, +, {n,}) contains another one, e.g.
+    (a*)* or ((.*)*)*x. These backtrack exponentially on a failing word,
+    and a single match cannot be interrupted by the search budget.
+    """
+    for op, av in items:
+        repeat = repeat_parts(op, av)
+        if repeat is not None:
+            unbounded = repeat[1] >= sre_parse.MAXREPEAT
+            if (unbounded and inside) or nested_unbounded_repeat(repeat[2], inside or unbounded):
+                return True
+            continue
+        children = group_items(op, av)
+        if children is not None:
+            branches = [children]
+        elif op is sre_parse.BRANCH:
+            branches = av[1]
+        elif op in _LOOKAROUNDS:
+            branches = [av[1]]
+        elif op is sre_parse.GROUPREF_EXISTS:
+            branches = [branch for branch in av[1:] if branch is not None]
+        else:
+            continue
+        if any(nested_unbounded_repeat(branch, inside) for branch in branches):
+            return True
+    return False
@@ -0,0 +1,20 @@
+import pytest
+
+from pattern_table import SOLUTION_CSV_PATH, check_solution_bank, load_words
+
+
+def test_backend_and_solver_solution_banks_match():
+    check_solution_bank()
+
+
+def test_check_solution_bank_reports_drift(tmp_path):
+    drifted = tmp_path / "wordle-solution-bank.csv"
+    drifted.write_text("\n".join(load_words(SOLUTION_CSV_PATH)[:-1] + ["zzzzz"]) + "\n")
+    with pytest.raises(ValueError, match="zzzzz"):
+        check_solution_bank(str(drifted))
+
+
+def test_check_solution_bank_ignores_case(tmp_path):
+    upper = tmp_path / "wordle-solution-bank.csv"
+    upper.write_text("\n".join(word.upper() for word in load_words(SOLUTION_CSV_PATH)) + "\r\n")
+    check_solution_bank(str(upper))
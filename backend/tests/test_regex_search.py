@@ -0,0 +1,142 @@
+import re
+import time
+
+import pytest
+
+import word_index
+from lexicon import Lexicon
+from ngram_index import match_ngram_ids, ngram_postings
+from regex_prefilter import compile_pattern
+from word_index import WordIndex
+
+# Frequency order is list order
+WORDS = [
+    "the", "and", "ring", "sing", "king", "string", "singing", "bring", "ringer", "reading",
+    "redo", "rebar", "undo", "unless", "under", "ended", "rested", "tested", "crane", "crate",
+    "trace", "react", "cater", "acre", "race", "care", "abba", "abbey", "abc", "abcabc",
+    "ababc", "abide", "aback", "queen", "quick", "quiz", "equal", "unique", "aqua", "q",
+    "a", "an", "in", "on", "no", "ion", "onion", "union", "inning", "eerie",
+    "three", "tree", "see", "seen", "sense", "essence", "xylem", "oxen", "tax", "taxi",
+    "mississippi", "banana", "bandana", "nab", "baa", "ebb", "rebus", "rerun", "unreal", "reuse",
+]
+
+PATTERNS = [
+    # Fixed length: prefix/suffix letters go to the bucket bitsets
+    "r..g", "..a.e", "[ct]ra.e", "c(ra|at)[nt]e", "(?:ab){2}c", "a(?=b)...",
+    # No fixed length: trigram postings
+    ".*ing", ".*ing.*", "(re|un).*", "(?:re|un).*s", ".*(ing|ed)", "re.*|un.*", ".*q.*",
+    "q.*", ".*q", "(ab)+c.*", "a.*b", ".*(ss|pp).*", ".*[aeiou]{3}.*", "(in|on)+", "e+.*e",
+    ".*x.*", "s.*e$", "^t.*", ".*", "ab*a", "(a|b)+",
+    # Atomic groups (Python 3.11+), which need their own parse-tree layout
+    "(?>re|un).*", "(?>ab|a)c.*", ".*(?>ing)", "(?>e+)rie",
+]
+
+
+def brute_force(pattern):
+    return [word for word in WORDS if re.fullmatch(pattern, word, re.IGNORECASE)]
+
+
+@pytest.fixture(scope="module")
+def index():
+    lexicon = Lexicon.from_words(WORDS, [1] * len(WORDS), priority_count=0)
+    return WordIndex(lexicon)
+
+
+def compiled_or_skip(pattern):
+    try:
+        return compile_pattern(pattern)
+    except re.error as e:
+        pytest.skip(f"{pattern!r} is not supported here: {e}")
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_search_matches_brute_force(index, pattern):
+    compiled_or_skip(pattern)
+    assert index.search(pattern) == brute_force(pattern)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_prefilter_holds_for_every_match(pattern):
+    compiled = compiled_or_skip(pattern)
+    for word in brute_force(pattern):
+        assert set(compiled.required) <= set(word)
+        assert all(word[offset] == letter for offset, letter in compiled.prefix.items())
+        assert all(word[-1 - offset] == letter for offset, letter in compiled.suffix.items())
+        assert compiled.min_length <= len(word)
+        assert compiled.max_length is None or len(word) <= compiled.max_length
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_ngram_candidates_cover_every_match(pattern):
+    compiled = compiled_or_skip(pattern)
+    candidates = match_ngram_ids(compiled.ngrams, ngram_postings(WORDS))
+    if candidates is None:
+        return
+    assert {WORDS.index(word) for word in brute_force(pattern)} <= set(candidates)
+
+
+@pytest.mark.parametrize("pattern, query", [
+    (".*ing", ("and", ("ing", "ng$"))),
+    ("(re|un).*", ("or", ("^re", "^un"))),
+    ("(?>re|un).*", ("or", ("^re", "^un"))),
+    ("(ab)+c.*", ("and", ("^ab", "abc"))),
+    (".*q.*", None),
+])
+def test_ngram_query_reduction(pattern, query):
+    assert unordered(compile_pattern(pattern).ngrams) == unordered(query)
+
+
+def unordered(query):
+    """An n-gram query with its terms as sets (alternatives come out of frozensets in any order)."""
+    if query is None or isinstance(query, str):
+        return query
+    op, terms = query
+    return op, frozenset(unordered(term) for term in terms)
+
+
+def test_match_ngram_ids_and_or():
+    postings = ngram_postings(WORDS)
+    both = match_ngram_ids(("and", ("^re", "ed$")), postings)
+    either = match_ngram_ids(("or", ("^re", "^un")), postings)
+    assert [WORDS[i] for i in both] == ["rested"]
+    assert [WORDS[i] for i in either] == [w for w in WORDS if w.startswith(("re", "un"))]
+    assert list(match_ngram_ids(("and", ("^re", "zzz")), postings)) == []
+    assert match_ngram_ids(("or", ("^re", None)), postings) is None
+
+
+@pytest.mark.parametrize("pattern", ["(a*)*b", "((.*)*)*x", "(?:x|y*)+z", "(.*a)+"])
+def test_nested_unbounded_repeats_are_rejected(pattern):
+    with pytest.raises(re.error):
+        compile_pattern(pattern)
+
+
+class TickingClock:
+    """time.monotonic stand-in that advances one second per call."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def test_truncated_page_resumes_at_the_cursor(index, monkeypatch):
+    pattern = ".*n.*"
+    expected = brute_force(pattern)
+
+    monkeypatch.setattr(word_index.time, "monotonic", TickingClock())
+    plan = index.plan(pattern, deadline=12.0)
+    words, next_start, total, page_truncated = index.counted_page(plan, 0, 100)
+    monkeypatch.undo()
+
+    assert plan.truncated and page_truncated
+    assert 0 < len(words) < len(expected)
+    assert total == len(words)
+    assert words == expected[:len(words)]
+
+    resumed = index.plan(pattern)
+    rest, rest_start, rest_total, rest_truncated = index.counted_page(resumed, len(words), 100, next_start)
+    assert words + rest == expected
+    assert rest_total == len(expected)
+    assert rest_start is None and not rest_truncated
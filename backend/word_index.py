@@ -0,0 +1,500 @@
+"""
+Prebuilt search index over the frequency-sorted word list.
+
+Words are bucketed by length and every word carries a 26-bit letter-presence
+mask, so the allowed/disallowed letter filters become a single bitwise test
+and a length filter only touches its own bucket. Buckets keep the order of
+the source list, so results stay in frequency order.
+
+Each bucket also holds posting bitsets (Python ints, bit i = i-th word of the
+bucket) per (position, letter) and per letter present. Letter-box patterns
+such as `..a.e` are answered by intersecting those bitsets, and regex is only
+used for patterns with real regex syntax. Regexes are first reduced to the
+letters and positions every match must have (regex_prefilter.py), so the
+same bitsets narrow the candidates the regex runs on. Regexes without a known
+length are narrowed by trigram postings instead (ngram_index.py).
+"""
+import re
+import time
+from array import array
+from bisect import bisect_left
+from itertools import islice
+
+from constraints import CONFLICT
+from ngram_index import match_ngram_ids, ngram_postings
+from regex_prefilter import compile_pattern
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+LETTER_BITS = {letter: 1 << i for i, letter in enumerate(ALPHABET)}
+
+# Patterns made only of literal letters and '.' (what the letter boxes send)
+FIXED_PATTERN = re.compile(r"[A-Za-z.]+")
+
+
+def letter_mask(letters):
+    """
+    Return the 26-bit presence mask for the a-z letters in `letters`.
+    Any other characters are ignored.
+    """
+    mask = 0
+    for letter in letters:
+        mask |= LETTER_BITS.get(letter, 0)
+    return mask
+
+
+def iter_bits(bits):
+    """Yield the positions of the set bits in `bits`, lowest first."""
+    digits = bin(bits)[:1:-1]  # least significant bit first, without '0b'
+    i = digits.find("1")
+    while i != -1:
+        yield i
+        i = digits.find("1", i + 1)
+
+
+def _to_bitset(flags):
+    return int.from_bytes(flags, "little")
+
+
+def posting_flags(words):
+    """
+    Return ({(position, letter): flags}, {letter: flags}) for `words`, where
+    flags is a little-endian bytearray with bit i set for the i-th word.
+    """
+    size = (len(words) + 7) // 8
+    positions = {}
+    presence = {}
+    for i, word in enumerate(words):
+        byte, bit = i >> 3, 1 << (i & 7)
+        for pos, letter in enumerate(word):
+            flags = positions.get((pos, letter))
+            if flags is None:
+                flags = positions[(pos, letter)] = bytearray(size)
+            flags[byte] |= bit
+            flags = presence.get(letter)
+            if flags is None:
+                flags = presence[letter] = bytearray(size)
+            flags[byte] |= bit
+    return positions, presence
+
+
+class LengthBucket:
+    """All words of one length, in frequency order, with their posting bitsets."""
+
+    def __init__(self, length):
+        self.length = length
+        self.ids = array("I")  # global word ids, ascending
+        self.words = []
+        self.masks = []
+
+    def build_postings(self):
+        positions, presence = posting_flags(self.words)
+        self.all_bits = (1 << len(self.words)) - 1
+        # (position, letter) -> bitset of words with that letter at that position
+        self.positions = {key: _to_bitset(flags) for key, flags in positions.items()}
+        # letter -> bitset of words containing that letter anywhere
+        self.presence = {key: _to_bitset(flags) for key, flags in presence.items()}
+
+    def match_bits(self, fixed=None, allowed=(), disallowed=(), constraints=None):
+        """
+        Return the bitset of words matching a fixed-position pattern and the
+        allowed/disallowed letters.
+        - fixed: lowercase letter-box pattern of this bucket's length (or None)
+        - constraints: Constraints with excluded letters per position and
+          letter counts (its fixed letters are expected in `fixed`)
+        """
+        bits = self.all_bits
+        if fixed:
+            for pos, letter in enumerate(fixed):
+                if letter != ".":
+                    bits &= self.positions.get((pos, letter), 0)
+        for letter in allowed:
+            bits &= self.presence.get(letter, 0)
+        for letter in disallowed:
+            bits &= ~self.presence.get(letter, 0)
+        if constraints is not None:
+            for pos, letters in constraints.excluded.items():
+                for letter in letters:
+                    bits &= ~self.positions.get((pos, letter), 0)
+            for letter, low, high in constraints.counts():
+                if low > 1:
+                    bits &= self.count_bits(letter, low)
+                if high is not None:
+                    bits &= ~self.count_bits(letter, high + 1)
+        return bits
+
+    def count_bits(self, letter, count):
+        """Return the bitset of words with at least `count` copies of `letter`."""
+        if count > self.length:
+            return 0
+        # at_least[k]: words with k or more copies among the positions seen so far
+        at_least = [self.all_bits] + [0] * count
+        for pos in range(self.length):
+            bits = self.positions.get((pos, letter), 0)
+            if bits:
+                for k in range(count, 0, -1):
+                    at_least[k] |= at_least[k - 1] & bits
+        return at_least[count]
+
+
+def load_word_index(engine="mmap"):
+    """
+    Load the search index for the backend word list with the chosen engine.
+    - mmap: packed index file shared by all workers (packed_index.py)
+    - python / numpy: built in process memory from the lexicon
+    """
+    if engine.strip().lower() == "mmap":
+        from packed_index import open_packed_index
+        return open_packed_index()
+    from lexicon import load_lexicon
+    return build_word_index(load_lexicon(), engine)
+
+
+def build_word_index(lexicon, engine="python"):
+    """
+    Build the search index for a Lexicon with the chosen engine.
+    - python: bitset postings and letter masks (this module)
+    - numpy: vectorized character matrices (numpy_index.py, needs numpy)
+    """
+    engine = engine.strip().lower()
+    if engine == "python":
+        return WordIndex(lexicon)
+    if engine == "numpy":
+        # Optional dependency: only this engine needs numpy
+        try:
+            from numpy_index import NumpyWordIndex
+        except ImportError as e:
+            raise RuntimeError("WORDFINDER_ENGINE=numpy needs numpy (pip install numpy)") from e
+        return NumpyWordIndex(lexicon)
+    raise ValueError(f"Unsupported search engine: {engine}")
+
+
+class WordIndex:
+    """
+    Length buckets of (word, letter mask) pairs, built once at import time.
+    Subclasses provide other engines by overriding the _bucket_* and
+    _scan_matches hooks.
+    """
+
+    def __init__(self, lexicon):
+        # This engine trades memory for speed and keeps a str per word
+        self.lexicon = lexicon
+        self.words = list(lexicon)
+        self.masks = [letter_mask(word) for word in self.words]
+
+        # length -> LengthBucket, each in the same order as `words`
+        self.buckets = {}
+        for i, (word, mask) in enumerate(zip(self.words, self.masks)):
+            bucket = self.buckets.get(len(word))
+            if bucket is None:
+                bucket = self.buckets[len(word)] = LengthBucket(len(word))
+            bucket.ids.append(i)
+            bucket.words.append(word)
+            bucket.masks.append(mask)
+        for bucket in self.buckets.values():
+            bucket.build_postings()
+
+        # trigram -> ascending word ids, for regexes without a known length
+        self.ngrams = ngram_postings(self.words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def plan(self, pattern=None, length=None, allowed=(), disallowed=(), deadline=None, constraints=None):
+        """
+        Classify a query once so it can be counted and paged without re-parsing.
+        - pattern: regex string (None or empty means match all)
+        - length: int or None
+        - allowed: set of letters that must be present
+        - disallowed: set of letters that must NOT be present
+        - deadline: time.monotonic() value after which regex matching stops
+          and the plan is marked truncated (None = no limit)
+        - constraints: Constraints (per-position exclusions, letter counts)
+        """
+        return SearchPlan(pattern, length, allowed, disallowed, deadline, constraints)
+
+    def search(self, pattern=None, length=None, allowed=(), disallowed=()):
+        """Return the words matching every given filter, in frequency order."""
+        plan = self.plan(pattern, length, allowed, disallowed)
+        return [word for _, word in self.iter_matches(plan)]
+
+    def iter_matches(self, plan, start=0):
+        """
+        Yield (position, word) for every match of `plan` in frequency order,
+        beginning at index position `start`. Positions only make sense for the
+        same plan and let a later page resume without rescanning from word zero.
+        """
+        if plan.empty:
+            return iter(())
+        # Both produce candidates that pass the letter and position filters
+        if plan.length is not None:
+            matches = self._bucket_matches(plan, start)
+        else:
+            matches = self._scan_matches(plan, start)
+        if plan.regex is not None:
+            matches = self._regex_matches(plan, matches)
+        if plan.constraints is not None and plan.length is None:
+            # Without a length bucket there are no bitsets to apply them to
+            matches = ((pos, word) for pos, word in matches if plan.constraints.accepts(word))
+        if not plan.has_extras:
+            return matches
+        return ((pos, word) for pos, word in matches if plan.accepts_extras(word))
+
+    def count(self, plan):
+        """Return the number of matches of `plan` without building the result list."""
+        if plan.empty:
+            return 0
+        if plan.regex is None and plan.length is not None and not plan.has_extras:
+            return self._bucket_count(plan)
+        return sum(1 for _ in self.iter_matches(plan))
+
+    def page(self, plan, offset=0, limit=None, start=None):
+        """
+        Return (words, next_start) for up to `limit` matches.
+        Resumes at index position `start` when given (the cursor of a previous
+        page), otherwise skips the first `offset` matches. next_start is None
+        when there are no further matches.
+        """
+        matches = self.iter_matches(plan, start or 0)
+        if start is None and offset:
+            matches = islice(matches, offset, None)
+        words = []
+        for pos, word in matches:
+            if limit is not None and len(words) == limit:
+                return words, pos
+            words.append(word)
+        return words, plan.resume
+
+    def counted_page(self, plan, offset=0, limit=None, start=None):
+        """
+        page() and the match count in one pass: after the page is filled the
+        remaining matches are counted instead of running the plan again.
+        Returns (words, next_start, total, page_truncated). page_truncated is
+        True when the deadline passed before the page was complete; when it
+        passes while counting, plan.truncated is set and total is a lower bound.
+        Resuming at `start` counts the `offset` earlier matches without rescanning.
+        """
+        if plan.regex is None:
+            words, next_start = self.page(plan, offset, limit, start)
+            return words, next_start, self.count(plan), False
+        total = offset if start is not None else 0
+        words = []
+        next_start = None
+        page_truncated = None
+        for pos, word in self.iter_matches(plan, start or 0):
+            total += 1
+            if start is None and total <= offset:
+                continue
+            if limit is not None and len(words) == limit:
+                if next_start is None:
+                    next_start = pos
+                    page_truncated = False
+                continue
+            words.append(word)
+        if page_truncated is None:
+            # The scan ended before the page was filled
+            page_truncated = plan.truncated
+            next_start = plan.resume
+        return words, next_start, total, page_truncated
+
+    def global_id(self, plan, position):
+        """
+        Return the word id (index into `words`) for a position of `plan`, or
+        None when the position is past the last word (e.g. a stale cursor).
+        """
+        if plan.length is None:
+            return position if position < len(self.words) else None
+        bucket = self.buckets.get(plan.length)
+        if bucket is None or position >= len(bucket.ids):
+            return None
+        return bucket.ids[position]
+
+    def position(self, plan, word_id):
+        """Inverse of global_id: the position of `plan` at or after `word_id`."""
+        if plan.length is None:
+            return word_id
+        bucket = self.buckets.get(plan.length)
+        return bisect_left(bucket.ids, word_id) if bucket is not None else 0
+
+    def match_ids(self, plan):
+        """Return the word ids of every match of `plan`, ascending (frequency order)."""
+        if plan.empty or (plan.length is not None and plan.length not in self.buckets):
+            return array("I")
+        return array("I", (self.global_id(plan, pos) for pos, _ in self.iter_matches(plan)))
+
+    def refine(self, plan, base_ids):
+        """
+        Return the ids among `base_ids` that match `plan`. When `plan` narrows
+        the query that produced `base_ids`, this equals match_ids(plan) at a
+        cost proportional to the previous result size. The result is
+        incomplete if the plan ends up truncated.
+        """
+        words, masks = self.words, self.masks
+        if plan.regex is None:
+            return array("I", (i for i in base_ids if plan.accepts(words[i], masks[i])))
+        ids = array("I")
+        for i in base_ids:
+            # Checked per word: one pathological match can cost milliseconds
+            if plan.out_of_time():
+                break
+            if plan.accepts(words[i], masks[i]):
+                ids.append(i)
+        return ids
+
+    @staticmethod
+    def _regex_matches(plan, candidates):
+        """
+        Run the plan's regex over (position, word) candidates. Stops once the
+        plan's deadline has passed, marking it truncated and recording the
+        position to resume from.
+        """
+        regex = plan.regex
+        for pos, word in candidates:
+            if plan.out_of_time():
+                plan.resume = pos
+                return
+            if regex.match(word):
+                yield pos, word
+
+    def _bucket_matches(self, plan, start):
+        bucket = self.buckets.get(plan.length)
+        if bucket is None:
+            return iter(())
+        bits = bucket.match_bits(plan.positions, plan.allowed, plan.disallowed, plan.constraints) >> start
+        words = bucket.words
+        return ((start + i, words[start + i]) for i in iter_bits(bits))
+
+    def _bucket_count(self, plan):
+        bucket = self.buckets.get(plan.length)
+        if bucket is None:
+            return 0
+        return bin(bucket.match_bits(plan.positions, plan.allowed, plan.disallowed, plan.constraints)).count("1")
+
+    def _ngram_candidates(self, plan):
+        """
+        Return the ascending ids of the words containing every trigram the
+        plan's regex needs, or None when it needs none. Kept on the plan,
+        which is counted and paged with the same candidates.
+        """
+        if plan.ngrams is None:
+            return None
+        if plan.candidates is None:
+            plan.candidates = match_ngram_ids(plan.ngrams, self.ngrams)
+        return plan.candidates
+
+    def _scan_ids(self, plan, start):
+        candidates = self._ngram_candidates(plan)
+        if candidates is None:
+            return range(start, len(self.words))
+        return islice(candidates, bisect_left(candidates, start), None)
+
+    def _scan_matches(self, plan, start):
+        # Only used without a length: every candidate passing the letter masks
+        words, masks = self.words, self.masks
+        allowed_mask = plan.allowed_mask
+        disallowed_mask = plan.disallowed_mask
+        for pos in self._scan_ids(plan, start):
+            mask = masks[pos]
+            if mask & allowed_mask != allowed_mask or mask & disallowed_mask:
+                continue
+            yield pos, words[pos]
+
+
+class SearchPlan:
+    """
+    A parsed query. Letter-box patterns become `fixed` (and imply the length),
+    anything else with a pattern is compiled to `regex`. `positions` is the
+    letter-box pattern used against the bucket bitsets: `fixed`, or the
+    letters a regex has at known positions.
+    """
+
+    def __init__(self, pattern=None, length=None, allowed=(), disallowed=(), deadline=None, constraints=None):
+        # Letters outside a-z are not indexed, fall back to a plain check
+        self.extra_allowed = [l for l in allowed if l not in LETTER_BITS]
+        self.extra_disallowed = [l for l in disallowed if l not in LETTER_BITS]
+        self.allowed = [l for l in allowed if l in LETTER_BITS]
+        self.disallowed = [l for l in disallowed if l in LETTER_BITS]
+        self.has_extras = bool(self.extra_allowed or self.extra_disallowed)
+
+        if length is None and constraints is not None:
+            length = constraints.length  # feedback rows imply the word length
+        self.fixed = None
+        self.positions = None
+        self.regex = None
+        self.ngrams = None
+        self.candidates = None  # n-gram candidate ids, filled in by the index
+        self.length = length
+        self.empty = False
+        if pattern and FIXED_PATTERN.fullmatch(pattern):
+            self.fixed = self.positions = pattern.lower()
+            if length is not None and length != len(self.fixed):
+                self.empty = True
+            self.length = len(self.fixed)
+        elif pattern:
+            compiled = compile_pattern(pattern)
+            self.regex = compiled.regex
+            self.ngrams = compiled.ngrams
+            # Letters every match contains only narrow the candidates further
+            self.allowed = sorted(set(self.allowed).union(compiled.required))
+            if length is None:
+                self.length = compiled.length
+            elif length < compiled.min_length or (compiled.max_length is not None and length > compiled.max_length):
+                self.empty = True
+            if self.length is not None:
+                self.positions = compiled.positions(self.length)
+                if self.positions is None:
+                    self.empty = True
+
+        self.constraints = constraints
+        if constraints is not None:
+            self._add_constraints(constraints)
+
+        self.allowed_mask = letter_mask(self.allowed)
+        self.disallowed_mask = letter_mask(self.disallowed)
+
+        self.deadline = deadline
+        self.truncated = False
+        self.resume = None  # position to continue from after truncation
+
+    def _add_constraints(self, constraints):
+        # Present/absent letters join the letter masks, fixed letters the positions
+        self.allowed = sorted(set(self.allowed) | constraints.present())
+        self.disallowed = sorted(set(self.disallowed) | constraints.absent())
+        if constraints.key() == CONFLICT:
+            self.empty = True
+        if constraints.length not in (None, self.length):
+            self.empty = True
+        if self.length is None or self.empty:
+            return
+        positions = list(self.positions or "." * self.length)
+        for pos, letter in constraints.fixed.items():
+            if pos >= self.length or positions[pos] not in (".", letter):
+                self.empty = True
+                return
+            positions[pos] = letter
+        self.positions = "".join(positions)
+
+    def out_of_time(self):
+        """True once the deadline has passed; the plan is then marked truncated."""
+        if not self.truncated and self.deadline is not None and time.monotonic() > self.deadline:
+            self.truncated = True
+        return self.truncated
+
+    def accepts(self, word, mask):
+        """Check a single word (and its letter mask) against the whole plan."""
+        if self.empty or (self.length is not None and len(word) != self.length):
+            return False
+        if mask & self.allowed_mask != self.allowed_mask or mask & self.disallowed_mask:
+            return False
+        if self.fixed and any(l != "." and l != c for l, c in zip(self.fixed, word)):
+            return False
+        if self.regex and not self.regex.match(word):
+            return False
+        if self.constraints is not None and not self.constraints.accepts(word):
+            return False
+        return not self.has_extras or self.accepts_extras(word)
+
+    def accepts_extras(self, word):
+        return (
+            all(l in word for l in self.extra_allowed)
+            and not any(l in word for l in self.extra_disallowed)
+        )
@@ -11,8 +11,10 @@ async function getStats() {
     }
 }
 
-// Search words via backend API
-async function postSearch(pattern, length, allowed, disallowed) {
+// Search words via backend API (constraints holds structured fields such as
+// min_counts/max_counts, cursor continues a previous page, base names the
+// previous query so a narrower one only filters its results)
+async function postSearch(pattern, length, constraints, cursor = null, base = null) {
     try {
         const resp = await fetch(`${BACKEND_URL}/search`, {
             method: "POST",
@@ -20,8 +22,9 @@ async function postSearch(pattern, length, allowed, disallowed) {
             body: JSON.stringify({
                 pattern,
                 length,
-                allowed,
-                disallowed
+                ...constraints,
+                cursor,
+                base
             })
         });
         return await resp.json();
@@ -44,13 +47,41 @@ async function searchWords() {
     let len = parseInt(lengthFilter);
     if (isNaN(len) || len <= 0) len = null;
 
-    const allowed = Object.entries(keyStates).filter(([l, s]) => s === 'allowed').map(([l]) => l.toLowerCase());
-    const disallowed = Object.entries(keyStates).filter(([l, s]) => s === 'disallowed').map(([l]) => l.toLowerCase());
+    const constraints = keyboardConstraints();
+    const data = await postSearch(pattern, len, constraints, null, lastToken);
 
-    const data = await postSearch(pattern, len, allowed, disallowed);
+    // Remember the query so "Load more" can fetch the next page
+    lastQuery = { pattern, len, constraints };
+    lastToken = data?.token || null;
+    currentMatches = data?.matches || [];
+    nextCursor = data?.next_cursor || null;
 
-    document.getElementById('matchCount').textContent = `Matches: ${data?.total.toLocaleString()}`;
-    displayWords(data?.matches, data?.total);
+    // A search that ran out of time only has a lower bound for the total
+    const plus = data?.total_exact === false ? '+' : '';
+    document.getElementById('matchCount').textContent = `Matches: ${data?.total.toLocaleString()}${plus}`;
+    displayWords(currentMatches, data?.total);
+}
+
+async function loadMoreWords() {
+    if (!lastQuery || !nextCursor) return;
+    const { pattern, len, constraints } = lastQuery;
+    const data = await postSearch(pattern, len, constraints, nextCursor);
+
+    currentMatches = currentMatches.concat(data?.matches || []);
+    nextCursor = data?.next_cursor || null;
+    displayWords(currentMatches, data?.total);
+}
+
+// Keyboard states as letter-count constraints:
+// allowed = at least one copy, disallowed = none
+function keyboardConstraints() {
+    const min_counts = {};
+    const max_counts = {};
+    Object.entries(keyStates).forEach(([l, s]) => {
+        if (s === 'allowed') min_counts[l] = 1;
+        if (s === 'disallowed') max_counts[l] = 0;
+    });
+    return { min_counts, max_counts };
 }
 
 // Initialize the application
@@ -125,7 +156,7 @@ function displayWords(words, totalMatches) {
     wordList.innerHTML = '';
     wordList.appendChild(wordGrid);
 
-    // Show note if total matches exceed load limit
+    // Show note if total matches exceed what has been loaded so far
     if (typeof totalMatches === "number" && totalMatches > words.length) {
         const note = document.createElement('div');
         note.style.textAlign = "center";
@@ -133,6 +164,15 @@ function displayWords(words, totalMatches) {
         note.style.marginTop = "10px";
         note.textContent = `Showing first ${words.length} of ${totalMatches.toLocaleString()} matches.`;
         wordList.appendChild(note);
+
+        if (nextCursor) {
+            const loadMoreBtn = document.createElement('button');
+            loadMoreBtn.textContent = 'Load more';
+            loadMoreBtn.style.display = "block";
+            loadMoreBtn.style.margin = "10px auto";
+            loadMoreBtn.addEventListener('click', loadMoreWords);
+            wordList.appendChild(loadMoreBtn);
+        }
     }
 }
 
@@ -145,6 +185,12 @@ const KEYBOARD_ROWS = [
     "ZXCVBNM".split("")
 ];
 
+// Paging state for the current search
+let currentMatches = [];
+let nextCursor = null;
+let lastQuery = null;
+let lastToken = null;
+
 // Track key states: allowed/disallowed/neutral/inline
 const keyStates = {};
 "ABCDEFGHIJKLMNOPQRSTUVWXYZ".split("").forEach(l => keyStates[l.toLowerCase()] = "neutral");
@@ -0,0 +1,72 @@
+"""Warm Chromium for SOURCE_MODE = "nyt_async" to attach to.
+
+Launches Chromium once (with the persistent profile unless --incognito) and
+exposes the DevTools protocol on 127.0.0.1:<port>, then waits until it is
+stopped. Each solve connects over CDP and only opens a page, instead of
+booting the browser:
+
+    python browser_daemon.py [--port 9222] [--incognito] [--headed]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+
+from playwright.async_api import async_playwright  # type: ignore
+
+from self_solve import BROWSER_MODE, CHROMIUM_USER_DATA_DIR, HEADLESS
+from sources.nyt_source import LAUNCH_ARGS, chromium_executable_path
+
+
+async def run_daemon(port: int, browser_mode: str, headless: bool) -> None:
+    args = [
+        *LAUNCH_ARGS,
+        "--remote-debugging-address=127.0.0.1",
+        f"--remote-debugging-port={port}",
+    ]
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+
+    async with async_playwright() as playwright:
+        if browser_mode == "incognito":
+            # Solves open their own context, nothing to keep besides the browser
+            browser = await playwright.chromium.launch(
+                headless=headless,
+                executable_path=chromium_executable_path(),
+                args=args,
+            )
+            close = browser.close
+        else:
+            context = await playwright.chromium.launch_persistent_context(
+                user_data_dir=os.path.expanduser(CHROMIUM_USER_DATA_DIR),
+                headless=headless,
+                executable_path=chromium_executable_path(),
+                args=args,
+                no_viewport=True,
+            )
+            close = context.close
+
+        print(f"Chromium ({browser_mode}) listening on http://127.0.0.1:{port}, stop with Ctrl+C")
+        await stopped.wait()
+        print("Stopping Chromium...")
+        await close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Keep a Chromium running for the async NYT source.")
+    parser.add_argument("--port", type=int, default=9222, help="DevTools port to listen on")
+    parser.add_argument("--incognito", action="store_true", help="do not load the persistent profile")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args()
+
+    browser_mode = "incognito" if args.incognito else BROWSER_MODE
+    asyncio.run(run_daemon(args.port, browser_mode, HEADLESS and not args.headed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
+import atexit
 import os
-import requests
+import threading
 from enum import Enum
 from dotenv import load_dotenv
 
+from .dispatcher import DiscordDispatcher
+
 class MessageType(Enum):
     WARNING = "warning"
     ERROR = "error"
@@ -15,15 +18,29 @@ EMBED_COLORS = {
     MessageType.SUCCESS: 0x00FF00,  # Green (not used for embed, but can be added)
 }
 
-# Optionally, you can add color codes or Discord embeds for richer formatting
+_dispatcher = None
+_dispatcher_loaded = False
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Shared dispatcher, created from .env on first use (None if DISCORD_WEBHOOK_URL is missing)."""
+    global _dispatcher, _dispatcher_loaded
+    with _dispatcher_lock:
+        if not _dispatcher_loaded:
+            _dispatcher_loaded = True
+            load_dotenv()
+            webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+            if webhook_url:
+                _dispatcher = DiscordDispatcher(webhook_url, os.getenv("DISCORD_USERNAME"))
+                atexit.register(_dispatcher.flush)
+        return _dispatcher
 
-def send_discord_message(message: str, msg_type: MessageType = MessageType.SUCCESS, exception: Exception = None):
-    """Send a formatted message to Discord webhook according to message type, with embed color for warning/error."""
-    load_dotenv()
-    webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-    username = os.getenv("DISCORD_USERNAME")
 
-    if not webhook_url:
+def send_discord_message(message: str, msg_type: MessageType = MessageType.SUCCESS, exception: Exception = None):
+    """Queue a formatted message for the Discord webhook according to message type, with embed color for warning/error."""
+    dispatcher = get_dispatcher()
+    if dispatcher is None:
         print("Discord webhook URL missing (DISCORD_WEBHOOK_URL)")
         return
 
@@ -38,20 +55,17 @@ def send_discord_message(message: str, msg_type: MessageType = MessageType.SUCCE
             "description": content,
             "color": color
         }
-        payload = {
-            "embeds": [embed]
-        }
+        dispatcher.send({"embed": embed})
     else:
-        payload = {
-            "content": content
-        }
+        dispatcher.send({"content": content})
 
-    if username:
-        payload["username"] = username
 
-    try:
-        response = requests.post(webhook_url, json=payload)
-        if response.status_code not in (200, 204):
-            print(f"Discord webhook failed: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"Discord webhook error: {e}")
+def flush_discord_messages(timeout: float = 30.0) -> bool:
+    """Block until queued messages have been sent. Returns False if they are still pending after `timeout`."""
+    dispatcher = _dispatcher
+    if dispatcher is None:
+        return True
+    flushed = dispatcher.flush(timeout)
+    if not flushed:
+        print(f"Discord messages still pending after {timeout:.0f}s")
+    return flushed
@@ -0,0 +1,189 @@
+"""
+Background Discord webhook dispatcher.
+
+Messages are queued and sent from one worker thread over a persistent
+requests.Session, so callers never wait on the network. Messages queued
+within `coalesce_window` seconds of each other go out in one webhook call
+when they are of the same kind and fit Discord's limits (consecutive plain
+messages are joined into `content`, consecutive warning/error embeds into
+`embeds`), so messages always arrive in the order they were queued. 429 and
+5xx responses are retried with backoff, waiting as long as Discord's
+rate-limit body/headers ask for. A payload that still fails is logged and
+dropped; the worker keeps running.
+"""
+import queue
+import threading
+import time
+
+import requests
+
+# Discord webhook limits
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBED_TOTAL_LENGTH = 6000
+
+
+class DiscordDispatcher:
+    def __init__(
+        self,
+        webhook_url: str,
+        username: str = None,
+        coalesce_window: float = 1.0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+    ):
+        self.webhook_url = webhook_url
+        self.username = username
+        self.coalesce_window = coalesce_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        # Monotonic time before which the next request must not be sent (rate-limit bucket empty)
+        self.not_before = 0.0
+
+    def send(self, part: dict):
+        """Queue one message part: {"content": str} or {"embed": dict}."""
+        self._ensure_worker()
+        self.queue.put(part)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until everything queued so far has been sent (or given up on). Returns False on timeout."""
+        if self.thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_worker(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="discord-dispatcher", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            batch = []
+            markers = []
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            try:
+                for payload in coalesce(batch, self.username):
+                    try:
+                        self._post(payload)
+                    except Exception as e:
+                        print(f"Discord webhook error, message dropped: {e}")
+            except Exception as e:
+                print(f"Discord dispatcher could not pack {len(batch)} messages: {e}")
+            finally:
+                for marker in markers:
+                    marker.set()
+
+    def _post(self, payload: dict):
+        for attempt in range(self.max_retries + 1):
+            wait = self.not_before - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            response = None
+            try:
+                response = self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"Discord webhook error: {e}")
+            else:
+                self._update_rate_limit(response)
+                if response.status_code in (200, 204):
+                    return
+                if response.status_code != 429 and response.status_code < 500:
+                    print(f"Discord webhook failed: {response.status_code} - {response.text}")
+                    return
+                print(f"Discord webhook returned {response.status_code}, retrying")
+
+            if attempt < self.max_retries:
+                time.sleep(self._retry_delay(response, attempt))
+        print(f"Discord webhook gave up after {self.max_retries + 1} attempts")
+
+    def _update_rate_limit(self, response):
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset_after = _parse_seconds(response.headers.get("X-RateLimit-Reset-After"))
+            if reset_after is not None:
+                self.not_before = time.monotonic() + reset_after
+
+    def _retry_delay(self, response, attempt: int) -> float:
+        if response is not None and response.status_code == 429:
+            try:
+                retry_after = _parse_seconds(response.json().get("retry_after"))
+            except ValueError:
+                retry_after = None
+            if retry_after is None:
+                retry_after = _parse_seconds(response.headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = _parse_seconds(response.headers.get("X-RateLimit-Reset-After"))
+            if retry_after is not None:
+                return retry_after
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+
+def _parse_seconds(value):
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _embed_length(embed: dict) -> int:
+    return len(embed.get("title", "")) + len(embed.get("description", ""))
+
+
+def coalesce(parts: list, username: str = None) -> list:
+    """Pack message parts, in order, into as few webhook payloads as Discord's limits allow.
+
+    Only runs of the same kind share a payload: Discord shows embeds below
+    the content, so mixing them would reorder the messages.
+    """
+    payloads = []
+    current = None
+    for part in parts:
+        content = part.get("content")
+        embed = part.get("embed")
+        fits = current is not None
+        if fits and content is not None:
+            joined = f"{current['content']}\n\n{content}" if current.get("content") else content
+            fits = "embeds" not in current and len(joined) <= MAX_CONTENT_LENGTH
+        elif fits:
+            embeds = current.get("embeds", [])
+            fits = (
+                "content" not in current
+                and len(embeds) < MAX_EMBEDS
+                and sum(_embed_length(e) for e in embeds) + _embed_length(embed) <= MAX_EMBED_TOTAL_LENGTH
+            )
+
+        if not fits:
+            current = {}
+            if username:
+                current["username"] = username
+            payloads.append(current)
+        if content is not None:
+            current["content"] = f"{current['content']}\n\n{content}" if current.get("content") else content
+        else:
+            current.setdefault("embeds", []).append(embed)
+    return payloads
@@ -0,0 +1,67 @@
+"""
+Microbenchmark for the feedback pattern kernels.
+Scores a sample of word bank guesses against the whole solution bank with
+the scalar calculate_pattern and the batched calculate_patterns (pure
+Python and, when installed, NumPy), after checking that all of them agree
+on the full word bank. Run from the self_solver directory:
+
+    python -m preprocessing.benchmark_patterns [sample_size]
+"""
+
+import sys
+import time
+
+from strategy.pattern_matrix import GUESS_BANK_PATH, SOLUTION_BANK_PATH, load_word_bank
+from strategy.pattern_utils import EncodedWords, calculate_pattern, calculate_patterns, np
+
+
+def check_identical(guesses, answers, encoded):
+    """Compare every kernel with calculate_pattern for every guess x answer pair."""
+    kernels = [False] + ([True] if np is not None else [])
+    for guess in guesses:
+        expected = bytes(calculate_pattern(guess, answer) for answer in answers)
+        for use_numpy in kernels:
+            if calculate_patterns(guess, encoded, use_numpy=use_numpy) != expected:
+                raise AssertionError(f"Pattern mismatch for guess {guess} (numpy={use_numpy})")
+
+
+def time_per_guess(score, guesses):
+    started = time.perf_counter()
+    for guess in guesses:
+        score(guess)
+    return (time.perf_counter() - started) / len(guesses)
+
+
+def main():
+    sample_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    guesses = load_word_bank(GUESS_BANK_PATH)
+    answers = load_word_bank(SOLUTION_BANK_PATH)
+    encoded = EncodedWords(answers)
+    sample = guesses[:: max(len(guesses) // sample_size, 1)][:sample_size]
+
+    print(f"Checking kernels on {len(guesses)} guesses x {len(answers)} answers...")
+    check_identical(guesses, answers, encoded)
+    print("✅ All kernels match calculate_pattern")
+
+    print(f"\nTiming {len(sample)} guesses against {len(answers)} answers:")
+    baseline = time_per_guess(lambda guess: [calculate_pattern(guess, answer) for answer in answers], sample)
+    results = [("calculate_pattern (scalar)", baseline)]
+    results.append((
+        "calculate_patterns (python)",
+        time_per_guess(lambda guess: calculate_patterns(guess, encoded, use_numpy=False), sample),
+    ))
+    if np is not None:
+        results.append((
+            "calculate_patterns (numpy)",
+            time_per_guess(lambda guess: calculate_patterns(guess, encoded), sample),
+        ))
+    else:
+        print("NumPy not installed, skipping the NumPy kernel")
+
+    for name, seconds in results:
+        full_bank = seconds * len(guesses)
+        print(f"{name:30s} {seconds * 1e3:7.3f} ms/guess  {full_bank:6.1f} s full bank  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
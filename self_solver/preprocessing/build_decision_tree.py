@@ -0,0 +1,84 @@
+"""
+Offline build of the solving decision tree over the Wordle solution bank.
+Plays the chosen strategy against every possible feedback path from the
+opening guess, records the guess it makes at each point, and writes the
+compact tree file the solver walks at runtime. Run this from the
+self_solver directory after changing a word bank CSV or the strategy:
+
+    python -m preprocessing.build_decision_tree [strategy_mode]
+
+The solver ignores a tree built from other word lists or for another
+STRATEGY_MODE and scores guesses live instead.
+"""
+
+import sys
+import time
+from collections import Counter
+
+from strategy import build_strategy
+from strategy.candidate_set import CandidateSet
+from strategy.decision_tree import DECISION_TREE_PATH, write_decision_tree
+from strategy.pattern_matrix import PREPROCESSING_DIR, SOLUTION_BANK_PATH, load_word_bank
+from strategy.pattern_utils import SOLVED_PATTERN
+from word_bank_store import WordBankStore
+
+SORTED_WORD_BANK_PATH = PREPROCESSING_DIR / "wordle-word-bank-sorted.csv"
+
+
+def build_tree(strategy, solutions):
+    """
+    Return (nodes, depths): the tree as (guess, {pattern: child}) per node,
+    root first, and the number of guesses each solution takes.
+    """
+    candidates = CandidateSet(solutions)
+    nodes = []
+    depths = {}
+
+    def visit(used, depth):
+        guess = strategy.choose_guess(candidates, used)
+        node = len(nodes)
+        children = {}
+        nodes.append((guess, children))
+
+        patterns = candidates.patterns(guess)
+        for word, pattern in zip(candidates.words, patterns):
+            if pattern == SOLVED_PATTERN:
+                depths[word] = depth
+        for pattern in sorted(set(patterns) - {SOLVED_PATTERN}):
+            candidates.narrow(guess, pattern)
+            children[pattern] = visit(used | {guess}, depth + 1)
+            candidates.rollback()
+        return node
+
+    visit(frozenset(), 1)
+    return nodes, depths
+
+
+def main():
+    strategy_mode = sys.argv[1] if len(sys.argv) > 1 else "entropy"
+    strategy = build_strategy(strategy_mode)
+
+    # Solutions in the solver's frequency order, so ties break the same way as live scoring
+    sorted_words = WordBankStore(SORTED_WORD_BANK_PATH).words
+    solution_set = set(load_word_bank(SOLUTION_BANK_PATH))
+    solutions = [word for word in sorted_words if word in solution_set]
+
+    print(f"Building {strategy.name} decision tree over {len(solutions)} solutions...")
+    started = time.perf_counter()
+    nodes, depths = build_tree(strategy, solutions)
+    elapsed = time.perf_counter() - started
+    size = write_decision_tree(nodes, strategy.name, sorted_words, DECISION_TREE_PATH)
+    print(f"✅ Saved {len(nodes)} nodes ({size / 1e3:.1f} kB) to {DECISION_TREE_PATH} in {elapsed:.1f}s")
+
+    histogram = Counter(depths.values())
+    print(f"\nOpening guess: {nodes[0][0].upper()}")
+    print(f"Mean guesses: {sum(depths.values()) / len(depths):.3f}")
+    for guesses in sorted(histogram):
+        print(f"{guesses:2d} guesses: {histogram[guesses]}")
+    over = sorted(word for word, guesses in depths.items() if guesses > 6)
+    if over:
+        print(f"⚠️  {len(over)} solutions need more than 6 guesses: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Offline build of the guess x answer feedback matrix used by the solver.
+Run this from the self_solver directory whenever a word bank CSV changes:
+
+    python -m preprocessing.build_pattern_matrix
+
+The solver also rebuilds the matrix on first use when the word bank
+checksum stored in it no longer matches, but that is slow on the Pi.
+"""
+
+import time
+
+from strategy.pattern_matrix import PATTERN_MATRIX_PATH, build_pattern_matrix
+
+
+def main():
+    print(f"Building pattern matrix at {PATTERN_MATRIX_PATH}...")
+    started = time.perf_counter()
+    size = build_pattern_matrix(PATTERN_MATRIX_PATH)
+    print(f"✅ Saved pattern matrix ({size / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
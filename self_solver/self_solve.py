@@ -7,16 +7,23 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from discord.discord_logger import MessageType, send_discord_message
+from discord.discord_logger import MessageType, flush_discord_messages, send_discord_message
 from sources import build_source
-from strategy.filter_strategy import first_matching_guess
+from strategy import build_strategy
+from strategy.candidate_set import CandidateSet
+from strategy.decision_tree import load_decision_tree
+from strategy.pattern_utils import base3_to_pattern
+from word_bank_store import WordBankStore
 
 # ============= CONFIGURATION =============
-SOURCE_MODE = "nyt"  # Options: nyt, mock
+SOURCE_MODE = "nyt"  # Options: nyt, nyt_async, mock
+STRATEGY_MODE = "first_match"  # Options: first_match, entropy
+USE_DECISION_TREE = True  # Walk preprocessing/wordle-decision-tree.bin when it matches STRATEGY_MODE
 SCRAPER_NAME = "scrape_nyt"
 MAX_ATTEMPTS = 6
 HEADLESS = True
-DELAY_AFTER_GUESS = 3.0
+DELAY_AFTER_GUESS = 0.0  # Minimum seconds per guess; feedback is awaited on the board itself
+KEY_DELAY = 0.0  # Minimum seconds between keypresses
 DEBUG_LOGS = True
 LOG_DIR = Path(__file__).resolve().parent / "logs"
 LOG_FILE = LOG_DIR / "self_solver.log"
@@ -24,6 +31,8 @@ LOG_FILE = LOG_DIR / "self_solver.log"
 # NYT browser settings
 BROWSER_MODE = "persistent"  # Options: persistent, incognito
 CHROMIUM_USER_DATA_DIR = "~/.config/chromium"
+BROWSER_CDP_ENDPOINT = "http://127.0.0.1:9222"  # Warm browser from browser_daemon.py (nyt_async only)
+ANSWER_PROVIDERS = ["lifehacker"]  # Raced while the browser starts, first valid answer wins. Options: lifehacker, nyt_api
 
 # Mock-only settings
 MOCK_SEED = None
@@ -62,28 +71,23 @@ def debug_log(message: str) -> None:
         logging.getLogger("self_solver").debug(message)
 
 
-def load_sorted_word_list(path: Path) -> List[str]:
+def load_word_bank_store(path: Path) -> WordBankStore:
     debug_log(f"Loading sorted word list from: {path}")
-    if not path.exists():
-        raise FileNotFoundError(f"Word list not found: {path}")
+    store = WordBankStore(path)
+    debug_log(f"Loaded {len(store)} candidate words ({store.journal_count} from the journal)")
+    return store
+
 
-    words: List[str] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        word = line.strip().lower()
-        if len(word) == 5 and word.isalpha():
-            words.append(word)
-    debug_log(f"Loaded {len(words)} candidate words")
-    return words
+def load_sorted_word_list(path: Path) -> List[str]:
+    return load_word_bank_store(path).words
 
 
-def ensure_answer_in_sorted_word_list(path: Path, words: List[str], answer: str) -> bool:
-    if answer in words:
+def ensure_answer_in_sorted_word_list(store: WordBankStore, answer: str) -> bool:
+    if answer in store:
         debug_log(f"Answer {answer.upper()} already present in sorted list")
         return False
     debug_log(f"Answer {answer.upper()} missing from sorted list, appending now")
-    words.append(answer)
-    path.write_text("\n".join(words) + "\n", encoding="utf-8")
-    return True
+    return store.add(answer)
 
 
 def feedback_to_base3(feedback: Feedback) -> str:
@@ -111,6 +115,7 @@ def build_summary_message(stats: Dict) -> str:
 
     lines = [f"**{title}**", status]
     lines.append(f"Source: {stats['source_name']} ({stats['source_mode']})")
+    lines.append(f"Strategy: {stats['strategy_name']}")
     lines.append(f"Attempts: {stats['attempts']}/6")
     lines.append(f"Answer: `{stats['answer'].upper() if stats['answer'] else 'UNKNOWN'}`")
     lines.append("")
@@ -130,18 +135,24 @@ def solve_game() -> int:
     debug_log(f"Writing logs to: {LOG_FILE}")
     debug_log(
         f"Configuration: source_mode={SOURCE_MODE}, max_attempts={MAX_ATTEMPTS}, "
-        f"headless={HEADLESS}, delay_after_guess={DELAY_AFTER_GUESS}, browser_mode={BROWSER_MODE}"
+        f"headless={HEADLESS}, delay_after_guess={DELAY_AFTER_GUESS}, key_delay={KEY_DELAY}, browser_mode={BROWSER_MODE}, "
+        f"strategy_mode={STRATEGY_MODE}, answer_providers={ANSWER_PROVIDERS}"
     )
-    words = load_sorted_word_list(WORD_BANK_PATH)
+    store = load_word_bank_store(WORD_BANK_PATH)
+    words = store.words
+    strategy = build_strategy(STRATEGY_MODE)
     source = build_source(
         source_mode=SOURCE_MODE,
         word_list=words,
         headless=HEADLESS,
         delay_after_guess=DELAY_AFTER_GUESS,
+        key_delay=KEY_DELAY,
         browser_mode=BROWSER_MODE,
         chromium_user_data_dir=CHROMIUM_USER_DATA_DIR,
         mock_seed=MOCK_SEED,
         mock_answer=MOCK_FORCED_ANSWER,
+        answer_providers=ANSWER_PROVIDERS,
+        cdp_endpoint=BROWSER_CDP_ENDPOINT,
     )
 
     stats = {
@@ -151,17 +162,15 @@ def solve_game() -> int:
         "guesses": [],
         "source_mode": SOURCE_MODE,
         "source_name": source.name if SOURCE_MODE == "mock" else SCRAPER_NAME,
+        "strategy_name": strategy.name,
     }
 
-    history: List[Dict[str, str]] = []
     used_words = set()
 
     debug_log(f"Built source implementation: {source.name}")
-    debug_log("Setting up source")
-    source.setup()
     try:
-        debug_log("Scraping answer")
-        answer = source.scrape_answer()
+        debug_log("Setting up source while scraping answer")
+        answer = source.start()
         if not answer:
             debug_log("Answer scraping failed, sending Discord error and exiting")
             send_discord_message(
@@ -178,7 +187,7 @@ def solve_game() -> int:
         stats["answer"] = answer
         debug_log(f"Scraped answer: {answer.upper()}")
 
-        added = ensure_answer_in_sorted_word_list(WORD_BANK_PATH, words, answer)
+        added = ensure_answer_in_sorted_word_list(store, answer)
         if added:
             debug_log("Answer added to sorted list, sending Discord warning")
             send_discord_message(
@@ -189,14 +198,22 @@ def solve_game() -> int:
                 MessageType.WARNING,
             )
 
+        candidates = CandidateSet(words)
+        tree = load_decision_tree(words, strategy.name) if USE_DECISION_TREE else None
+        tree_node = tree.root if tree else None
+        if tree:
+            debug_log(f"Loaded decision tree with {len(tree)} nodes")
         for attempt in range(1, MAX_ATTEMPTS + 1):
             force_answer_guess = attempt == MAX_ATTEMPTS and not stats["solved"]
             debug_log(f"Attempt {attempt} started")
             if force_answer_guess:
                 guess = answer
                 debug_log(f"Attempt {attempt}: forcing answer guess {guess.upper()}")
+            elif tree_node is not None:
+                guess = tree.guess(tree_node)
+                debug_log(f"Attempt {attempt}: decision tree guess {guess.upper()}")
             else:
-                guess = first_matching_guess(words, history, used_words)
+                guess = strategy.choose_guess(candidates, used_words)
                 if not guess:
                     debug_log("No matching candidate found, sending Discord error")
                     send_discord_message(
@@ -244,8 +261,12 @@ def solve_game() -> int:
                 debug_log(f"Puzzle solved on attempt {attempt} with guess {guess.upper()}")
                 break
 
-            history.append({"guess": guess, "pattern_base3": pattern_base3})
-            debug_log(f"Attempt {attempt} complete; history size now {len(history)}")
+            candidates.narrow(guess, pattern_base3)
+            if tree_node is not None:
+                tree_node = tree.child(tree_node, base3_to_pattern(pattern_base3))
+                if tree_node is None:
+                    debug_log("Feedback path is not in the decision tree, falling back to live scoring")
+            debug_log(f"Attempt {attempt} complete; {candidates.count} candidates remain")
 
         if stats["solved"] and stats["attempts"] <= 5:
             debug_log("Solved on or before attempt 5, sending success summary")
@@ -272,7 +293,10 @@ def solve_game() -> int:
 
 
 def main() -> None:
-    exit_code = solve_game()
+    try:
+        exit_code = solve_game()
+    finally:
+        flush_discord_messages()
     raise SystemExit(exit_code)
 
 
@@ -0,0 +1,119 @@
+"""Full solution bank simulator for the WordFinder self solver.
+
+Plays every solution through MockWordleSource with the configured strategy
+(and decision tree) across a process pool, without Discord messages, log
+files or word list updates, and reports how many guesses each game took.
+Use it as a regression benchmark before changing strategies or word lists:
+
+    python simulate.py [--strategy entropy] [--workers 4] [--no-tree] [--limit N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from self_solve import MAX_ATTEMPTS, STRATEGY_MODE, WORD_BANK_PATH, feedback_to_base3, load_sorted_word_list
+from sources.mock_source import MockWordleSource
+from strategy import build_strategy
+from strategy.candidate_set import CandidateSet
+from strategy.decision_tree import load_decision_tree
+from strategy.pattern_matrix import SOLUTION_BANK_PATH, get_pattern_matrix, load_word_bank
+from strategy.pattern_utils import EncodedWords, base3_to_pattern
+
+# Per-worker state, set up once by _init_worker
+_words: List[str] = []
+_encoded: Optional[EncodedWords] = None
+_strategy = None
+_tree = None
+
+
+def _init_worker(strategy_mode: str, use_tree: bool) -> None:
+    global _words, _encoded, _strategy, _tree
+    _words = load_sorted_word_list(WORD_BANK_PATH)
+    _encoded = EncodedWords(_words)
+    _strategy = build_strategy(strategy_mode)
+    _tree = load_decision_tree(_words, _strategy.name) if use_tree else None
+    get_pattern_matrix()
+
+
+def play_game(answer: str) -> Tuple[str, Optional[int]]:
+    """Return (answer, guesses needed), with None when it is not solved in MAX_ATTEMPTS."""
+    source = MockWordleSource(word_list=_words, forced_answer=answer, quiet=True)
+    source.setup()
+    candidates = CandidateSet(_encoded)
+    tree_node = _tree.root if _tree else None
+    used_words = set()
+    # Feedback rows not applied to the candidates yet (only needed once the tree runs out)
+    pending: List[Tuple[str, str]] = []
+    try:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            if tree_node is not None:
+                guess = _tree.guess(tree_node)
+            else:
+                for row in pending:
+                    candidates.narrow(*row)
+                pending.clear()
+                guess = _strategy.choose_guess(candidates, used_words)
+            if not guess:
+                return answer, None
+
+            pattern_base3 = feedback_to_base3(source.submit_guess(guess))
+            if pattern_base3 == "22222":
+                return answer, attempt
+            used_words.add(guess)
+            pending.append((guess, pattern_base3))
+            if tree_node is not None:
+                tree_node = _tree.child(tree_node, base3_to_pattern(pattern_base3))
+        return answer, None
+    finally:
+        source.close()
+
+
+def simulate(answers: List[str], strategy_mode: str, workers: int, use_tree: bool) -> None:
+    print(
+        f"Simulating {len(answers)} games with strategy={strategy_mode}, "
+        f"decision_tree={'on' if use_tree else 'off'}, workers={workers}..."
+    )
+    started = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(strategy_mode, use_tree)) as pool:
+        results = list(pool.imap_unordered(play_game, answers, chunksize=max(len(answers) // (workers * 8), 1)))
+    elapsed = time.perf_counter() - started
+
+    solved = [guesses for _, guesses in results if guesses is not None]
+    failures = sorted(answer for answer, guesses in results if guesses is None)
+    histogram = Counter(solved)
+
+    print("\nGuesses  Games")
+    for guesses in range(1, MAX_ATTEMPTS + 1):
+        count = histogram.get(guesses, 0)
+        bar = "#" * round(60 * count / max(len(results), 1))
+        print(f"{guesses:7d}  {count:5d}  {bar}")
+    print(f"{'failed':>7s}  {len(failures):5d}")
+
+    mean = sum(solved) / len(solved) if solved else float("nan")
+    print(f"\nMean guesses (solved games): {mean:.3f}")
+    print(f"Solved: {len(solved)}/{len(results)}")
+    print(f"Throughput: {len(results) / elapsed:.1f} games/sec ({elapsed:.1f}s)")
+    if failures:
+        print(f"Failures: {', '.join(word.upper() for word in failures)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play every solution bank word with the solver.")
+    parser.add_argument("--strategy", default=STRATEGY_MODE, help="strategy mode (entropy, first_match)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--no-tree", action="store_true", help="score every guess live instead of walking the decision tree")
+    parser.add_argument("--limit", type=int, default=None, help="only play the first N solutions")
+    args = parser.parse_args()
+
+    answers = load_word_bank(SOLUTION_BANK_PATH)[: args.limit]
+    simulate(answers, args.strategy, max(args.workers, 1), not args.no_tree)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from .base import WordleSource
+from .answer_providers import AnswerProvider, build_answer_providers, race_answer_providers
+from .base import SetupAborted, WordleSource
 from .mock_source import MockWordleSource
+from .nyt_async_source import AsyncNytWordleSource
 from .nyt_source import NytWordleSource
 
 
@@ -16,14 +18,29 @@ def build_source(
     chromium_user_data_dir: str = "~/.config/chromium",
     mock_seed: Optional[int] = None,
     mock_answer: Optional[str] = None,
+    key_delay: float = 0.0,
+    answer_providers: Sequence[str] = ("lifehacker",),
+    cdp_endpoint: Optional[str] = "http://127.0.0.1:9222",
 ) -> WordleSource:
     mode = source_mode.strip().lower()
     if mode == "nyt":
         return NytWordleSource(
             headless=headless,
             delay_after_guess=delay_after_guess,
+            key_delay=key_delay,
             browser_mode=browser_mode,
             chromium_user_data_dir=chromium_user_data_dir,
+            answer_providers=build_answer_providers(answer_providers),
+        )
+    if mode == "nyt_async":
+        return AsyncNytWordleSource(
+            headless=headless,
+            delay_after_guess=delay_after_guess,
+            key_delay=key_delay,
+            browser_mode=browser_mode,
+            chromium_user_data_dir=chromium_user_data_dir,
+            answer_providers=build_answer_providers(answer_providers),
+            cdp_endpoint=cdp_endpoint,
         )
     if mode == "mock":
         return MockWordleSource(word_list=word_list, random_seed=mock_seed, forced_answer=mock_answer)
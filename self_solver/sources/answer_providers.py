@@ -0,0 +1,175 @@
+"""Pluggable providers for today's Wordle answer.
+
+Each provider fetches the answer from one place and returns None when it
+cannot. race_answer_providers runs several of them on worker threads and
+returns the first valid answer, so one slow or broken site does not hold
+up the run. URLs are format templates with {month}, {day}, {year} and
+{date} fields, so a provider can be pointed at a local HTTP stand-in.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from datetime import date
+from typing import List, Optional, Sequence
+
+import requests
+
+LIFEHACKER_URL = "https://lifehacker.com/entertainment/wordle-nyt-hint-today-{month}-{day}-{year}"
+NYT_API_URL = "https://www.nytimes.com/svc/wordle/v2/{date}.json"
+
+
+def _log(message: str) -> None:
+    logging.getLogger("self_solver").debug(f"[answer_providers] {message}")
+
+
+def is_valid_answer(answer: Optional[str]) -> bool:
+    return bool(answer) and len(answer) == 5 and answer.isalpha()
+
+
+def format_answer_url(template: str, day: Optional[date] = None) -> str:
+    day = day or date.today()
+    return template.format(
+        month=day.strftime("%B").lower(),
+        day=day.day,
+        year=day.year,
+        date=day.isoformat(),
+    )
+
+
+class AnswerProvider(ABC):
+    """Interface for one way of looking up today's answer."""
+
+    name: str
+
+    @abstractmethod
+    def fetch(self) -> Optional[str]:
+        """Return today's answer, or None if this provider cannot find it."""
+
+
+class LifehackerAnswerProvider(AnswerProvider):
+    """Answer from Lifehacker's daily Wordle hint article."""
+
+    name = "lifehacker"
+
+    def __init__(self, url_template: str = LIFEHACKER_URL, timeout: float = 15.0):
+        self.url_template = url_template
+        self.timeout = timeout
+
+    def fetch(self) -> Optional[str]:
+        url = format_answer_url(self.url_template)
+        _log(f"Fetching answer from Lifehacker: {url}")
+
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                _log(f"Lifehacker request failed with status {response.status_code}")
+                return None
+            html = response.text
+        except Exception:
+            _log("Lifehacker request raised an exception")
+            return None
+
+        # Typical phrase on the page is along the lines of: "Today's word is XXXXX"
+        phrase_patterns = [
+            r"today(?:'s)?\s+word\s+is\s+([a-z]{5})\b",
+            r"word\s+is\s+([a-z]{5})\b",
+        ]
+        for pattern in phrase_patterns:
+            match = re.search(pattern, html, flags=re.IGNORECASE)
+            if match:
+                _log("Extracted answer using primary regex pattern")
+                return match.group(1).lower()
+
+        # Fallback: parse paragraph text and look for the answer sentence.
+        paragraphs = re.findall(r"<p[^>]*>(.*?)</p>", html, flags=re.IGNORECASE | re.DOTALL)
+        for paragraph in paragraphs:
+            text = re.sub(r"<[^>]+>", " ", paragraph)
+            text = re.sub(r"\s+", " ", text).strip().lower()
+            if "word is" not in text:
+                continue
+            match = re.search(r"word\s+is\s+([a-z]{5})\b", text)
+            if match:
+                _log("Extracted answer using paragraph fallback parser")
+                return match.group(1)
+
+        _log("Unable to extract answer from Lifehacker content")
+        return None
+
+
+class NytApiAnswerProvider(AnswerProvider):
+    """Answer from the JSON puzzle document the NYT game itself loads."""
+
+    name = "nyt_api"
+
+    def __init__(self, url_template: str = NYT_API_URL, timeout: float = 15.0):
+        self.url_template = url_template
+        self.timeout = timeout
+
+    def fetch(self) -> Optional[str]:
+        url = format_answer_url(self.url_template)
+        _log(f"Fetching answer from NYT puzzle API: {url}")
+
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                _log(f"NYT puzzle API request failed with status {response.status_code}")
+                return None
+            solution = response.json().get("solution")
+        except Exception:
+            _log("NYT puzzle API request raised an exception")
+            return None
+
+        if not isinstance(solution, str):
+            _log("NYT puzzle API response has no solution field")
+            return None
+        return solution.strip().lower()
+
+
+def build_answer_providers(provider_names: Sequence[str]) -> List[AnswerProvider]:
+    providers: List[AnswerProvider] = []
+    for provider_name in provider_names:
+        name = provider_name.strip().lower()
+        if name == "lifehacker":
+            providers.append(LifehackerAnswerProvider())
+        elif name == "nyt_api":
+            providers.append(NytApiAnswerProvider())
+        else:
+            raise ValueError(f"Unsupported answer provider: {provider_name}")
+    return providers
+
+
+def race_answer_providers(providers: Sequence[AnswerProvider], timeout: float = 20.0) -> Optional[str]:
+    """
+    Run every provider on its own thread and return the first valid answer.
+    Returns None once all providers have failed or `timeout` seconds have passed;
+    providers still running at that point are left to finish in the background.
+    """
+    if not providers:
+        _log("No answer providers configured")
+        return None
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="answer")
+    futures = {executor.submit(provider.fetch): provider for provider in providers}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            provider = futures[future]
+            try:
+                answer = future.result()
+            except Exception as exc:
+                _log(f"Provider {provider.name} raised {exc!r}")
+                continue
+            if is_valid_answer(answer):
+                _log(f"Provider {provider.name} answered first after {time.monotonic() - started:.2f}s")
+                return answer.lower()
+            _log(f"Provider {provider.name} returned no valid answer ({answer!r})")
+    except TimeoutError:
+        _log(f"No provider answered within {timeout:g}s")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import logging
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 Feedback = List[Tuple[str, str]]
 
 
+class SetupAborted(Exception):
+    """Raised from setup() checkpoints once the answer fetch has failed."""
+
+
 class WordleSource(ABC):
     """Interface for a playable Wordle source."""
 
     name: str
+    _answer_future: Optional[Future] = None
 
     @abstractmethod
     def setup(self) -> None:
@@ -26,3 +34,34 @@ class WordleSource(ABC):
     @abstractmethod
     def close(self) -> None:
         """Clean up resources for this source."""
+
+    def start(self) -> Optional[str]:
+        """
+        Run setup() while scrape_answer() runs on a worker thread and return the answer.
+        If the answer fetch fails first, setup stops at its next check_abort() and None
+        is returned; close() still has to be called either way.
+        """
+        logger = logging.getLogger("self_solver")
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-answer") as executor:
+            self._answer_future = executor.submit(self.scrape_answer)
+            try:
+                self.setup()
+                logger.debug(f"[source] Setup finished after {time.monotonic() - started:.2f}s")
+            except SetupAborted as exc:
+                logger.debug(f"[source] Setup aborted after {time.monotonic() - started:.2f}s: {exc}")
+                return None
+            finally:
+                future, self._answer_future = self._answer_future, None
+
+            answer = future.result() if future.exception() is None else None
+            logger.debug(f"[source] Answer ready after {time.monotonic() - started:.2f}s")
+            return answer
+
+    def check_abort(self) -> None:
+        """Raise SetupAborted if start() is running and the answer fetch has already failed."""
+        future = self._answer_future
+        if future is None or not future.done():
+            return
+        if future.exception() is not None or not future.result():
+            raise SetupAborted("answer fetch failed")
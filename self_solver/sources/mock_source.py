@@ -3,7 +3,8 @@ from __future__ import annotations
 import random
 from typing import List, Optional
 
-from strategy.pattern_utils import calculate_pattern_base3
+from strategy.pattern_matrix import get_pattern_matrix
+from strategy.pattern_utils import pattern_to_base3
 
 from .base import Feedback, WordleSource
 
@@ -13,15 +14,16 @@ class MockWordleSource(WordleSource):
 
     name = "mock_wordle"
 
-    @staticmethod
-    def _log(message: str) -> None:
-        print(f"[DEBUG][mock_source] {message}")
+    def _log(self, message: str) -> None:
+        if not self.quiet:
+            print(f"[DEBUG][mock_source] {message}")
 
     def __init__(
         self,
         word_list: List[str],
         random_seed: Optional[int] = None,
         forced_answer: Optional[str] = None,
+        quiet: bool = False,
     ):
         if not word_list:
             raise ValueError("Mock source requires a non-empty word list")
@@ -29,6 +31,7 @@ class MockWordleSource(WordleSource):
         self.random_seed = random_seed
         self.forced_answer = forced_answer.lower() if forced_answer else None
         self.answer: Optional[str] = None
+        self.quiet = quiet
 
     def setup(self) -> None:
         if self.forced_answer:
@@ -42,11 +45,16 @@ class MockWordleSource(WordleSource):
     def scrape_answer(self) -> Optional[str]:
         return self.answer
 
+    def start(self) -> Optional[str]:
+        # The answer is picked by setup() and there is no I/O to overlap
+        self.setup()
+        return self.scrape_answer()
+
     def submit_guess(self, guess: str) -> Feedback:
         if not self.answer:
             raise RuntimeError("Mock source has no active answer")
 
-        pattern = calculate_pattern_base3(guess, self.answer)
+        pattern = pattern_to_base3(get_pattern_matrix().pattern(guess, self.answer))
         self._log(f"Guess {guess.upper()} produced pattern {pattern}")
         states = {
             "0": "absent",
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional, Sequence
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright  # type: ignore
+
+from .answer_providers import AnswerProvider, LifehackerAnswerProvider, race_answer_providers
+from .base import Feedback, WordleSource
+from .nyt_source import LAUNCH_ARGS, MODAL_CLOSE_SELECTORS, READ_ROW_JS, ROW_SETTLED_JS, chromium_executable_path
+
+
+class AsyncNytWordleSource(WordleSource):
+    """NYT Wordle source on playwright.async_api that reuses a warm browser.
+
+    With cdp_endpoint set (see browser_daemon.py), setup connects to the
+    running browser over CDP and only opens a page in its default context
+    (or a fresh incognito context); close() closes that page and
+    disconnects, leaving the browser up for the next run. If nothing is
+    listening there, it launches its own Chromium like NytWordleSource.
+
+    The async_* coroutines do the work and can be awaited directly from
+    asyncio code (async_setup, async_submit_guess, async_close); the
+    WordleSource methods run them on a private event loop so solve_game can
+    use this source unchanged. Setup, guess and close timings are logged.
+    """
+
+    name = "scrape_nyt_async"
+
+    @staticmethod
+    def _log(message: str) -> None:
+        logging.getLogger("self_solver").debug(f"[nyt_async_source] {message}")
+
+    def __init__(
+        self,
+        headless: bool = True,
+        delay_after_guess: float = 0.0,
+        feedback_timeout: float = 8.0,
+        key_delay: float = 0.0,
+        browser_mode: str = "persistent",
+        chromium_user_data_dir: str = "~/.config/chromium",
+        wordle_url: str = "https://www.nytimes.com/games/wordle/index.html",
+        answer_providers: Optional[Sequence[AnswerProvider]] = None,
+        cdp_endpoint: Optional[str] = "http://127.0.0.1:9222",
+        connect_timeout: float = 5.0,
+    ):
+        self.headless = headless
+        self.delay_after_guess = delay_after_guess
+        self.feedback_timeout = feedback_timeout
+        self.key_delay = key_delay
+        self.browser_mode = browser_mode.strip().lower()
+        self.chromium_user_data_dir = chromium_user_data_dir
+        self.wordle_url = wordle_url
+        self.answer_providers = list(answer_providers) if answer_providers else [LifehackerAnswerProvider()]
+        self.cdp_endpoint = cdp_endpoint
+        self.connect_timeout = connect_timeout
+        self.loop = asyncio.new_event_loop()
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.attached = False
+        self.owns_context = False
+        self.attempt = 0
+
+    def setup(self) -> None:
+        started = time.monotonic()
+        self.loop.run_until_complete(self.async_setup())
+        how = f"attached to {self.cdp_endpoint}" if self.attached else "cold browser launch"
+        self._log(f"Setup took {time.monotonic() - started:.2f}s ({how})")
+
+    def scrape_answer(self) -> Optional[str]:
+        self._log(f"Racing answer providers: {', '.join(provider.name for provider in self.answer_providers)}")
+        return race_answer_providers(self.answer_providers)
+
+    def submit_guess(self, guess: str) -> Feedback:
+        started = time.monotonic()
+        feedback = self.loop.run_until_complete(self.async_submit_guess(guess))
+        self._log(f"Guess {self.attempt} took {time.monotonic() - started:.2f}s")
+        return feedback
+
+    def close(self) -> None:
+        started = time.monotonic()
+        try:
+            self.loop.run_until_complete(self.async_close())
+        finally:
+            self.loop.close()
+        self._log(f"Close took {time.monotonic() - started:.2f}s")
+
+    async def async_setup(self) -> None:
+        self._log("Starting async Playwright setup")
+        self.check_abort()
+        self.playwright = await async_playwright().start()
+
+        if self.cdp_endpoint:
+            await self._attach()
+        if not self.attached:
+            self.check_abort()
+            await self._launch()
+
+        self.check_abort()
+        self._log(f"Navigating to NYT Wordle page: {self.wordle_url}")
+        await self.page.goto(self.wordle_url)
+        await asyncio.sleep(1)
+        self.check_abort()
+        await self._click_play_button()
+        self.check_abort()
+        await self._close_modals()
+        self._log("NYT page setup complete")
+
+    async def async_submit_guess(self, guess: str) -> Feedback:
+        if not self.page:
+            raise RuntimeError("NYT source is not initialized")
+
+        self.attempt += 1
+        self._log(f"Submitting guess {self.attempt}: {guess.upper()}")
+
+        await self.page.keyboard.type(guess.upper(), delay=self.key_delay * 1000)
+        await self.page.keyboard.press("Enter")
+        submitted = time.monotonic()
+
+        feedback = await self._wait_for_feedback(self.attempt)
+        elapsed = time.monotonic() - submitted
+        self._log(f"Row {self.attempt} settled {elapsed:.2f}s after Enter")
+        if elapsed < self.delay_after_guess:
+            await asyncio.sleep(self.delay_after_guess - elapsed)
+        return feedback
+
+    async def async_close(self) -> None:
+        self._log("Closing NYT source resources")
+        if self.attached:
+            # Only what this run opened; the warm browser and its profile stay up
+            if self.owns_context and self.context:
+                await self.context.close()
+            elif self.page:
+                await self.page.close()
+        else:
+            if self.context:
+                await self.context.close()
+            if self.browser:
+                await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def _attach(self) -> None:
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(
+                self.cdp_endpoint, timeout=self.connect_timeout * 1000
+            )
+        except Exception:
+            self._log(f"No warm browser at {self.cdp_endpoint}, launching Chromium instead")
+            return
+
+        self.attached = True
+        if self.browser_mode == "incognito" or not self.browser.contexts:
+            self._log("Attached to warm browser, opening a fresh context")
+            self.context = await self.browser.new_context(no_viewport=True)
+            self.owns_context = True
+        else:
+            self._log("Attached to warm browser, reusing its profile context")
+            self.context = self.browser.contexts[0]
+        self.page = await self.context.new_page()
+
+    async def _launch(self) -> None:
+        chromium_path = chromium_executable_path()
+        if self.browser_mode == "incognito":
+            self._log("Launching NYT in incognito mode")
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                executable_path=chromium_path,
+                args=LAUNCH_ARGS,
+            )
+            self.context = await self.browser.new_context(no_viewport=True)
+            self.page = await self.context.new_page()
+        else:
+            if self.browser_mode != "persistent":
+                self._log(
+                    f"Unknown browser_mode '{self.browser_mode}', falling back to persistent mode"
+                )
+            self._log("Launching NYT with persistent profile mode")
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                user_data_dir=os.path.expanduser(self.chromium_user_data_dir),
+                headless=self.headless,
+                executable_path=chromium_path,
+                args=LAUNCH_ARGS,
+                no_viewport=True,
+            )
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+
+    async def _click_play_button(self) -> None:
+        if not self.page:
+            return
+        try:
+            play_button = self.page.locator("button[data-testid='Play']")
+            if await play_button.is_visible(timeout=5000):
+                await play_button.click(no_wait_after=False)
+                await self.page.wait_for_load_state("networkidle")
+                await asyncio.sleep(0.4)
+        except Exception:
+            return
+
+    async def _close_modals(self) -> None:
+        if not self.page:
+            return
+        for selector in MODAL_CLOSE_SELECTORS:
+            try:
+                close_buttons = await self.page.locator(selector).all()
+                for button in close_buttons:
+                    if await button.is_visible():
+                        await button.click()
+                        await asyncio.sleep(0.15)
+            except Exception:
+                continue
+        try:
+            await self.page.locator("body").click()
+        except Exception:
+            return
+
+    async def _get_feedback(self, row_number: int) -> Feedback:
+        if not self.page:
+            return []
+        try:
+            rows = await self.page.evaluate(READ_ROW_JS, row_number)
+        except Exception:
+            self._log(f"Failed to scrape feedback for row {row_number}")
+            return []
+        feedback: Feedback = [(letter, state) for letter, state in rows]
+        self._log(f"Row {row_number} feedback captured ({len(feedback)} tiles)")
+        return feedback
+
+    async def _wait_for_feedback(self, row_number: int) -> Feedback:
+        if not self.page:
+            return []
+        try:
+            await self.page.wait_for_function(ROW_SETTLED_JS, arg=row_number, timeout=self.feedback_timeout * 1000)
+        except Exception:
+            feedback = await self._get_feedback(row_number)
+            self._log(
+                f"Timed out waiting for full row feedback on row {row_number}; "
+                f"best length was {len(feedback)}"
+            )
+            return feedback
+        return await self._get_feedback(row_number)
@@ -1,19 +1,94 @@
 from __future__ import annotations
 
-import re
-import time
-from datetime import datetime
 import logging
-from typing import Optional
+import os
+import time
+from typing import Optional, Sequence
 
-import requests
 from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright  # type: ignore
 
+from .answer_providers import AnswerProvider, LifehackerAnswerProvider, race_answer_providers
 from .base import Feedback, WordleSource
 
 
+# Row lookup shared by the in-page scripts below: the row labelled "Row N",
+# or the N-th row group when the labels differ.
+_FIND_ROW_JS = """
+(rowNumber) => {
+    const labelled = document.querySelector(`div[role='group'][aria-label='Row ${rowNumber}']`);
+    if (labelled) return labelled;
+    const rows = document.querySelectorAll("div[role='group'][aria-label^='Row']");
+    return rows.length >= rowNumber ? rows[rowNumber - 1] : null;
+}
+"""
+
+# True once every tile of the row shows a final state and has stopped animating
+ROW_SETTLED_JS = f"""
+(rowNumber) => {{
+    const row = ({_FIND_ROW_JS})(rowNumber);
+    if (!row) return false;
+    const tiles = row.querySelectorAll("div[data-state]");
+    if (tiles.length !== 5) return false;
+    return Array.from(tiles).every((tile) => {{
+        const state = tile.getAttribute("data-state");
+        const animation = tile.getAttribute("data-animation");
+        const final = state === "correct" || state === "present" || state === "absent";
+        return final && (!animation || animation === "idle");
+    }});
+}}
+"""
+
+# [letter, state] for every tile of the row with a final state, in one round-trip
+READ_ROW_JS = f"""
+(rowNumber) => {{
+    const row = ({_FIND_ROW_JS})(rowNumber);
+    if (!row) return [];
+    const feedback = [];
+    for (const tile of row.querySelectorAll("div[data-state]")) {{
+        const state = tile.getAttribute("data-state");
+        if (state !== "correct" && state !== "present" && state !== "absent") continue;
+        let letter = (tile.textContent || "").trim().toLowerCase();
+        if (!letter) {{
+            const label = (tile.getAttribute("aria-label") || "").split(",")[0].trim().toLowerCase();
+            letter = label.slice(0, 1);
+        }}
+        if (letter) feedback.push([letter, state]);
+    }}
+    return feedback;
+}}
+"""
+
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+MODAL_CLOSE_SELECTORS = [
+    "button[aria-label='Close']",
+    "button.Modal-module_closeIcon__TcEKb",
+    "svg[data-testid='icon-close']",
+]
+
+
+def chromium_executable_path() -> Optional[str]:
+    """The system Chromium, or None to use the browser installed by `playwright install chromium`."""
+    for path in ("/usr/bin/chromium-browser", "/usr/bin/chromium"):
+        if os.path.exists(path):
+            return path
+    return None
+
+
 class NytWordleSource(WordleSource):
-    """Wordle source backed by the NYT website via Playwright."""
+    """Wordle source backed by the NYT website via Playwright.
+
+    After a guess is entered, one in-page wait (wait_for_function) resolves
+    as soon as the row's tiles have settled, and the row is read with a
+    single evaluate call. key_delay and delay_after_guess are minimums on
+    top of that, not fixed sleeps. wordle_url can point at a local page
+    such as sources/nyt_standin.html to try the source offline.
+
+    scrape_answer races answer_providers (Lifehacker by default). Under
+    start() it runs alongside setup, which checks between launch steps
+    whether the fetch has failed and gives up early if so.
+    """
 
     name = "scrape_nyt"
 
@@ -24,20 +99,22 @@ class NytWordleSource(WordleSource):
     def __init__(
         self,
         headless: bool = True,
-        delay_after_guess: float = 3.0,
+        delay_after_guess: float = 0.0,
         feedback_timeout: float = 8.0,
-        feedback_poll_interval: float = 0.2,
+        key_delay: float = 0.0,
         browser_mode: str = "persistent",
         chromium_user_data_dir: str = "~/.config/chromium",
         wordle_url: str = "https://www.nytimes.com/games/wordle/index.html",
+        answer_providers: Optional[Sequence[AnswerProvider]] = None,
     ):
         self.headless = headless
         self.delay_after_guess = delay_after_guess
         self.feedback_timeout = feedback_timeout
-        self.feedback_poll_interval = feedback_poll_interval
+        self.key_delay = key_delay
         self.browser_mode = browser_mode.strip().lower()
         self.chromium_user_data_dir = chromium_user_data_dir
         self.wordle_url = wordle_url
+        self.answer_providers = list(answer_providers) if answer_providers else [LifehackerAnswerProvider()]
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -46,17 +123,16 @@ class NytWordleSource(WordleSource):
 
     def setup(self) -> None:
         self._log("Starting Playwright setup")
+        self.check_abort()
         self.playwright = sync_playwright().start()
-        chromium_path = (
-            "/usr/bin/chromium-browser" if self._exists("/usr/bin/chromium-browser") else "/usr/bin/chromium"
-        )
+        chromium_path = chromium_executable_path()
 
         if self.browser_mode == "incognito":
             self._log("Launching NYT in incognito mode")
             self.browser = self.playwright.chromium.launch(
                 headless=self.headless,
                 executable_path=chromium_path,
-                args=["--disable-blink-features=AutomationControlled"],
+                args=LAUNCH_ARGS,
             )
             self.context = self.browser.new_context(no_viewport=True)
             self.page = self.context.new_page()
@@ -70,61 +146,24 @@ class NytWordleSource(WordleSource):
                 user_data_dir=self._expanduser(self.chromium_user_data_dir),
                 headless=self.headless,
                 executable_path=chromium_path,
-                args=["--disable-blink-features=AutomationControlled"],
+                args=LAUNCH_ARGS,
                 no_viewport=True,
             )
             self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
 
+        self.check_abort()
         self._log(f"Navigating to NYT Wordle page: {self.wordle_url}")
         self.page.goto(self.wordle_url)
         time.sleep(1)
+        self.check_abort()
         self._click_play_button()
+        self.check_abort()
         self._close_modals()
         self._log("NYT page setup complete")
 
     def scrape_answer(self) -> Optional[str]:
-        today = datetime.now()
-        month = today.strftime("%B").lower()
-        day = today.day
-        year = today.year
-        url = f"https://lifehacker.com/entertainment/wordle-nyt-hint-today-{month}-{day}-{year}"
-        self._log(f"Fetching answer from Lifehacker: {url}")
-
-        try:
-            response = requests.get(url, timeout=15)
-            if response.status_code != 200:
-                self._log(f"Lifehacker request failed with status {response.status_code}")
-                return None
-            html = response.text
-        except Exception:
-            self._log("Lifehacker request raised an exception")
-            return None
-
-        # Typical phrase on the page is along the lines of: "Today's word is XXXXX"
-        phrase_patterns = [
-            r"today(?:'s)?\s+word\s+is\s+([a-z]{5})\b",
-            r"word\s+is\s+([a-z]{5})\b",
-        ]
-        for pattern in phrase_patterns:
-            match = re.search(pattern, html, flags=re.IGNORECASE)
-            if match:
-                self._log("Extracted answer using primary regex pattern")
-                return match.group(1).lower()
-
-        # Fallback: parse paragraph text and look for the answer sentence.
-        paragraphs = re.findall(r"<p[^>]*>(.*?)</p>", html, flags=re.IGNORECASE | re.DOTALL)
-        for paragraph in paragraphs:
-            text = re.sub(r"<[^>]+>", " ", paragraph)
-            text = re.sub(r"\s+", " ", text).strip().lower()
-            if "word is" not in text:
-                continue
-            match = re.search(r"word\s+is\s+([a-z]{5})\b", text)
-            if match:
-                self._log("Extracted answer using paragraph fallback parser")
-                return match.group(1)
-
-        self._log("Unable to extract answer from Lifehacker content")
-        return None
+        self._log(f"Racing answer providers: {', '.join(provider.name for provider in self.answer_providers)}")
+        return race_answer_providers(self.answer_providers)
 
     def submit_guess(self, guess: str) -> Feedback:
         if not self.page:
@@ -133,13 +172,16 @@ class NytWordleSource(WordleSource):
         self.attempt += 1
         self._log(f"Submitting guess {self.attempt}: {guess.upper()}")
 
-        for letter in guess.upper():
-            self.page.keyboard.press(letter)
-            time.sleep(0.08)
+        self.page.keyboard.type(guess.upper(), delay=self.key_delay * 1000)
         self.page.keyboard.press("Enter")
-        time.sleep(self.delay_after_guess)
+        submitted = time.monotonic()
 
-        return self._wait_for_feedback(self.attempt)
+        feedback = self._wait_for_feedback(self.attempt)
+        elapsed = time.monotonic() - submitted
+        self._log(f"Row {self.attempt} settled {elapsed:.2f}s after Enter")
+        if elapsed < self.delay_after_guess:
+            time.sleep(self.delay_after_guess - elapsed)
+        return feedback
 
     def close(self) -> None:
         self._log("Closing NYT source resources")
@@ -165,12 +207,7 @@ class NytWordleSource(WordleSource):
     def _close_modals(self) -> None:
         if not self.page:
             return
-        selectors = [
-            "button[aria-label='Close']",
-            "button.Modal-module_closeIcon__TcEKb",
-            "svg[data-testid='icon-close']",
-        ]
-        for selector in selectors:
+        for selector in MODAL_CLOSE_SELECTORS:
             try:
                 close_buttons = self.page.locator(selector).all()
                 for button in close_buttons:
@@ -188,68 +225,28 @@ class NytWordleSource(WordleSource):
         if not self.page:
             return []
         try:
-            row_label = f"Row {row_number}"
-            current_row = self.page.locator(f"div[role='group'][aria-label='{row_label}']")
-            if current_row.count() == 0:
-                rows = self.page.locator("div[role='group'][aria-label^='Row']").all()
-                if row_number > len(rows):
-                    return []
-                row = rows[row_number - 1]
-            else:
-                row = current_row.first
-
-            tiles = row.locator("div[data-state]").all()
-
-            feedback: Feedback = []
-            for tile in tiles:
-                state = tile.get_attribute("data-state")
-                if state not in {"correct", "present", "absent"}:
-                    continue
-
-                letter = (tile.text_content() or "").strip().lower()
-                if not letter:
-                    aria_label = tile.get_attribute("aria-label") or ""
-                    parts = [part.strip().lower() for part in aria_label.split(",") if part.strip()]
-                    if parts:
-                        letter = parts[0][:1]
-
-                if not letter:
-                    continue
-
-                feedback.append((letter, state))
-
-            self._log(f"Row {row_number} feedback captured ({len(feedback)} tiles)")
-            return feedback
+            rows = self.page.evaluate(READ_ROW_JS, row_number)
         except Exception:
             self._log(f"Failed to scrape feedback for row {row_number}")
             return []
+        feedback: Feedback = [(letter, state) for letter, state in rows]
+        self._log(f"Row {row_number} feedback captured ({len(feedback)} tiles)")
+        return feedback
 
     def _wait_for_feedback(self, row_number: int) -> Feedback:
-        deadline = time.time() + self.feedback_timeout
-        best_feedback: Feedback = []
-
-        while time.time() < deadline:
+        if not self.page:
+            return []
+        try:
+            self.page.wait_for_function(ROW_SETTLED_JS, arg=row_number, timeout=self.feedback_timeout * 1000)
+        except Exception:
             feedback = self._get_feedback(row_number)
-            if len(feedback) == 5:
-                return feedback
-            if len(feedback) > len(best_feedback):
-                best_feedback = feedback
-            time.sleep(self.feedback_poll_interval)
-
-        self._log(
-            f"Timed out waiting for full row feedback on row {row_number}; "
-            f"best length was {len(best_feedback)}"
-        )
-        return best_feedback
-
-    @staticmethod
-    def _exists(path: str) -> bool:
-        import os
-
-        return os.path.exists(path)
+            self._log(
+                f"Timed out waiting for full row feedback on row {row_number}; "
+                f"best length was {len(feedback)}"
+            )
+            return feedback
+        return self._get_feedback(row_number)
 
     @staticmethod
     def _expanduser(path: str) -> str:
-        import os
-
         return os.path.expanduser(path)
@@ -1,3 +1,16 @@
 """
 Word filtering strategy modules for Wordle solving.
 """
+
+from .base import GuessStrategy
+from .entropy_strategy import EntropyStrategy
+from .filter_strategy import FirstMatchStrategy
+
+
+def build_strategy(strategy_mode: str) -> GuessStrategy:
+    mode = strategy_mode.strip().lower()
+    if mode == "first_match":
+        return FirstMatchStrategy()
+    if mode == "entropy":
+        return EntropyStrategy()
+    raise ValueError(f"Unsupported strategy mode: {strategy_mode}")
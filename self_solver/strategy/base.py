@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional, Set
+
+from .candidate_set import CandidateSet
+
+
+class GuessStrategy(ABC):
+    """Interface for choosing the next guess from the remaining candidates."""
+
+    name: str
+
+    @abstractmethod
+    def choose_guess(self, candidates: CandidateSet, used_words: Set[str]) -> Optional[str]:
+        """Return the next word to guess, or None when no candidate is left."""
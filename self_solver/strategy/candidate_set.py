@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set, Union
+
+from .pattern_utils import EncodedWords, base3_to_pattern, calculate_patterns
+
+
+class CandidateSet:
+    """Words still consistent with the feedback so far, in the original (frequency) order.
+
+    Each narrow() scores the new guess against the surviving words only, so
+    later attempts get cheaper instead of re-checking the whole history
+    against the whole word list. Narrowing steps are kept on a stack and can
+    be undone with rollback() for what-if analysis.
+    """
+
+    def __init__(self, sorted_word_list: Union[List[str], EncodedWords]):
+        # An EncodedWords can be shared by many sets (it is never modified)
+        if isinstance(sorted_word_list, EncodedWords):
+            self._current = sorted_word_list
+        else:
+            self._current = EncodedWords(sorted_word_list)
+        self._previous: List[EncodedWords] = []
+
+    @property
+    def words(self) -> List[str]:
+        return self._current.words
+
+    @property
+    def count(self) -> int:
+        return len(self._current)
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    @property
+    def depth(self) -> int:
+        """Number of narrowing steps that can be rolled back."""
+        return len(self._previous)
+
+    def narrow(self, guess: str, pattern: Union[int, str]) -> int:
+        """Keep the words that would give `pattern` (code or base-3 string) for `guess`. Returns the new count."""
+        if isinstance(pattern, str):
+            pattern = base3_to_pattern(pattern)
+        patterns = self.patterns(guess)
+        keep = [i for i, value in enumerate(patterns) if value == pattern]
+        self._previous.append(self._current)
+        self._current = self._current.select(keep)
+        return self.count
+
+    def patterns(self, guess: str) -> bytes:
+        """Pattern code `guess` would get against each surviving word, in order."""
+        return calculate_patterns(guess, self._current)
+
+    def rollback(self, steps: int = 1) -> int:
+        """Undo the last `steps` narrowing steps. Returns the restored count."""
+        if steps > len(self._previous):
+            raise ValueError(f"Cannot roll back {steps} steps, only {len(self._previous)} recorded")
+        for _ in range(steps):
+            self._current = self._previous.pop()
+        return self.count
+
+    def first(self, excluded_words: Optional[Set[str]] = None) -> Optional[str]:
+        """Most frequent surviving word not in `excluded_words`."""
+        used = excluded_words or set()
+        for word in self._current.words:
+            if word not in used:
+                return word
+        return None
@@ -0,0 +1,142 @@
+"""Precomputed solving decision tree, walked one feedback row at a time.
+
+The tree is built offline by preprocessing/build_decision_tree.py: every
+node holds the guess a strategy would play after the feedback path leading
+to it, and one child per feedback pattern that still leaves solution bank
+words. At runtime a move is one array read plus a bisect over the node's
+children.
+
+File layout (arrays in node / edge order, little-endian):
+    header         HEADER: magic, version, node count, strategy name, source checksum
+    guesses        uint16[node_count]      word bank index of each node's guess
+    edge_starts    uint32[node_count + 1]  first edge of each node
+    edge_children  uint32[edge_count]      child node of each edge
+    edge_patterns  uint8[edge_count]       feedback pattern of each edge, ascending per node
+Node 0 is the root (the opening guess).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .pattern_matrix import GUESS_BANK_PATH, PREPROCESSING_DIR, SOLUTION_BANK_PATH, load_word_bank
+
+DECISION_TREE_PATH = PREPROCESSING_DIR / "wordle-decision-tree.bin"
+DECISION_TREE_MAGIC = b"WSDT"
+DECISION_TREE_VERSION = 1
+HEADER = struct.Struct("<4sII16s32s")
+
+# (guess, {pattern: child node}) per node, root first
+TreeNodes = List[Tuple[str, Dict[int, int]]]
+
+
+def _log(message: str) -> None:
+    logging.getLogger("self_solver").debug(f"[decision_tree] {message}")
+
+
+def tree_checksum(sorted_words: List[str]) -> bytes:
+    """Checksum of the tree inputs: both word banks and the frequency order of the solutions."""
+    solutions = set(load_word_bank(SOLUTION_BANK_PATH))
+    digest = hashlib.sha256()
+    digest.update(GUESS_BANK_PATH.read_bytes())
+    digest.update(SOLUTION_BANK_PATH.read_bytes())
+    digest.update("\n".join(word for word in sorted_words if word in solutions).encode("utf-8"))
+    return digest.digest()
+
+
+class DecisionTree:
+    """Read-only decision tree over a packed tree buffer."""
+
+    root = 0
+
+    def __init__(self, buffer: bytes, guess_words: List[str]):
+        _, _, node_count, strategy_name, _ = HEADER.unpack_from(buffer)
+        self.strategy_name = strategy_name.rstrip(b"\0").decode("ascii")
+        self.guess_words = guess_words
+
+        offset = HEADER.size
+        self.guesses = array("H", buffer[offset:offset + 2 * node_count])
+        offset += 2 * node_count
+        self.edge_starts = array("I", buffer[offset:offset + 4 * (node_count + 1)])
+        offset += 4 * (node_count + 1)
+        edge_count = self.edge_starts[node_count]
+        self.edge_children = array("I", buffer[offset:offset + 4 * edge_count])
+        offset += 4 * edge_count
+        self.edge_patterns = bytes(buffer[offset:offset + edge_count])
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    def guess(self, node: int) -> str:
+        return self.guess_words[self.guesses[node]]
+
+    def child(self, node: int, pattern: int) -> Optional[int]:
+        """Node reached from `node` by feedback `pattern`, or None if the tree has no such path."""
+        start, end = self.edge_starts[node], self.edge_starts[node + 1]
+        i = bisect_left(self.edge_patterns, pattern, start, end)
+        if i < end and self.edge_patterns[i] == pattern:
+            return self.edge_children[i]
+        return None
+
+
+def pack_decision_tree(nodes: TreeNodes, strategy_name: str, checksum: bytes) -> bytes:
+    guess_ids = {word: i for i, word in enumerate(load_word_bank(GUESS_BANK_PATH))}
+    guesses = array("H")
+    edge_starts = array("I", [0])
+    edge_children = array("I")
+    edge_patterns = bytearray()
+    for guess, children in nodes:
+        guesses.append(guess_ids[guess])
+        for pattern in sorted(children):
+            edge_patterns.append(pattern)
+            edge_children.append(children[pattern])
+        edge_starts.append(len(edge_children))
+
+    header = HEADER.pack(
+        DECISION_TREE_MAGIC, DECISION_TREE_VERSION, len(nodes), strategy_name.encode("ascii"), checksum
+    )
+    return header + guesses.tobytes() + edge_starts.tobytes() + edge_children.tobytes() + bytes(edge_patterns)
+
+
+def write_decision_tree(
+    nodes: TreeNodes, strategy_name: str, sorted_words: List[str], path: Path = DECISION_TREE_PATH
+) -> int:
+    """Serialize `nodes` and atomically replace `path`. Returns the file size."""
+    data = pack_decision_tree(nodes, strategy_name, tree_checksum(sorted_words))
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def load_decision_tree(
+    sorted_words: List[str], strategy_name: str, path: Path = DECISION_TREE_PATH
+) -> Optional[DecisionTree]:
+    """Load the tree at `path`, or None when it is missing, stale or built for another strategy."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        _log(f"No decision tree at {path}, using live strategy scoring")
+        return None
+    if len(data) < HEADER.size:
+        _log(f"Decision tree {path} is truncated, ignoring it")
+        return None
+
+    magic, version, _, stored_strategy, checksum = HEADER.unpack_from(data)
+    if magic != DECISION_TREE_MAGIC or version != DECISION_TREE_VERSION:
+        _log(f"Decision tree {path} has an unknown format, ignoring it")
+        return None
+    if stored_strategy.rstrip(b"\0").decode("ascii") != strategy_name:
+        _log(f"Decision tree {path} was built for another strategy, ignoring it")
+        return None
+    if checksum != tree_checksum(sorted_words):
+        _log(f"Decision tree {path} is stale (word lists changed), ignoring it")
+        return None
+    return DecisionTree(data, load_word_bank(GUESS_BANK_PATH))
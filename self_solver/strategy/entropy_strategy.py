@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from operator import itemgetter
+from typing import List, Optional, Set
+
+from .base import GuessStrategy
+from .candidate_set import CandidateSet
+from .pattern_matrix import PatternMatrix, get_pattern_matrix
+from .pattern_utils import SOLVED_PATTERN, np
+
+PATTERN_COUNT = SOLVED_PATTERN + 1
+# Guess rows histogrammed per NumPy batch (bounds the temporary arrays to a few MB)
+SCORE_BATCH_ROWS = 256
+
+
+class EntropyStrategy(GuessStrategy):
+    """Guess the word whose feedback is expected to reveal the most information.
+
+    Every word bank guess is scored against the candidates that are also in
+    the solution bank, using the precomputed pattern matrix: the entropy of
+    the distribution of feedback patterns it would produce. Ties go to words
+    that could still be the answer, then to the more frequent word.
+    """
+
+    name = "entropy"
+
+    def __init__(self, matrix: Optional[PatternMatrix] = None):
+        self.matrix = matrix
+        # Scores against the whole solution bank (the opening move), reused across games
+        self._opening_scores: Optional[List[float]] = None
+
+    def choose_guess(self, candidates: CandidateSet, used_words: Set[str]) -> Optional[str]:
+        remaining = [word for word in candidates.words if word not in used_words]
+        if not remaining:
+            return None
+        matrix = self.matrix or get_pattern_matrix()
+        answer_ids = [matrix.answer_ids[word] for word in remaining if word in matrix.answer_ids]
+        if len(answer_ids) <= 2:
+            # Nothing left to split: guess the most likely word
+            return next((word for word in remaining if word in matrix.answer_ids), remaining[0])
+
+        if len(answer_ids) == len(matrix.answers):
+            if self._opening_scores is None:
+                self._opening_scores = self.score_guesses(matrix, answer_ids)
+            scores = self._opening_scores
+        else:
+            scores = self.score_guesses(matrix, answer_ids)
+        # Possible answers in frequency order; other guesses rank after them in word bank order
+        rank = {matrix.answers[j]: i for i, j in enumerate(answer_ids)}
+        best_id = max(
+            (i for i, word in enumerate(matrix.guesses) if word not in used_words),
+            key=lambda i: (
+                scores[i],
+                matrix.guesses[i] in rank,
+                -rank.get(matrix.guesses[i], len(rank) + i),
+            ),
+        )
+        return matrix.guesses[best_id]
+
+    @staticmethod
+    def score_guesses(matrix: PatternMatrix, answer_ids: List[int]) -> List[float]:
+        """Entropy in bits of the feedback of every guess over the given answer columns."""
+        table = matrix.as_array()
+        if table is None:
+            return _score_guesses_python(matrix, answer_ids)
+
+        if len(answer_ids) < len(matrix.answers):
+            table = table[:, answer_ids]
+        total = len(answer_ids)
+        # H = log2(n) - sum(c * log2(c)) / n over the pattern counts c, with c * log2(c) looked up
+        c_log_c = np.arange(total + 1, dtype=np.float64)
+        c_log_c[1:] *= np.log2(c_log_c[1:])
+        offsets = (np.arange(SCORE_BATCH_ROWS, dtype=np.int32) * PATTERN_COUNT)[:, None]
+        scores = np.empty(len(table))
+        for start in range(0, len(table), SCORE_BATCH_ROWS):
+            rows = table[start:start + SCORE_BATCH_ROWS]
+            # One bincount histograms every row: row r uses bins r*243 .. r*243+242
+            counts = np.bincount((rows + offsets[:len(rows)]).ravel(), minlength=len(rows) * PATTERN_COUNT)
+            scores[start:start + len(rows)] = c_log_c[counts].reshape(len(rows), PATTERN_COUNT).sum(axis=1)
+        return (math.log2(total) - scores / total).tolist()
+
+
+def _score_guesses_python(matrix: PatternMatrix, answer_ids: List[int]) -> List[float]:
+    pick = itemgetter(*answer_ids)
+    total = len(answer_ids)
+    scores = []
+    for guess in matrix.guesses:
+        counts = Counter(pick(matrix.row(guess))).values()
+        scores.append(-sum(n / total * math.log2(n / total) for n in counts))
+    return scores
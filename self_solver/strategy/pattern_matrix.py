@@ -0,0 +1,150 @@
+"""Precomputed guess x answer feedback patterns, memory-mapped from disk.
+
+Every word in the Wordle word bank is scored against every word in the
+solution bank once, offline, and stored as one uint8 pattern code per pair
+(see pattern_utils.calculate_pattern). At runtime the file is mapped
+read-only, so looking up feedback is two dict lookups and one byte read.
+
+File layout:
+    header   HEADER: magic, version, guess count, answer count, source checksum
+    rows     uint8[guess_count][answer_count] in word bank / solution bank order
+
+The source checksum covers both word bank files; a file built from other
+inputs is rebuilt on load.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .pattern_utils import EncodedWords, calculate_pattern, calculate_patterns, np
+
+PREPROCESSING_DIR = Path(__file__).resolve().parent.parent / "preprocessing"
+GUESS_BANK_PATH = PREPROCESSING_DIR / "wordle-word-bank.csv"
+SOLUTION_BANK_PATH = PREPROCESSING_DIR / "wordle-solution-bank.csv"
+PATTERN_MATRIX_PATH = PREPROCESSING_DIR / "wordle-pattern-matrix.bin"
+
+PATTERN_MATRIX_MAGIC = b"WSPM"
+PATTERN_MATRIX_VERSION = 1
+HEADER = struct.Struct("<4sIII32s")
+
+
+def _log(message: str) -> None:
+    logging.getLogger("self_solver").debug(f"[pattern_matrix] {message}")
+
+
+def load_word_bank(path: Path) -> List[str]:
+    words: List[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        word = line.strip().lower()
+        if len(word) == 5 and word.isalpha():
+            words.append(word)
+    return words
+
+
+def word_bank_checksum(guess_path: Path = GUESS_BANK_PATH, solution_path: Path = SOLUTION_BANK_PATH) -> bytes:
+    digest = hashlib.sha256()
+    for path in (guess_path, solution_path):
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+class PatternMatrix:
+    """Feedback lookups over a packed pattern matrix buffer (normally an mmap)."""
+
+    def __init__(self, buffer, guesses: List[str], answers: List[str]):
+        self.buffer = buffer
+        self.guesses = guesses
+        self.answers = answers
+        self.guess_ids: Dict[str, int] = {word: i for i, word in enumerate(guesses)}
+        self.answer_ids: Dict[str, int] = {word: i for i, word in enumerate(answers)}
+
+    def row(self, guess: str) -> Optional[bytes]:
+        """Pattern codes of `guess` against every answer, or None if it is not in the word bank."""
+        guess_id = self.guess_ids.get(guess)
+        if guess_id is None:
+            return None
+        start = HEADER.size + guess_id * len(self.answers)
+        return self.buffer[start:start + len(self.answers)]
+
+    def as_array(self):
+        """(guess_count, answer_count) uint8 NumPy view of the matrix, or None without NumPy."""
+        if np is None:
+            return None
+        data = np.frombuffer(self.buffer, dtype=np.uint8, offset=HEADER.size)
+        return data.reshape(len(self.guesses), len(self.answers))
+
+    def pattern(self, guess: str, answer: str) -> int:
+        """Pattern code of `guess` against `answer`, computed directly for words outside the banks."""
+        guess_id = self.guess_ids.get(guess)
+        answer_id = self.answer_ids.get(answer)
+        if guess_id is None or answer_id is None:
+            return calculate_pattern(guess, answer)
+        return self.buffer[HEADER.size + guess_id * len(self.answers) + answer_id]
+
+
+def pack_pattern_matrix(guesses: List[str], answers: List[str], checksum: bytes) -> bytes:
+    out = bytearray(
+        HEADER.pack(PATTERN_MATRIX_MAGIC, PATTERN_MATRIX_VERSION, len(guesses), len(answers), checksum)
+    )
+    encoded = EncodedWords(answers)
+    for guess in guesses:
+        out += calculate_patterns(guess, encoded)
+    return bytes(out)
+
+
+def build_pattern_matrix(path: Path = PATTERN_MATRIX_PATH) -> int:
+    """Build the matrix from the word banks and atomically replace `path`. Returns the file size."""
+    guesses = load_word_bank(GUESS_BANK_PATH)
+    answers = load_word_bank(SOLUTION_BANK_PATH)
+    _log(f"Building pattern matrix for {len(guesses)} guesses x {len(answers)} answers")
+    data = pack_pattern_matrix(guesses, answers, word_bank_checksum())
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def load_pattern_matrix(path: Path = PATTERN_MATRIX_PATH, rebuild: bool = True) -> Optional[PatternMatrix]:
+    """Map the matrix at `path`, rebuilding it first if it is missing or stale (unless rebuild=False)."""
+    checksum = word_bank_checksum()
+    mapping = None
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    if mapping is not None and len(mapping) >= HEADER.size:
+        magic, version, guess_count, answer_count, stored = HEADER.unpack_from(mapping)
+        if (
+            magic == PATTERN_MATRIX_MAGIC
+            and version == PATTERN_MATRIX_VERSION
+            and stored == checksum
+            and len(mapping) == HEADER.size + guess_count * answer_count
+        ):
+            return PatternMatrix(mapping, load_word_bank(GUESS_BANK_PATH), load_word_bank(SOLUTION_BANK_PATH))
+    if mapping is not None:
+        mapping.close()
+
+    if not rebuild:
+        return None
+    _log(f"Pattern matrix {path} is missing or stale, rebuilding it")
+    build_pattern_matrix(path)
+    return load_pattern_matrix(path, rebuild=False)
+
+
+@lru_cache(maxsize=None)
+def get_pattern_matrix() -> PatternMatrix:
+    """Shared matrix for the strategy and mock source, mapped on first use."""
+    matrix = load_pattern_matrix()
+    if matrix is None:
+        raise RuntimeError(f"Could not load pattern matrix from {PATTERN_MATRIX_PATH}")
+    return matrix
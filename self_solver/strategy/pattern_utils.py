@@ -1,13 +1,33 @@
+from __future__ import annotations
+
 from collections import Counter
+from typing import List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python kernel is used without it
+    np = None
 
 SOLVED_PATTERN = 242
+PATTERN_WEIGHTS = (1, 3, 9, 27, 81)
+
+WordCodes = Tuple[int, int, int, int, int]
+
+
+def _digits(pattern: int) -> str:
+    return "".join(str((pattern // weight) % 3) for weight in PATTERN_WEIGHTS)
+
+
+_BASE3 = [_digits(pattern) for pattern in range(SOLVED_PATTERN + 1)]
+_FROM_BASE3 = {digits: pattern for pattern, digits in enumerate(_BASE3)}
 
 
 def pattern_to_base3(pattern: int) -> str:
-    digits = []
-    for i in range(5):
-        digits.append(str((pattern // (3 ** i)) % 3))
-    return "".join(digits)
+    return _BASE3[pattern]
+
+
+def base3_to_pattern(pattern_base3: str) -> int:
+    return _FROM_BASE3[pattern_base3]
 
 
 def calculate_pattern(guess: str, answer: str) -> int:
@@ -29,3 +49,113 @@ def calculate_pattern(guess: str, answer: str) -> int:
 
 def calculate_pattern_base3(guess: str, answer: str) -> str:
     return pattern_to_base3(calculate_pattern(guess, answer))
+
+
+def encode_word(word: str) -> WordCodes:
+    """Letters of a 5-letter lowercase word as 0-25 codes."""
+    a, b, c, d, e = (ord(letter) - 97 for letter in word)
+    return (a, b, c, d, e)
+
+
+class EncodedWords:
+    """Answers encoded once for calculate_patterns (plus an (N, 5) uint8 matrix with NumPy)."""
+
+    def __init__(self, words: Sequence[str]):
+        self.words = list(words)
+        self.codes: List[WordCodes] = [encode_word(word) for word in self.words]
+        self.matrix = np.array(self.codes, dtype=np.uint8).reshape(-1, 5) if np is not None else None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def select(self, indices: Sequence[int]) -> "EncodedWords":
+        """The words at `indices`, without encoding them again."""
+        selected = EncodedWords([])
+        selected.words = [self.words[i] for i in indices]
+        selected.codes = [self.codes[i] for i in indices]
+        if self.matrix is not None:
+            selected.matrix = self.matrix[list(indices)].reshape(-1, 5)
+        return selected
+
+
+def calculate_patterns(
+    guess: str,
+    answers: Union[EncodedWords, Sequence[str]],
+    use_numpy: bool = True,
+) -> bytes:
+    """
+    Score one guess against many answers; byte j is calculate_pattern(guess, answers[j]).
+    Pass an EncodedWords to reuse the encoding across guesses.
+    """
+    if not isinstance(answers, EncodedWords):
+        answers = EncodedWords(answers)
+    codes = encode_word(guess)
+    if use_numpy and answers.matrix is not None:
+        return _calculate_patterns_numpy(codes, answers.matrix)
+    return _calculate_patterns_python(codes, answers.codes)
+
+
+def _calculate_patterns_python(guess: WordCodes, answers: Sequence[WordCodes]) -> bytes:
+    out = bytearray(len(answers))
+    # Unmatched answer letters, cleared again after each answer
+    counts = [0] * 26
+    g0, g1, g2, g3, g4 = guess
+    for j, (a0, a1, a2, a3, a4) in enumerate(answers):
+        value = 0
+        if g0 == a0:
+            value += 2
+        else:
+            counts[a0] += 1
+        if g1 == a1:
+            value += 6
+        else:
+            counts[a1] += 1
+        if g2 == a2:
+            value += 18
+        else:
+            counts[a2] += 1
+        if g3 == a3:
+            value += 54
+        else:
+            counts[a3] += 1
+        if g4 == a4:
+            value += 162
+        else:
+            counts[a4] += 1
+
+        if g0 != a0 and counts[g0]:
+            value += 1
+            counts[g0] -= 1
+        if g1 != a1 and counts[g1]:
+            value += 3
+            counts[g1] -= 1
+        if g2 != a2 and counts[g2]:
+            value += 9
+            counts[g2] -= 1
+        if g3 != a3 and counts[g3]:
+            value += 27
+            counts[g3] -= 1
+        if g4 != a4 and counts[g4]:
+            value += 81
+            counts[g4] -= 1
+
+        counts[a0] = counts[a1] = counts[a2] = counts[a3] = counts[a4] = 0
+        out[j] = value
+    return bytes(out)
+
+
+def _calculate_patterns_numpy(guess: WordCodes, answers) -> bytes:
+    weights = np.array(PATTERN_WEIGHTS, dtype=np.uint8)
+    green = answers == np.array(guess, dtype=np.uint8)
+    unmatched = ~green
+    value = (green * (2 * weights)).sum(axis=1, dtype=np.uint8)
+    for i in range(5):
+        # The k-th unmatched copy of a guess letter is yellow while the
+        # answer still has more than k unmatched copies of it
+        available = ((answers == guess[i]) & unmatched).sum(axis=1)
+        earlier = np.zeros(len(answers), dtype=np.intp)
+        for k in range(i):
+            if guess[k] == guess[i]:
+                earlier += unmatched[:, k]
+        value += (unmatched[:, i] & (available > earlier)) * weights[i]
+    return value.astype(np.uint8).tobytes()
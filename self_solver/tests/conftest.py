@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The solver is run from self_solver/ and imports its packages top-level
+SELF_SOLVER_DIR = Path(__file__).resolve().parent.parent
+if str(SELF_SOLVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SELF_SOLVER_DIR))
+
+STANDIN_PAGE = SELF_SOLVER_DIR / "sources" / "nyt_standin.html"
+
+
+@pytest.fixture(scope="session")
+def chromium():
+    """Skip the test unless Playwright can launch Chromium (the system one or its own)."""
+    try:
+        from playwright.sync_api import Error, sync_playwright  # type: ignore
+        from sources.nyt_source import chromium_executable_path
+    except ImportError:
+        pytest.skip("playwright is not installed")
+    with sync_playwright() as playwright:
+        try:
+            playwright.chromium.launch(executable_path=chromium_executable_path()).close()
+        except Error as exc:
+            pytest.skip(f"no Chromium for Playwright: {str(exc).splitlines()[0]}")
+
+
+@pytest.fixture
+def standin_url(chromium):
+    """file:// URL of the local NYT board stand-in for `answer`, with fast tile flips."""
+
+    def build(answer: str, flip_ms: int = 30) -> str:
+        return f"{STANDIN_PAGE.as_uri()}?answer={answer}&flip={flip_ms}"
+
+    return build
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sources.answer_providers import (
+    AnswerProvider,
+    LifehackerAnswerProvider,
+    NytApiAnswerProvider,
+    format_answer_url,
+    race_answer_providers,
+)
+
+
+class StubProvider(AnswerProvider):
+    def __init__(self, name, answer=None, delay=0.0, error=None):
+        self.name = name
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+
+    def fetch(self):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+
+class AnswerSite:
+    """Local stand-in for the answer sites: path prefix -> (delay, status, body)."""
+
+    def __init__(self, routes):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                for prefix, (delay, status, body) in routes.items():
+                    if self.path.startswith(prefix):
+                        break
+                else:
+                    delay, status, body = 0.0, 404, ""
+                time.sleep(delay)
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def site():
+    server = AnswerSite({
+        "/slow": (1.0, 200, "<p>Today's word is CRANE.</p>"),
+        "/article": (0.0, 200, "<article><p>The <b>word is</b> <i>slate</i>.</p></article>"),
+        "/api": (0.1, 200, json.dumps({"id": 1, "solution": "Crane"})),
+        "/empty": (0.0, 200, "<p>No spoilers here.</p>"),
+    })
+    yield server
+    server.close()
+
+
+def test_format_answer_url():
+    day = date(2024, 3, 7)
+    assert format_answer_url("/{month}-{day}-{year}/{date}", day) == "/march-7-2024/2024-03-07"
+
+
+def test_lifehacker_provider_parses_the_article(site):
+    assert LifehackerAnswerProvider(site.url + "/slow/{date}").fetch() == "crane"
+    assert LifehackerAnswerProvider(site.url + "/article/{date}").fetch() == "slate"
+    assert LifehackerAnswerProvider(site.url + "/empty/{date}").fetch() is None
+    assert LifehackerAnswerProvider(site.url + "/missing/{date}").fetch() is None
+
+
+def test_nyt_api_provider_reads_the_solution(site):
+    assert NytApiAnswerProvider(site.url + "/api/{date}.json").fetch() == "crane"
+    assert NytApiAnswerProvider(site.url + "/empty/{date}.json").fetch() is None
+
+
+def test_race_does_not_wait_for_a_slow_provider(site):
+    providers = [
+        LifehackerAnswerProvider(site.url + "/slow/{month}-{day}-{year}"),
+        NytApiAnswerProvider(site.url + "/api/{date}.json"),
+    ]
+    started = time.monotonic()
+    assert race_answer_providers(providers) == "crane"
+    assert time.monotonic() - started < 0.8
+
+
+def test_race_skips_failed_providers():
+    providers = [
+        StubProvider("broken", error=RuntimeError("boom")),
+        StubProvider("empty", answer=None),
+        StubProvider("invalid", answer="cranes"),
+        StubProvider("slow", answer="SLATE", delay=0.2),
+    ]
+    assert race_answer_providers(providers) == "slate"
+
+
+def test_race_returns_none_when_every_provider_fails():
+    providers = [StubProvider("broken", error=RuntimeError("boom")), StubProvider("empty", answer="")]
+    assert race_answer_providers(providers) is None
+    assert race_answer_providers([]) is None
+
+
+def test_race_times_out():
+    started = time.monotonic()
+    assert race_answer_providers([StubProvider("stuck", answer="crane", delay=1.0)], timeout=0.2) is None
+    assert time.monotonic() - started < 0.8
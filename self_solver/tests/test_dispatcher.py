@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from discord.dispatcher import DiscordDispatcher, coalesce
+
+
+class FakeWebhook:
+    """Local stand-in for a Discord webhook that answers with scripted responses, then 204."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                webhook.requests.append((time.monotonic(), json.loads(body)))
+                status, headers, payload = webhook.responses.pop(0) if webhook.responses else (204, {}, None)
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/webhook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def webhook():
+    server = FakeWebhook()
+    yield server
+    server.close()
+
+
+def make_dispatcher(webhook, **kwargs):
+    options = {"coalesce_window": 0.05, "backoff": 0.05, "max_backoff": 0.2, "timeout": 2.0}
+    options.update(kwargs)
+    return DiscordDispatcher(webhook.url, "Tester", **options)
+
+
+def test_429_waits_for_retry_after(webhook):
+    webhook.responses.append((429, {}, {"retry_after": 0.4, "global": False}))
+    dispatcher = make_dispatcher(webhook)
+    dispatcher.send({"content": "hello"})
+    assert dispatcher.flush(5)
+
+    assert len(webhook.requests) == 2
+    (first, _), (second, payload) = webhook.requests
+    assert second - first >= 0.4
+    assert payload == {"username": "Tester", "content": "hello"}
+
+
+def test_5xx_is_retried_until_204(webhook):
+    webhook.responses.extend([(500, {}, None), (502, {}, None)])
+    dispatcher = make_dispatcher(webhook)
+    dispatcher.send({"content": "hello"})
+    assert dispatcher.flush(5)
+
+    assert [payload["content"] for _, payload in webhook.requests] == ["hello"] * 3
+
+
+def test_4xx_is_not_retried(webhook):
+    webhook.responses.append((400, {}, {"message": "Cannot send an empty message"}))
+    dispatcher = make_dispatcher(webhook)
+    dispatcher.send({"content": "bad"})
+    assert dispatcher.flush(5)
+    assert len(webhook.requests) == 1
+
+    dispatcher.send({"content": "good"})
+    assert dispatcher.flush(5)
+    assert [payload["content"] for _, payload in webhook.requests] == ["bad", "good"]
+
+
+def test_gives_up_after_max_retries(webhook):
+    webhook.responses.extend([(503, {}, None)] * 10)
+    dispatcher = make_dispatcher(webhook, max_retries=2, backoff=0.01)
+    dispatcher.send({"content": "hello"})
+    assert dispatcher.flush(5)
+    assert len(webhook.requests) == 3
+
+
+def test_messages_in_one_window_share_a_request(webhook):
+    dispatcher = make_dispatcher(webhook, coalesce_window=0.3)
+    dispatcher.send({"content": "one"})
+    dispatcher.send({"content": "two"})
+    dispatcher.send({"embed": {"description": "three", "color": 1}})
+    assert dispatcher.flush(5)
+
+    assert [payload for _, payload in webhook.requests] == [
+        {"username": "Tester", "content": "one\n\ntwo"},
+        {"username": "Tester", "embeds": [{"description": "three", "color": 1}]},
+    ]
+
+
+def test_worker_survives_unexpected_errors(webhook, monkeypatch):
+    dispatcher = make_dispatcher(webhook)
+    post = dispatcher.session.post
+    calls = []
+
+    def flaky_post(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return post(*args, **kwargs)
+
+    monkeypatch.setattr(dispatcher.session, "post", flaky_post)
+    dispatcher.send({"content": "lost"})
+    assert dispatcher.flush(5)
+    dispatcher.send({"content": "delivered"})
+    assert dispatcher.flush(5)
+
+    assert dispatcher.thread.is_alive()
+    assert [payload["content"] for _, payload in webhook.requests] == ["delivered"]
+
+
+def test_coalesce_keeps_order_across_kinds():
+    warning = {"description": "careful", "color": 0xFFA500}
+    parts = [{"content": "a"}, {"embed": warning}, {"content": "b"}, {"content": "c"}, {"embed": warning}]
+
+    assert coalesce(parts) == [
+        {"content": "a"},
+        {"embeds": [warning]},
+        {"content": "b\n\nc"},
+        {"embeds": [warning]},
+    ]
+
+
+def test_coalesce_respects_content_limit():
+    parts = [{"content": "x" * 1500}, {"content": "y" * 600}, {"content": "z"}]
+
+    assert [len(payload["content"]) for payload in coalesce(parts, "Tester")] == [1500, 603]
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from sources.nyt_async_source import AsyncNytWordleSource
+from test_nyt_source import CRANE_VS_CRANE, SLATE_VS_CRANE, FixedAnswerProvider
+
+SELF_SOLVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def endpoint_up(endpoint: str) -> bool:
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture
+def warm_browser(chromium):
+    """browser_daemon.py in incognito mode on a free port; yields its CDP endpoint."""
+    port = free_port()
+    endpoint = f"http://127.0.0.1:{port}"
+    daemon = subprocess.Popen(
+        [sys.executable, "browser_daemon.py", "--port", str(port), "--incognito"],
+        cwd=SELF_SOLVER_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not endpoint_up(endpoint):
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                pytest.fail("browser_daemon.py did not start")
+            time.sleep(0.2)
+        yield endpoint
+    finally:
+        daemon.send_signal(signal.SIGTERM)
+        daemon.wait(timeout=30)
+
+
+def play(source: AsyncNytWordleSource) -> None:
+    try:
+        assert source.start() == "crane"
+        assert source.submit_guess("slate") == SLATE_VS_CRANE
+        assert source.submit_guess("crane") == CRANE_VS_CRANE
+    finally:
+        source.close()
+
+
+def test_async_source_attaches_to_a_warm_browser(warm_browser, standin_url):
+    for _ in range(2):
+        source = AsyncNytWordleSource(
+            wordle_url=standin_url("crane"),
+            browser_mode="incognito",
+            feedback_timeout=5.0,
+            answer_providers=[FixedAnswerProvider("crane")],
+            cdp_endpoint=warm_browser,
+        )
+        play(source)
+        assert source.attached and source.owns_context
+        # close() leaves the warm browser running for the next source
+        assert endpoint_up(warm_browser)
+
+
+def test_async_source_launches_without_a_warm_browser(standin_url):
+    source = AsyncNytWordleSource(
+        wordle_url=standin_url("crane"),
+        browser_mode="incognito",
+        feedback_timeout=5.0,
+        answer_providers=[FixedAnswerProvider("crane")],
+        cdp_endpoint=f"http://127.0.0.1:{free_port()}",
+        connect_timeout=1.0,
+    )
+    play(source)
+    assert not source.attached
+
+
+def test_async_source_coroutines_run_on_the_callers_loop(standin_url):
+    async def play_async(source: AsyncNytWordleSource) -> None:
+        try:
+            await source.async_setup()
+            assert await source.async_submit_guess("slate") == SLATE_VS_CRANE
+            assert await source.async_submit_guess("crane") == CRANE_VS_CRANE
+        finally:
+            await source.async_close()
+
+    source = AsyncNytWordleSource(
+        wordle_url=standin_url("crane"),
+        browser_mode="incognito",
+        feedback_timeout=5.0,
+        cdp_endpoint=None,
+    )
+    asyncio.run(play_async(source))
+    source.loop.close()
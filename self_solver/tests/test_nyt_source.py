@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from sources.answer_providers import AnswerProvider
+from sources.nyt_source import NytWordleSource
+
+SLATE_VS_CRANE = [("s", "absent"), ("l", "absent"), ("a", "correct"), ("t", "absent"), ("e", "correct")]
+TRACE_VS_CRANE = [("t", "absent"), ("r", "correct"), ("a", "correct"), ("c", "present"), ("e", "correct")]
+CRANE_VS_CRANE = [(letter, "correct") for letter in "crane"]
+
+
+class FixedAnswerProvider(AnswerProvider):
+    name = "fixed"
+
+    def __init__(self, answer):
+        self.answer = answer
+
+    def fetch(self):
+        return self.answer
+
+
+def test_nyt_source_plays_the_standin(standin_url):
+    source = NytWordleSource(
+        wordle_url=standin_url("crane"),
+        browser_mode="incognito",
+        feedback_timeout=5.0,
+        answer_providers=[FixedAnswerProvider("crane")],
+    )
+    try:
+        assert source.start() == "crane"
+        assert source.submit_guess("slate") == SLATE_VS_CRANE
+        assert source.submit_guess("trace") == TRACE_VS_CRANE
+        assert source.submit_guess("crane") == CRANE_VS_CRANE
+    finally:
+        source.close()
+
+
+def test_nyt_source_persistent_profile(standin_url, tmp_path):
+    source = NytWordleSource(
+        wordle_url=standin_url("crane", flip_ms=0),
+        chromium_user_data_dir=str(tmp_path / "profile"),
+        feedback_timeout=5.0,
+    )
+    try:
+        source.setup()
+        assert source.submit_guess("crane") == CRANE_VS_CRANE
+    finally:
+        source.close()
+
+
+def test_nyt_source_aborts_setup_without_an_answer(standin_url):
+    source = NytWordleSource(
+        wordle_url=standin_url("crane"),
+        browser_mode="incognito",
+        answer_providers=[FixedAnswerProvider(None)],
+    )
+    try:
+        assert source.start() is None
+    finally:
+        source.close()
@@ -0,0 +1,69 @@
+import time
+
+from sources.base import WordleSource
+
+SETUP_STEPS = 10
+STEP_SECONDS = 0.05
+
+
+class StubSource(WordleSource):
+    """Source whose setup() takes SETUP_STEPS steps with a check_abort() before each."""
+
+    name = "stub"
+
+    def __init__(self, answer=None, answer_delay=0.0, error=None):
+        self.answer = answer
+        self.answer_delay = answer_delay
+        self.error = error
+        self.steps = 0
+        self.closed = False
+
+    def setup(self):
+        for _ in range(SETUP_STEPS):
+            self.check_abort()
+            time.sleep(STEP_SECONDS)
+            self.steps += 1
+
+    def scrape_answer(self):
+        time.sleep(self.answer_delay)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+    def submit_guess(self, guess):
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+def test_start_overlaps_setup_and_answer_fetch():
+    source = StubSource(answer="crane", answer_delay=SETUP_STEPS * STEP_SECONDS)
+    started = time.monotonic()
+    assert source.start() == "crane"
+    assert source.steps == SETUP_STEPS
+    assert time.monotonic() - started < 2 * SETUP_STEPS * STEP_SECONDS
+
+
+def test_failed_answer_fetch_aborts_setup():
+    source = StubSource(answer=None)
+    assert source.start() is None
+    assert source.steps < SETUP_STEPS
+
+
+def test_answer_fetch_exception_aborts_setup():
+    source = StubSource(error=RuntimeError("site down"))
+    assert source.start() is None
+    assert source.steps < SETUP_STEPS
+
+
+def test_answer_failing_after_setup_returns_none():
+    source = StubSource(answer=None, answer_delay=SETUP_STEPS * STEP_SECONDS + 0.1)
+    assert source.start() is None
+    assert source.steps == SETUP_STEPS
+
+
+def test_check_abort_is_a_no_op_outside_start():
+    source = StubSource(answer=None)
+    source.setup()
+    assert source.steps == SETUP_STEPS
@@ -0,0 +1,125 @@
+"""Solver word bank: the frequency-sorted CSV plus an append-only journal.
+
+Additions (today's answer when it is missing) are appended as one line to
+<csv>.journal and fsync'd before add() returns, instead of rewriting the
+whole CSV. Loading replays the journal after the CSV, so the word order is
+the same as if the CSV had been rewritten. A line torn by a crash has no
+trailing newline and is dropped on load. Once the journal holds
+`compact_threshold` words they are folded back into the CSV with an atomic
+replace, and the journal is removed.
+
+Derived files are keyed on their own inputs: the pattern matrix on the
+guess and solution bank CSVs, the decision tree on the solution bank words
+in frequency order (see decision_tree.tree_checksum). An added word only
+invalidates the tree when it is a solution bank word.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Set
+
+
+def _log(message: str) -> None:
+    logging.getLogger("self_solver").debug(f"[word_bank_store] {message}")
+
+
+def _is_word(word: str) -> bool:
+    return len(word) == 5 and word.isalpha()
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # Directories cannot be opened on some platforms
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WordBankStore:
+    """Word list in frequency order with O(1) membership and journaled additions."""
+
+    def __init__(self, path: Path, journal_path: Optional[Path] = None, compact_threshold: int = 16):
+        self.path = path
+        self.journal_path = journal_path or path.with_name(f"{path.name}.journal")
+        self.compact_threshold = compact_threshold
+        self.words: List[str] = []
+        self.word_set: Set[str] = set()
+        self.journal_count = 0
+        self._load()
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_set
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str) -> bool:
+        """Append `word` durably. Returns False if it is already in the bank."""
+        word = word.strip().lower()
+        if not _is_word(word):
+            raise ValueError(f"Not a 5-letter word: {word!r}")
+        if word in self.word_set:
+            return False
+
+        # One small O_APPEND write per word, so concurrent appends do not interleave
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(f"{word}\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        if self.journal_count == 0:
+            _fsync_dir(self.journal_path.parent)
+        self.journal_count += 1
+        self.words.append(word)
+        self.word_set.add(word)
+        _log(f"Journaled {word.upper()} ({self.journal_count} pending)")
+
+        if self.journal_count >= self.compact_threshold:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Rewrite the CSV with the journaled words and drop the journal."""
+        if self.journal_count == 0 and not self.journal_path.exists():
+            return
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.words) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path.parent)
+        # A crash before this unlink only leaves words that replay as duplicates
+        self.journal_path.unlink(missing_ok=True)
+        _log(f"Compacted {self.journal_count} journaled words into {self.path}")
+        self.journal_count = 0
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Word list not found: {self.path}")
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            word = line.strip().lower()
+            if _is_word(word):
+                self.words.append(word)
+        self.word_set = set(self.words)
+
+        if not self.journal_path.exists():
+            return
+        data = self.journal_path.read_text(encoding="utf-8")
+        complete, _, torn = data.rpartition("\n")
+        if torn:
+            _log(f"Dropping torn journal line {torn!r}")
+            with open(self.journal_path, "r+", encoding="utf-8") as journal:
+                journal.truncate(len(complete.encode("utf-8")) + (1 if complete else 0))
+        for line in complete.splitlines():
+            word = line.strip().lower()
+            if _is_word(word) and word not in self.word_set:
+                self.words.append(word)
+                self.word_set.add(word)
+                self.journal_count += 1
+        _log(f"Replayed {self.journal_count} journaled words from {self.journal_path}")